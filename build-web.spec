@@ -20,6 +20,8 @@ datas = [
 #   (settings_file, 'syncapp/webui'),
 #   (os.path.join(project_dir, '.secret_key'), '.'),
     (nicegui_static, 'nicegui/static'),
+    # Node script of the long-lived Mermaid renderer
+    (os.path.join(project_dir, 'syncapp', 'core', 'mermaid_renderer.mjs'), 'syncapp/core'),
 ]
 
 # Add any additional data files from dependencies
@@ -52,7 +54,6 @@ hiddenimports = [
     'rich',
     'shellingham',
     'sqlite3',
-    'schedule',
 ]
 
 a = Analysis(
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import datetime
+import syncapp.config.database as db
+from syncapp.config.settings import load_settings
+from syncapp.backend.sync_runnerv2 import STATUS_FAILED, STATUS_UNCHANGED, SyncResult, run_sync_async
+from syncapp.core.driver_pool import DEFAULT_POOL_SIZE
+from syncapp.core.remote_index import refresh_remote_index
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+# Articles synced at once; Zendesk requests are further limited by the client's rate limiter
+DEFAULT_BULK_CONCURRENCY = 4
+
+class BulkSyncResult:
+    """
+    Outcome of syncing many articles.
+
+    `results` maps the articles table id of every article to its SyncResult.
+    """
+
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+
+    def _count(self, predicate):
+        return sum(1 for result in self.results.values() if predicate(result))
+
+    @property
+    def succeeded(self):
+        return self._count(lambda result: result.success and result.status != STATUS_UNCHANGED)
+
+    @property
+    def unchanged(self):
+        return self._count(lambda result: result.status == STATUS_UNCHANGED)
+
+    @property
+    def failed(self):
+        return self._count(lambda result: not result.success)
+
+    @property
+    def success(self):
+        return self.failed == 0
+
+    def summary(self):
+        return (f"Synced {len(self.results)} articles in {self.elapsed:.1f}s: {self.succeeded} updated, "
+                f"{self.unchanged} unchanged, {self.failed} failed")
+
+    def __repr__(self):
+        return f"BulkSyncResult({self.summary()!r})"
+
+def get_bulk_concurrency():
+    """Articles synced at once (BULK_CONCURRENCY)."""
+    return max(1, int(load_settings().get("BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY)))
+
+def get_browser_concurrency():
+    """Syncs rendering in Chrome at once (BULK_BROWSER_CONCURRENCY, default: the browser pool size)."""
+    current_settings = load_settings()
+    return max(1, int(current_settings.get("BULK_BROWSER_CONCURRENCY",
+                                           current_settings.get("DRIVER_POOL_SIZE", DEFAULT_POOL_SIZE))))
+
+def _record_status(article, result, scheduled):
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn = db.get_db_connection()
+    try:
+        if scheduled:
+            conn.execute("UPDATE articles SET status = ?, last_synced = ?, last_cron_update = ? WHERE id = ?",
+                         (result.status, now, now, article['id']))
+        else:
+            conn.execute("UPDATE articles SET status = ?, last_synced = ? WHERE id = ?",
+                         (result.status, now, article['id']))
+        conn.commit()
+    finally:
+        conn.close()
+
+async def refresh_indexes(articles):
+    # One paged listing of Zendesk per target locale instead of one lookup per article;
+    # articles without their own locales are pushed to the default one (LOCAL)
+    default_locale = load_settings().get("LOCAL", "en-us")
+    target_locales = {locale for article in articles
+                      for locale in db.parse_locales(article.get('locales')) or [default_locale]}
+    try:
+        for locale in sorted(target_locales):
+            await refresh_remote_index(locale)
+    except Exception as e:
+        logger.warning("Could not refresh the remote article index: %s", str(e))
+
+# ---------------------------- BULK SYNC ----------------------------
+async def sync_article(article, browser_slots=None, scheduled=False):
+    """
+    Syncs one article (a row of the articles table as a dict) and records its status.
+
+    Never raises: failures are returned as a failed SyncResult.
+    """
+    try:
+        result = await run_sync_async(
+            article_id=article['article_id'],
+            source_url=article['source_url'],
+            title=article['title'],
+            locales=db.parse_locales(article.get('locales')),
+            browser_slots=browser_slots,
+        )
+    except Exception as e:
+        logger.error("Sync of article %s failed: %s", article['title'], str(e))
+        result = SyncResult(False, f"Sync failed: {e}", status=STATUS_FAILED)
+    try:
+        await asyncio.get_event_loop().run_in_executor(None, _record_status, article, result, scheduled)
+    except Exception as e:
+        logger.error("Database update failed for article %s: %s", article['title'], str(e))
+    logger.info("Sync result for %s: %s (cache hit: %s)", article['title'], result.message, result.cache_hit)
+    return result
+
+async def sync_articles(articles, concurrency=None, browser_concurrency=None, scheduled=False, refresh_index=True):
+    """
+    Syncs articles (rows of the articles table as dicts) with bounded concurrency.
+
+    At most `concurrency` articles (BULK_CONCURRENCY) are in flight and at
+    most `browser_concurrency` (BULK_BROWSER_CONCURRENCY, default: the
+    browser pool size) of them render in Chrome at once. A failing article
+    does not stop the others. Each article's status and last_synced (and
+    last_cron_update when `scheduled`) are written as it finishes.
+    Returns a BulkSyncResult.
+    """
+    concurrency = concurrency or get_bulk_concurrency()
+    browser_concurrency = browser_concurrency or get_browser_concurrency()
+    start = time.monotonic()
+    if not articles:
+        return BulkSyncResult({}, 0.0)
+
+    if refresh_index:
+        await refresh_indexes(articles)
+
+    slots = asyncio.Semaphore(concurrency)
+    browser_slots = asyncio.Semaphore(browser_concurrency)
+
+    async def sync_one(article):
+        async with slots:
+            return article['id'], await sync_article(article, browser_slots, scheduled)
+
+    logger.info("Syncing %d articles, %d at a time (%d in the browser)", len(articles), concurrency, browser_concurrency)
+    results = dict(await asyncio.gather(*[sync_one(article) for article in articles]))
+    bulk_result = BulkSyncResult(results, time.monotonic() - start)
+    logger.info("%s", bulk_result.summary())
+    return bulk_result
+
+def get_articles(ids):
+    """Returns the articles table rows with the given ids as dicts."""
+    if not ids:
+        return []
+    conn = db.get_db_connection()
+    try:
+        rows = conn.execute("SELECT * FROM articles WHERE id IN ({})".format(','.join('?' * len(ids))),
+                            list(ids)).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
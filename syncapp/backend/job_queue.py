@@ -0,0 +1,327 @@
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+import syncapp.config.database as db
+from syncapp.backend.bulk_sync import (
+    BulkSyncResult, get_articles, get_browser_concurrency, get_bulk_concurrency, sync_article
+)
+from syncapp.backend.sync_runnerv2 import STATUS_FAILED, SyncResult
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+ACTIVE_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+TRIGGER_MANUAL = "manual"
+TRIGGER_BULK = "bulk"
+TRIGGER_SCHEDULE = "schedule"
+
+# A running job whose lease is not renewed within this time is handed to another worker
+LEASE_SECONDS = 120
+# A job whose worker died this many times is given up
+MAX_ATTEMPTS = 3
+# Idle workers also look for jobs enqueued by other processes this often
+POLL_SECONDS = 2
+# Finished jobs are kept this long for the UI
+JOB_RETENTION_DAYS = 7
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def _now():
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+def _connect():
+    # Autocommit mode, so claims can take the write lock up front with BEGIN IMMEDIATE
+    conn = sqlite3.connect(db.DB_FILE, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def new_worker_id():
+    """Identifies a worker pool in lease_owner, e.g. "host:1234:ab12cd34"."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# ---------------------------- QUEUE ----------------------------
+def enqueue_jobs(article_row_ids, trigger, dispatched_by=None):
+    """
+    Queues a sync of each article (articles table ids) and returns {article id: job id}.
+
+    An article that already has a queued or running job keeps it and its id
+    is returned instead, so the same article is never synced twice at once.
+    `dispatched_by` records the scheduler instance that queued scheduled jobs.
+    """
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        jobs = {}
+        for article_row_id in dict.fromkeys(article_row_ids):
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO sync_jobs (article_row_id, trigger, state, created_at, dispatched_by) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (article_row_id, trigger, JOB_QUEUED, _now(), dispatched_by)
+            )
+            if cursor.rowcount:
+                jobs[article_row_id] = cursor.lastrowid
+                conn.execute("UPDATE articles SET status = 'Queued' WHERE id = ?", (article_row_id,))
+            else:
+                row = conn.execute("SELECT id FROM sync_jobs WHERE article_row_id = ? AND state IN (?, ?)",
+                                   (article_row_id, *ACTIVE_STATES)).fetchone()
+                jobs[article_row_id] = row['id']
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    wake_workers()
+    return jobs
+
+def _recover_expired(conn, now):
+    expired = conn.execute(
+        "SELECT id, article_row_id, attempts FROM sync_jobs WHERE state = ? AND lease_expires_at < ?", (JOB_RUNNING, now)
+    ).fetchall()
+    for job in expired:
+        if job['attempts'] >= MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE sync_jobs SET state = ?, result_status = ?, message = ?, finished_at = ?, lease_owner = NULL "
+                "WHERE id = ?",
+                (JOB_FAILED, STATUS_FAILED, f"Worker stopped during {job['attempts']} attempts", _now(), job['id'])
+            )
+            # claim_job marked the article as syncing; nothing else will record the outcome
+            conn.execute("UPDATE articles SET status = ?, last_synced = ? WHERE id = ?",
+                         (STATUS_FAILED, _now(), job['article_row_id']))
+        else:
+            conn.execute("UPDATE sync_jobs SET state = ?, lease_owner = NULL WHERE id = ?", (JOB_QUEUED, job['id']))
+            conn.execute("UPDATE articles SET status = 'Queued' WHERE id = ?", (job['article_row_id'],))
+    if expired:
+        logger.warning("Recovered %d sync jobs whose worker stopped", len(expired))
+
+def claim_job(owner, lease_seconds=LEASE_SECONDS):
+    """
+    Leases the oldest queued job to `owner` and returns it as a dict, or None when there is none.
+
+    Jobs whose lease expired (their worker crashed or was killed) are queued
+    again first, or failed after MAX_ATTEMPTS.
+    """
+    conn = _connect()
+    try:
+        # Idle workers poll, so look without the write lock first
+        now = time.time()
+        if conn.execute(
+            "SELECT 1 FROM sync_jobs WHERE state = ? OR (state = ? AND lease_expires_at < ?) LIMIT 1",
+            (JOB_QUEUED, JOB_RUNNING, now)
+        ).fetchone() is None:
+            return None
+        conn.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        _recover_expired(conn, now)
+        job = conn.execute("SELECT * FROM sync_jobs WHERE state = ? ORDER BY id LIMIT 1", (JOB_QUEUED,)).fetchone()
+        if job is not None:
+            conn.execute(
+                "UPDATE sync_jobs SET state = ?, lease_owner = ?, lease_expires_at = ?, attempts = attempts + 1, "
+                "started_at = ? WHERE id = ?",
+                (JOB_RUNNING, owner, now + lease_seconds, _now(), job['id'])
+            )
+            conn.execute("UPDATE articles SET status = 'Syncing' WHERE id = ?", (job['article_row_id'],))
+        conn.execute("COMMIT")
+        return dict(job) if job is not None else None
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+def renew_lease(job_id, owner, lease_seconds=LEASE_SECONDS):
+    """Extends a lease; False when the job is no longer leased to `owner`."""
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "UPDATE sync_jobs SET lease_expires_at = ? WHERE id = ? AND state = ? AND lease_owner = ?",
+            (time.time() + lease_seconds, job_id, JOB_RUNNING, owner)
+        )
+        return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+def finish_job(job_id, owner, result):
+    """Records the SyncResult of a job that is still leased to `owner`."""
+    conn = _connect()
+    try:
+        conn.execute(
+            "UPDATE sync_jobs SET state = ?, result_status = ?, message = ?, finished_at = ?, lease_owner = NULL "
+            "WHERE id = ? AND lease_owner = ?",
+            (JOB_DONE if result.success else JOB_FAILED, result.status, result.message, _now(), job_id, owner)
+        )
+    finally:
+        conn.close()
+
+def release_jobs(owner):
+    """Queues the running jobs of `owner` again without counting the attempt, e.g. on shutdown."""
+    conn = _connect()
+    try:
+        cursor = conn.execute(
+            "UPDATE sync_jobs SET state = ?, lease_owner = NULL, attempts = MAX(attempts - 1, 0) "
+            "WHERE state = ? AND lease_owner = ?",
+            (JOB_QUEUED, JOB_RUNNING, owner)
+        )
+        return cursor.rowcount
+    finally:
+        conn.close()
+
+def get_jobs(job_ids):
+    """Returns {job id: job row as a dict}."""
+    if not job_ids:
+        return {}
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT * FROM sync_jobs WHERE id IN ({})".format(','.join('?' * len(job_ids))),
+                            list(job_ids)).fetchall()
+        return {row['id']: dict(row) for row in rows}
+    finally:
+        conn.close()
+
+def prune_jobs(days=JOB_RETENTION_DAYS):
+    """Deletes finished jobs older than `days`."""
+    cutoff = (datetime.now() - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+    conn = _connect()
+    try:
+        cursor = conn.execute("DELETE FROM sync_jobs WHERE state IN (?, ?) AND finished_at < ?",
+                              (JOB_DONE, JOB_FAILED, cutoff))
+        if cursor.rowcount:
+            logger.info("Deleted %d finished sync jobs", cursor.rowcount)
+    finally:
+        conn.close()
+
+def job_result(job):
+    """The SyncResult of a finished job row."""
+    return SyncResult(job['state'] == JOB_DONE, job['message'] or "", status=job['result_status'])
+
+async def wait_for_jobs(job_ids, poll_seconds=0.5):
+    """
+    Waits until every job finished and returns a BulkSyncResult keyed by article id.
+
+    Only observes the queue, so the jobs keep running if the caller goes away.
+    """
+    loop = asyncio.get_event_loop()
+    start = time.monotonic()
+    job_ids = list(job_ids)
+    while True:
+        jobs = await loop.run_in_executor(None, get_jobs, job_ids)
+        if all(job['state'] not in ACTIVE_STATES for job in jobs.values()):
+            return BulkSyncResult({job['article_row_id']: job_result(job) for job in jobs.values()},
+                                  time.monotonic() - start)
+        await asyncio.sleep(poll_seconds)
+
+# ---------------------------- WORKERS ----------------------------
+class JobWorkerPool:
+    """
+    Async workers that take sync jobs from the queue on one event loop.
+
+    `size` jobs run at once; they share one cap on browser renders. Several
+    pools (e.g. in other processes) can work the same queue: leases keep
+    each job with one worker, and a job whose worker stops is taken over
+    once its lease expires.
+    """
+
+    def __init__(self, size=None, browser_concurrency=None, owner=None):
+        self.size = size or get_bulk_concurrency()
+        self.owner = owner or new_worker_id()
+        self._browser_slots = asyncio.Semaphore(browser_concurrency or get_browser_concurrency())
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = []
+
+    def wake(self):
+        """Thread-safe: check the queue now instead of at the next poll."""
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _keep_lease(self, job_id, sync):
+        while True:
+            await asyncio.sleep(LEASE_SECONDS / 3)
+            if not await self._loop.run_in_executor(None, renew_lease, job_id, self.owner):
+                # Another worker may already be running the job; stop ours so they don't both push
+                logger.warning("Lost the lease of sync job %s, stopping it", job_id)
+                sync.cancel()
+                return
+
+    async def _run_job(self, job):
+        articles = await self._loop.run_in_executor(None, get_articles, [job['article_row_id']])
+        if not articles:
+            return SyncResult(False, "Article no longer exists", status=STATUS_FAILED)
+        sync = self._loop.create_task(
+            sync_article(articles[0], self._browser_slots, scheduled=job['trigger'] == TRIGGER_SCHEDULE)
+        )
+        keeper = self._loop.create_task(self._keep_lease(job['id'], sync))
+        try:
+            return await sync
+        except asyncio.CancelledError:
+            # Only swallow the cancel the keeper made; stopping the pool still cancels the worker
+            if asyncio.current_task().cancelling() or not keeper.done():
+                raise
+            return SyncResult(False, "Lost the job lease", status=STATUS_FAILED)
+        finally:
+            keeper.cancel()
+
+    async def _work(self, number):
+        while True:
+            try:
+                job = await self._loop.run_in_executor(None, claim_job, self.owner)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                # More jobs may be waiting; let an idle sibling look too
+                self._wakeup.set()
+                logger.info("Worker %d running sync job %s (%s)", number, job['id'], job['trigger'])
+                result = await self._run_job(job)
+                await self._loop.run_in_executor(None, finish_job, job['id'], self.owner, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in sync worker %d: %s", number, str(e))
+                logger.error("Traceback: %s", traceback.format_exc())
+                await asyncio.sleep(1)
+
+    def start(self):
+        prune_jobs()
+        self._tasks = [self._loop.create_task(self._work(number)) for number in range(1, self.size + 1)]
+        logger.info("Started %d sync workers as %s", self.size, self.owner)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        released = await self._loop.run_in_executor(None, release_jobs, self.owner)
+        logger.info("Sync workers stopped (%d unfinished jobs queued again)", released)
+
+_pool = None
+
+async def start_job_workers():
+    """Starts the worker pool on the running event loop (the app's, when registered with app.on_startup)."""
+    global _pool
+    if _pool is None:
+        _pool = JobWorkerPool()
+        _pool.start()
+
+async def stop_job_workers():
+    """Stops the workers and queues their unfinished jobs again."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.stop()
+
+def wake_workers():
+    """Tells the workers of this process that jobs were queued; other processes find them by polling."""
+    if _pool is not None:
+        _pool.wake()
@@ -1,196 +1,407 @@
 import asyncio
-import schedule
+import heapq
 import time
-from datetime import datetime
+import traceback
+import zlib
+from datetime import datetime, timedelta
 import syncapp.config.database as db
-from syncapp.backend.sync_runnerv2 import run_sync_async
+from syncapp.config.settings import load_settings
+from syncapp.backend.bulk_sync import refresh_indexes
+from syncapp.backend.job_queue import TRIGGER_SCHEDULE, enqueue_jobs, new_worker_id
 from syncapp.loggers.log_cli import setup_logger
-import threading
-import traceback
+from syncapp.utils.cron import next_run_after, validate_cron
 
 logger = setup_logger(__name__)
 
-# Global flag to track scheduler status
-scheduler_running = False
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Longest sleep between heap checks, so a changed clock is noticed eventually
+MAX_SLEEP_SECONDS = 300
+# The active scheduler renews its lease this often; the others try to take it over this often.
+# A scheduler that dies without releasing its lease is replaced within LEADER_LEASE_SECONDS.
+LEADER_LEASE_NAME = "scheduler"
+LEADER_LEASE_SECONDS = 30
+LEADER_RENEW_SECONDS = 10
+LEADER_RETRY_SECONDS = 5
+# Runs of each article are delayed by up to SCHEDULE_SPREAD_MINUTES (0 = run on the cron time)
+DEFAULT_SPREAD_MINUTES = 0
+# At most SCHEDULE_DISPATCH_CAP scheduled syncs are queued per tick; the rest wait for the next one
+DEFAULT_DISPATCH_CAP = 100
+DISPATCH_TICK_SECONDS = 60
+
+# ---------------------------- NEXT RUN ----------------------------
+def _format(moment):
+    return moment.strftime(TIMESTAMP_FORMAT) if moment else None
+
+def get_spread_seconds():
+    """Width of the window runs are spread over (SCHEDULE_SPREAD_MINUTES), in seconds."""
+    return max(0, int(float(load_settings().get("SCHEDULE_SPREAD_MINUTES", DEFAULT_SPREAD_MINUTES)) * 60))
+
+def get_dispatch_cap():
+    """Scheduled syncs queued per tick at most (SCHEDULE_DISPATCH_CAP)."""
+    return max(1, int(load_settings().get("SCHEDULE_DISPATCH_CAP", DEFAULT_DISPATCH_CAP)))
+
+def spread_offset(article_id, spread_seconds):
+    """
+    Seconds the runs of an article (articles table id) are delayed within the spread window.
+
+    A hash of the id, so articles sharing a schedule fan out over the window
+    while each one keeps a fixed slot across restarts and processes.
+    """
+    if spread_seconds <= 0:
+        return 0
+    return zlib.crc32(str(article_id).encode()) % spread_seconds
+
+def next_spread_run(cron_schedule, article_id, after, spread_seconds):
+    """The first run of an article strictly after `after`: its next cron time plus its spread offset."""
+    offset = timedelta(seconds=spread_offset(article_id, spread_seconds))
+    fire = next_run_after(cron_schedule, after - offset)
+    return fire + offset if fire else None
+
+def save_schedule(article_ids, cron_schedule):
+    """
+    Stores a schedule (or None to clear it) for articles, computes their next runs and wakes the scheduler.
+
+    Returns {article id: next run}. Raises CronError for an invalid expression, which is then not stored.
+    """
+    cron_schedule = validate_cron(cron_schedule) if cron_schedule else None
+    now = datetime.now()
+    spread_seconds = get_spread_seconds()
+    next_runs = {article_id: _format(next_spread_run(cron_schedule, article_id, now, spread_seconds))
+                 if cron_schedule else None for article_id in article_ids}
+    conn = db.get_db_connection()
+    try:
+        with conn:
+            conn.executemany(
+                "UPDATE articles SET cron_schedule = ?, last_cron_update = ?, next_run_at = ? WHERE id = ?",
+                [(cron_schedule, _format(now), next_run_at, article_id) for article_id, next_run_at in next_runs.items()]
+            )
+    finally:
+        conn.close()
+    wake_scheduler()
+    return next_runs
+
+def respread_schedules():
+    """
+    Recomputes the next run of every scheduled article that is not due yet, e.g. after the spread window changed.
+
+    Due runs keep their time so they are not skipped.
+    """
+    now = datetime.now()
+    spread_seconds = get_spread_seconds()
+    conn = db.get_db_connection()
+    try:
+        rows = conn.execute(
+            "SELECT id, cron_schedule FROM articles WHERE cron_schedule IS NOT NULL AND cron_schedule != '' "
+            "AND (next_run_at IS NULL OR next_run_at > ?)", (_format(now),)
+        ).fetchall()
+        with conn:
+            conn.executemany(
+                "UPDATE articles SET next_run_at = ? WHERE id = ?",
+                [(_format(next_spread_run(row['cron_schedule'], row['id'], now, spread_seconds)), row['id'])
+                 for row in rows]
+            )
+    finally:
+        conn.close()
+    logger.info("Recomputed the next run of %d scheduled articles", len(rows))
+    wake_scheduler()
 
-def should_run_now(cron_schedule):
-    """Check if the cron schedule should run now."""
+def _load_schedule():
+    """Fills in missing next runs (e.g. after an upgrade) and returns (next_run_at, id) of every scheduled article."""
+    conn = db.get_db_connection()
     try:
-        parts = cron_schedule.split()
-        if len(parts) >= 6:
-            minute = int(parts[1])
-            hour = int(parts[2])
-            day = parts[3]
-            month = parts[4]
-            weekday = parts[5]
-            
+        missing = conn.execute("""
+            SELECT id, cron_schedule FROM articles
+            WHERE cron_schedule IS NOT NULL AND cron_schedule != '' AND next_run_at IS NULL
+        """).fetchall()
+        if missing:
             now = datetime.now()
-            logger.info("Checking schedule: %s", cron_schedule)
-            logger.info("Current time: %s:%s, Day: %s, Month: %s, Weekday: %s", 
-                       now.hour, now.minute, now.day, now.month, now.weekday())
-            logger.info("Schedule time: %s:%s, Day: %s, Month: %s, Weekday: %s",
-                       hour, minute, day, month, weekday)
-            
-            # Check if current time matches the schedule
-            if now.hour != hour or now.minute != minute:
-                logger.info("Time does not match schedule")
-                return False
-                
-            # Check day of month
-            if day != '*' and int(day) != now.day:
-                logger.info("Day does not match schedule")
-                return False
-                
-            # Check month
-            if month != '*' and int(month) != now.month:
-                logger.info("Month does not match schedule")
-                return False
-                
-            # Check weekday (0 = Sunday)
-            if weekday != '*' and int(weekday) != now.weekday():
-                logger.info("Weekday does not match schedule")
-                return False
-                
-            logger.info("Schedule matches current time - will run sync")
-            return True
-    except Exception as e:
-        logger.error("Error parsing cron schedule %s: %s", cron_schedule, str(e))
-        return False
-    return False
-
-async def run_scheduled_sync(article):
-    """Run sync for a single article."""
+            spread_seconds = get_spread_seconds()
+            with conn:
+                conn.executemany(
+                    "UPDATE articles SET next_run_at = ? WHERE id = ?",
+                    [(_format(next_spread_run(row['cron_schedule'], row['id'], now, spread_seconds)), row['id'])
+                     for row in missing]
+                )
+            logger.info("Computed the next run of %d scheduled articles", len(missing))
+        return [(row['next_run_at'], row['id']) for row in conn.execute(
+            "SELECT id, next_run_at FROM articles WHERE next_run_at IS NOT NULL"
+        )]
+    finally:
+        conn.close()
+
+def _claim_due(article_ids, now):
+    """
+    Returns the given articles that are still due and moves their next run past `now`.
+
+    Runs missed while the app was busy or stopped are caught up once, not once per missed slot.
+    A run is only claimed if its next_run_at did not change in between, so two
+    schedulers (e.g. around a lease handover) never both queue it.
+    """
+    conn = db.get_db_connection()
     try:
-        # Check if it's time to run this article's schedule
-        if not should_run_now(article['cron_schedule']):
-            return
-            
-        logger.info("Running scheduled sync for article: %s", article['title'])
-        success, message = await run_sync_async(
-            article_id=article['article_id'],
-            source_url=article['source_url'],
-            title=article['title']
-        )
-        
-        # Log the result
-        logger.info("Sync result for %s: %s", article['title'], message)
-        
-        # Update sync status in database
-        try:
-            conn = db.get_db_connection()
-            new_status = 'Success' if success else 'Failed'
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # First update the status and last_synced
-            conn.execute("""
-                UPDATE articles 
-                SET status = ?, last_synced = ?
-                WHERE id = ?
-            """, (new_status, current_time, article['id']))
-            
-            # Then update last_cron_update
-            conn.execute("""
-                UPDATE articles 
-                SET last_cron_update = ?
-                WHERE id = ?
-            """, (current_time, article['id']))
-            
-            conn.commit()
-            conn.close()
-            logger.info("Database updated for article: %s", article['title'])
-        except Exception as db_error:
-            logger.error("Database update failed for article %s: %s", 
-                        article['title'], str(db_error))
-        
-        logger.info("Scheduled sync completed for article: %s - Status: %s", 
-                   article['title'], new_status)
-    except Exception as e:
-        logger.error("Error during scheduled sync for article %s: %s", 
-                    article['title'], str(e))
-
-async def check_scheduled_articles():
-    """Check for articles that need to be synced based on their cron schedule."""
+        rows = [dict(row) for row in conn.execute(
+            "SELECT * FROM articles WHERE id IN ({}) AND next_run_at <= ?".format(','.join('?' * len(article_ids))),
+            list(article_ids) + [_format(now)]
+        )]
+        claimed = []
+        spread_seconds = get_spread_seconds()
+        with conn:
+            for row in rows:
+                next_run_at = _format(next_spread_run(row['cron_schedule'], row['id'], now, spread_seconds))
+                cursor = conn.execute("UPDATE articles SET next_run_at = ? WHERE id = ? AND next_run_at = ?",
+                                      (next_run_at, row['id'], row['next_run_at']))
+                if cursor.rowcount:
+                    row['next_run_at'] = next_run_at
+                    claimed.append(row)
+        return claimed
+    finally:
+        conn.close()
+
+def _minute_fire_times(cron_schedule, start, end):
+    """Seconds after `start` of the runs of a schedule before `end`, at most one per minute."""
+    fire_times = []
+    moment = next_run_after(cron_schedule, start)
+    while moment is not None and moment < end:
+        fire_times.append((moment - start).total_seconds())
+        moment = next_run_after(cron_schedule, moment.replace(second=59))
+    return fire_times
+
+def get_load_histogram(hours=24):
+    """
+    Projected scheduled syncs per minute over the next `hours`, with the current spread window.
+
+    Returns (first minute, [count per minute]). Each distinct schedule is
+    expanded once and shifted by every article's offset.
+    """
+    start = datetime.now().replace(second=0, microsecond=0)
+    spread_seconds = get_spread_seconds()
+    # Runs up to a window before `start` still land inside it once delayed
+    expand_from = start - timedelta(seconds=spread_seconds + 1)
+    end = start + timedelta(hours=hours)
+    conn = db.get_db_connection()
     try:
-        logger.info("Checking for scheduled articles...")
-        conn = db.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get all articles with cron schedules
-        cursor.execute("""
-            SELECT * FROM articles 
-            WHERE cron_schedule IS NOT NULL 
-            AND cron_schedule != ''
-        """)
-        
-        articles = [dict(row) for row in cursor.fetchall()]
+        rows = conn.execute(
+            "SELECT id, cron_schedule FROM articles WHERE cron_schedule IS NOT NULL AND cron_schedule != ''"
+        ).fetchall()
+    finally:
         conn.close()
-        
-        logger.info("Found %d articles with cron schedules", len(articles))
-        
-        # Run sync for each article
-        for article in articles:
-            await run_scheduled_sync(article)
-            
-    except Exception as e:
-        logger.error("Error checking scheduled articles: %s", str(e))
-
-def run_check_scheduled_articles():
-    """Run the async check_scheduled_articles function in the event loop."""
-    logger.info("Starting scheduled check...")
+
+    counts = [0] * (hours * 60)
+    fire_times = {}
+    for row in rows:
+        if row['cron_schedule'] not in fire_times:
+            fire_times[row['cron_schedule']] = _minute_fire_times(row['cron_schedule'], expand_from, end)
+        shift = spread_offset(row['id'], spread_seconds) - (start - expand_from).total_seconds()
+        for seconds in fire_times[row['cron_schedule']]:
+            minute = int((seconds + shift) // 60)
+            if 0 <= minute < len(counts):
+                counts[minute] += 1
+    return start, counts
+
+def _earliest_next_run():
+    conn = db.get_db_connection()
     try:
-        asyncio.run(check_scheduled_articles())
-        logger.info("Scheduled check completed")
-    except Exception as e:
-        logger.error("Error in scheduled check: %s", str(e))
-        logger.error("Traceback: %s", traceback.format_exc())
-
-def start_scheduler():
-    """Start the scheduler to check for scheduled articles every minute."""
-    global scheduler_running
+        return conn.execute("SELECT MIN(next_run_at) FROM articles").fetchone()[0]
+    finally:
+        conn.close()
+
+# ---------------------------- LEADER LEASE ----------------------------
+def acquire_leadership(instance_id, lease_seconds=LEADER_LEASE_SECONDS):
+    """
+    Takes or renews the scheduler lease for `instance_id`; True while it holds it.
+
+    The lease is a row in the scheduler_lease table. It can be taken when it
+    is free or expired, so at most one instance is the active scheduler.
+    """
+    now = time.time()
+    conn = db.get_db_connection()
+    try:
+        with conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO scheduler_lease (name, owner, expires_at, acquired_at) VALUES (?, ?, ?, ?)",
+                (LEADER_LEASE_NAME, instance_id, now + lease_seconds, _format(datetime.now()))
+            )
+            if cursor.rowcount:
+                return True
+            cursor = conn.execute(
+                "UPDATE scheduler_lease SET owner = ?, expires_at = ?, "
+                "acquired_at = CASE WHEN owner = ? THEN acquired_at ELSE ? END "
+                "WHERE name = ? AND (owner = ? OR expires_at < ?)",
+                (instance_id, now + lease_seconds, instance_id, _format(datetime.now()),
+                 LEADER_LEASE_NAME, instance_id, now)
+            )
+            return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+def release_leadership(instance_id):
+    """Gives up the lease so another instance takes over at once, e.g. on shutdown."""
+    conn = db.get_db_connection()
     try:
-        logger.info("Starting scheduler for cron-based syncs")
-        scheduler_running = True
-        
-        # Schedule the check to run every minute
-        schedule.every(1).minutes.do(run_check_scheduled_articles)
-        logger.info("Scheduled check configured to run every minute")
-        
-        # Run the scheduler in a loop
-        while scheduler_running:
+        with conn:
+            conn.execute("DELETE FROM scheduler_lease WHERE name = ? AND owner = ?", (LEADER_LEASE_NAME, instance_id))
+    finally:
+        conn.close()
+
+def get_scheduler_leader():
+    """The active scheduler as {"owner", "acquired_at", "expires_in"} (seconds), or None when there is none."""
+    conn = db.get_db_connection()
+    try:
+        row = conn.execute("SELECT * FROM scheduler_lease WHERE name = ?", (LEADER_LEASE_NAME,)).fetchone()
+    finally:
+        conn.close()
+    if row is None or row['expires_at'] < time.time():
+        return None
+    return {"owner": row['owner'], "acquired_at": row['acquired_at'],
+            "expires_in": round(row['expires_at'] - time.time(), 1)}
+
+# ---------------------------- SCHEDULER ----------------------------
+class Scheduler:
+    """
+    Queues scheduled syncs for the job workers, on the app's event loop.
+
+    Keeps a heap of (next_run_at, article id) and sleeps until its earliest
+    entry, so a tick only touches the articles that are due. The database
+    is the source of truth: heap entries whose time no longer matches the
+    article's next_run_at are dropped, and the heap is reloaded whenever a
+    schedule is saved.
+
+    Every web app and worker process may run a Scheduler; only the one
+    holding the leader lease queues syncs, the others stand by to take over.
+    """
+
+    def __init__(self, poll_seconds=None, instance_id=None):
+        self.instance_id = instance_id or new_worker_id()
+        self._heap = []
+        self._changed = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        # Outside the web UI nobody calls wake(), so look for newly saved schedules this often
+        self._poll_seconds = poll_seconds
+        self._leading = False
+        # While the dispatch cap holds runs back, the next batch is queued from this time (monotonic)
+        self._next_tick = 0.0
+
+    def wake(self):
+        """Thread-safe: reload the schedule from the database."""
+        self._loop.call_soon_threadsafe(self._changed.set)
+
+    async def _reload(self):
+        self._changed.clear()
+        entries = await self._loop.run_in_executor(None, _load_schedule)
+        self._heap = [(next_run_at, article_id) for next_run_at, article_id in entries if next_run_at]
+        heapq.heapify(self._heap)
+        logger.info("Scheduler tracking %d scheduled articles", len(self._heap))
+
+    async def _check_for_earlier_runs(self):
+        earliest = await self._loop.run_in_executor(None, _earliest_next_run)
+        if earliest is not None and (not self._heap or earliest < self._heap[0][0]):
+            self._changed.set()
+
+    async def _hold_leadership(self):
+        leading = await self._loop.run_in_executor(None, acquire_leadership, self.instance_id)
+        if leading and not self._leading:
+            logger.info("Scheduler %s is now the active scheduler", self.instance_id)
+            # The previous leader may have moved next runs since this instance last looked
+            self._changed.set()
+        elif self._leading and not leading:
+            logger.warning("Scheduler %s lost its lease to another instance", self.instance_id)
+            self._heap = []
+        self._leading = leading
+        return leading
+
+    async def _sleep_until_due(self):
+        # Wake up in time to renew the lease
+        delay = min(self._poll_seconds or MAX_SLEEP_SECONDS, LEADER_RENEW_SECONDS)
+        if self._heap:
+            next_run = datetime.strptime(self._heap[0][0], TIMESTAMP_FORMAT)
+            due_in = max((next_run - datetime.now()).total_seconds(), self._next_tick - time.monotonic())
+            delay = min(delay, max(0.0, due_in))
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _pop_due(self, now, limit):
+        due = set()
+        stamp = _format(now)
+        while self._heap and self._heap[0][0] <= stamp and len(due) < limit:
+            due.add(heapq.heappop(self._heap)[1])
+        return due
+
+    async def _dispatch(self, now):
+        if time.monotonic() < self._next_tick:
+            return
+        cap = get_dispatch_cap()
+        due = self._pop_due(now, cap)
+        if not due:
+            return
+        if self._heap and self._heap[0][0] <= _format(now):
+            # The rest stay due in the heap (and the database) until the next tick
+            self._next_tick = time.monotonic() + DISPATCH_TICK_SECONDS
+            logger.info("Dispatch cap of %d reached; more due syncs are queued in %ds", cap, DISPATCH_TICK_SECONDS)
+        # Stale heap entries (schedule changed or cleared) are filtered out here
+        articles = await self._loop.run_in_executor(None, _claim_due, due, now)
+        if len(articles) < len(due):
+            # Some schedules moved; their new next runs are not in the heap yet
+            self._changed.set()
+        for article in articles:
+            if article['next_run_at']:
+                heapq.heappush(self._heap, (article['next_run_at'], article['id']))
+        if articles:
+            await refresh_indexes(articles)
+            # An article that is already queued or syncing keeps that job instead of getting a second one
+            jobs = await self._loop.run_in_executor(
+                None, enqueue_jobs, [article['id'] for article in articles], TRIGGER_SCHEDULE, self.instance_id
+            )
+            logger.info("Queued %d scheduled syncs as %s", len(jobs), self.instance_id)
+
+    async def run(self):
+        while True:
             try:
-                schedule.run_pending()
-                time.sleep(1)
+                if not await self._hold_leadership():
+                    await asyncio.sleep(LEADER_RETRY_SECONDS)
+                    continue
+                if self._changed.is_set():
+                    await self._reload()
+                await self._dispatch(datetime.now())
+                await self._sleep_until_due()
+                if self._poll_seconds and not self._changed.is_set():
+                    await self._check_for_earlier_runs()
+            except asyncio.CancelledError:
+                if self._leading:
+                    release_leadership(self.instance_id)
+                raise
             except Exception as e:
                 logger.error("Error in scheduler loop: %s", str(e))
                 logger.error("Traceback: %s", traceback.format_exc())
-                time.sleep(1)  # Wait a bit before retrying
-    except Exception as e:
-        logger.error("Fatal error in scheduler: %s", str(e))
-        logger.error("Traceback: %s", traceback.format_exc())
-        scheduler_running = False
-
-def run_scheduler():
-    """Run the scheduler in a separate thread."""
-    global scheduler_running
-    try:
-        logger.info("Initializing scheduler thread...")
-        scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-        scheduler_thread.start()
-        logger.info("Scheduler thread started with ID: %s", scheduler_thread.ident)
-        
-        # Verify thread is running
-        if scheduler_thread.is_alive():
-            logger.info("Scheduler thread is running")
-        else:
-            logger.error("Scheduler thread failed to start")
-            
-    except Exception as e:
-        logger.error("Error starting scheduler thread: %s", str(e))
-        logger.error("Traceback: %s", traceback.format_exc())
-        scheduler_running = False
+                await asyncio.sleep(1)
+
+_scheduler = None
+_scheduler_task = None
+
+async def start_scheduler(poll_seconds=None):
+    """
+    Starts the scheduler on the running event loop (the app's, when registered with app.on_startup).
+
+    `poll_seconds` makes it notice schedules saved by another process, e.g. in a worker process.
+    """
+    global _scheduler, _scheduler_task
+    if _scheduler_task is not None:
+        return
+    logger.info("Starting scheduler for cron-based syncs")
+    _scheduler = Scheduler(poll_seconds)
+    _scheduler_task = asyncio.get_running_loop().create_task(_scheduler.run())
+
+def wake_scheduler():
+    """Tells a running scheduler that schedules changed; does nothing when it is not running."""
+    if _scheduler is not None:
+        _scheduler.wake()
 
 def stop_scheduler():
     """Stop the scheduler."""
-    global scheduler_running
+    global _scheduler, _scheduler_task
     logger.info("Stopping scheduler...")
-    scheduler_running = False 
\ No newline at end of file
+    task = _scheduler_task
+    _scheduler = _scheduler_task = None
+    if task is not None:
+        task.get_loop().call_soon_threadsafe(task.cancel)
@@ -1,8 +1,14 @@
+import asyncio
+from datetime import datetime
 from syncapp.config.settings import ensure_settings_file, load_settings
+import syncapp.config.database as db
 from syncapp.loggers.log_cli import setup_logger
 from syncapp.core.fetcher import fetch_content
-from syncapp.core.zendesk import update_zendesk_translation, verify_article_update
+from syncapp.core import remote_index, source_cache
+from syncapp.core.zendesk import should_audit, update_zendesk_translation, verify_article_update, verify_translation
 from syncapp.config.settings import validate
+from syncapp.utils.hashing import content_hash
+from syncapp.utils.timing import timed
 
 
 logger = setup_logger(__name__)
@@ -15,16 +21,173 @@ load_settings()
 
 settings = load_settings()
 
-async def run_sync_async(article_id: str, source_url: str, title: str):
+STATUS_SUCCESS = "Success"
+STATUS_FAILED = "Failed"
+STATUS_UNCHANGED = "Unchanged"
+
+class LocaleResult:
+    """Outcome of pushing an article to one locale."""
+
+    def __init__(self, locale, success, message, status=None):
+        self.locale = locale
+        self.success = success
+        self.message = message
+        self.status = status or (STATUS_SUCCESS if success else STATUS_FAILED)
+
+class SyncResult:
     """
-    Async wrapper for the sync logic to be used with NiceGUI without blocking the UI.
+    Outcome of a single article sync.
+
+    `status` is the value recorded in the articles table. `cache_hit` is True
+    when the source page was unchanged since the last successful sync and the
+    rest of the pipeline was skipped. `locale_results` maps each target
+    locale to its LocaleResult.
     """
+
+    def __init__(self, success, message, status=None, cache_hit=False, fetch_path=None, locale_results=None):
+        self.success = success
+        self.message = message
+        self.status = status or (STATUS_SUCCESS if success else STATUS_FAILED)
+        self.cache_hit = cache_hit
+        self.fetch_path = fetch_path
+        self.locale_results = locale_results or {}
+
+    def __repr__(self):
+        return f"SyncResult(status={self.status!r}, cache_hit={self.cache_hit}, message={self.message!r})"
+
+#------------ Per-locale sync state ------------
+def get_pushed_hash(article_id, locale):
+    conn = db.get_db_connection()
     try:
-        logger.info("Validating settings...")
-        validate()
+        row = conn.execute(
+            "SELECT content_hash FROM article_translations WHERE article_id = ? AND locale = ? AND content_hash IS NOT NULL",
+            (article_id, locale)
+        ).fetchone()
+        if row is None:
+            # Recorded before per-locale state existed; the hash covers the locale, so it only matches its own
+            row = conn.execute(
+                "SELECT content_hash FROM articles WHERE article_id = ? AND content_hash IS NOT NULL",
+                (article_id,)
+            ).fetchone()
+        return row["content_hash"] if row else None
+    finally:
+        conn.close()
+
+def get_stored_hash(article_id, locale):
+    """Hash of the translation Zendesk returned for the last push (remote_index.translation_hash), or None."""
+    conn = db.get_db_connection()
+    try:
+        row = conn.execute(
+            "SELECT remote_hash FROM article_translations WHERE article_id = ? AND locale = ?", (article_id, locale)
+        ).fetchone()
+        return row["remote_hash"] if row else None
+    finally:
+        conn.close()
+
+def record_locale_result(article_id, locale, status, pushed_hash=None, stored_hash=None):
+    """
+    Stores the status of one locale and, when there was a push, the hashes of what was sent
+    and of the translation Zendesk stored from it.
+    """
+    conn = db.get_db_connection()
+    try:
+        conn.execute("""
+            INSERT INTO article_translations (article_id, locale, status, last_synced, content_hash, remote_hash)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (article_id, locale) DO UPDATE SET
+                status = excluded.status,
+                last_synced = excluded.last_synced,
+                content_hash = COALESCE(excluded.content_hash, article_translations.content_hash),
+                remote_hash = COALESCE(excluded.remote_hash, article_translations.remote_hash)
+        """, (article_id, locale, status, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), pushed_hash, stored_hash))
+        conn.commit()
+    finally:
+        conn.close()
 
-        # Load fresh settings
+def get_locale_statuses():
+    """Returns article_id -> {locale: status} for every article synced so far."""
+    conn = db.get_db_connection()
+    try:
+        rows = conn.execute("SELECT article_id, locale, status FROM article_translations ORDER BY locale").fetchall()
+    finally:
+        conn.close()
+    statuses = {}
+    for row in rows:
+        statuses.setdefault(row["article_id"], {})[row["locale"]] = row["status"]
+    return statuses
+
+async def push_locale(article_id, locale, title, body_html, zendesk_domain, known_hash):
+    """
+    Pushes cleaned content to one locale unless it already holds it.
+
+    `known_hash` is the hash of the content last sent to the locale, None when
+    it has to be pushed regardless. Returns a LocaleResult and never raises.
+    """
+    try:
+        loop = asyncio.get_event_loop()
+        new_hash = await loop.run_in_executor(None, content_hash, locale, title, body_html)
+        if new_hash == known_hash:
+            logger.info("Cleaned content unchanged since last push, skipping %s/%s", article_id, locale)
+            record_locale_result(article_id, locale, STATUS_UNCHANGED)
+            return LocaleResult(locale, True, "Content unchanged since last push", STATUS_UNCHANGED)
+
+        logger.info("Updating Zendesk article ID %s (%s)...", article_id, locale)
+        with timed("push"):
+            translation = await update_zendesk_translation(
+                article_id=article_id,
+                zendesk_domain=zendesk_domain,
+                locale=locale,
+                title=title,
+                body_html=body_html,
+            )
+
+        # The PUT answers with the stored translation, so no second request is needed to verify it
+        logger.info("Verifying article update...")
+        verified = await loop.run_in_executor(None, verify_translation, body_html, translation)
+        if should_audit():
+            logger.info("Auditing article %s/%s with a separate GET", article_id, locale)
+            verified = await verify_article_update(article_id, locale, expected_body=body_html) and verified
+
+        # Zendesk sanitizes the body, so the index is later compared with what it returned, not with what was sent
+        record_locale_result(article_id, locale, STATUS_SUCCESS, new_hash,
+                             remote_index.translation_hash(locale, translation))
+        await loop.run_in_executor(None, remote_index.record_translation, article_id, locale, translation)
+        if not verified:
+            return LocaleResult(locale, True, "Sync completed, but Zendesk stored a different body than was sent")
+        return LocaleResult(locale, True, "Sync process completed successfully!")
+    except Exception as e:
+        logger.error("Error pushing %s/%s: %s", article_id, locale, str(e))
+        record_locale_result(article_id, locale, STATUS_FAILED)
+        return LocaleResult(locale, False, f"Sync failed: {str(e)}")
+
+def _combine(locale_results, fetch_path):
+    results = list(locale_results.values())
+    if any(not result.success for result in results):
+        status = STATUS_FAILED
+    elif any(result.status == STATUS_SUCCESS for result in results):
+        status = STATUS_SUCCESS
+    else:
+        status = STATUS_UNCHANGED
+    if len(results) == 1:
+        message = results[0].message
+    else:
+        message = "; ".join(f"{result.locale}: {result.message}" for result in results)
+    return SyncResult(status != STATUS_FAILED, message, status=status, fetch_path=fetch_path,
+                      locale_results=locale_results)
+
+async def run_sync_async(article_id: str, source_url: str, title: str, locales=None, browser_slots=None):
+    """
+    Async wrapper for the sync logic to be used with NiceGUI without blocking the UI.
+
+    The page is fetched and cleaned once and then pushed to every locale in
+    `locales` (default: the LOCAL setting) concurrently. `browser_slots` is
+    passed on to fetch_content. Returns a SyncResult.
+    """
+    try:
+        # One snapshot for the whole sync, so every step sees the same configuration
         current_settings = load_settings()
+        logger.info("Validating settings...")
+        validate(current_settings)
         
         # Validate required settings
         if not current_settings.get("ZENDESK_DOMAIN"):
@@ -34,25 +197,55 @@ async def run_sync_async(article_id: str, source_url: str, title: str):
         if not current_settings.get("API_TOKEN"):
             raise ValueError("API token is not set in settings")
 
-        logger.info("Fetching content from: %s", source_url)
-        content = await fetch_content(source_url)
+        locales = list(dict.fromkeys(locales or [current_settings["LOCAL"]]))
+        target = ",".join(locales)
 
-        logger.info("Updating Zendesk article ID %s...", article_id)
-        await update_zendesk_translation(
-            article_id=article_id,
-            zendesk_domain=current_settings["ZENDESK_DOMAIN"],
-            locale=current_settings["LOCAL"],
-            title=title,
-            body_html=content,
-        )
+        # Validators are only reused while the push target is the same as last time
+        cache_entry = source_cache.get_entry(source_url, article_id)
+        if cache_entry and (cache_entry["title"], cache_entry["locale"]) != (title, target):
+            cache_entry = None
 
-        logger.info("Verifying article update...")
-        await verify_article_update(article_id)
+        # A fresh remote index entry shows what Zendesk really holds. If it differs from what Zendesk
+        # returned for the last push, the article was edited there (or never pushed from here): push again
+        known_hashes = {}
+        for locale in locales:
+            remote_hash = remote_index.get_remote_hash(article_id, locale)
+            if remote_hash is not None and remote_hash != get_stored_hash(article_id, locale):
+                logger.info("Article %s/%s changed in Zendesk since the last push, pushing it again",
+                            article_id, locale)
+                cache_entry = None
+                known_hashes[locale] = None
+            else:
+                known_hashes[locale] = get_pushed_hash(article_id, locale)
+
+        logger.info("Fetching content from: %s", source_url)
+        fetched = await fetch_content(source_url, cache_entry, browser_slots)
+        if fetched.unchanged:
+            logger.info("Source unchanged since last sync, skipping Zendesk update for %s", article_id)
+            message = "Source unchanged since last sync (cache hit)"
+            for locale in locales:
+                record_locale_result(article_id, locale, STATUS_UNCHANGED)
+            return SyncResult(True, message, status=STATUS_UNCHANGED, cache_hit=True, fetch_path=fetched.path,
+                              locale_results={locale: LocaleResult(locale, True, message, STATUS_UNCHANGED)
+                                              for locale in locales})
+
+        # Fan out over the pooled Zendesk client; each locale succeeds or fails on its own
+        results = await asyncio.gather(*[
+            push_locale(article_id, locale, title, fetched.content,
+                        current_settings["ZENDESK_DOMAIN"], known_hashes[locale])
+            for locale in locales
+        ])
+        locale_results = {result.locale: result for result in results}
 
-        logger.info("Sync process completed successfully!")
-        return True, "Sync process completed successfully!"
+        # Only once every locale holds the content, otherwise the next sync would skip the failed ones
+        if all(result.success for result in results):
+            source_cache.store_entry(source_url, article_id, title, target,
+                                     fetched.etag, fetched.last_modified, fetched.source_hash,
+                                     fetched.pipeline_version)
+            logger.info("Sync process completed successfully!")
+        return _combine(locale_results, fetched.path)
 
     except Exception as e:
         error_msg = str(e)
         logger.error("Error during sync: %s", error_msg)
-        return False, f"Sync failed: {error_msg}"
\ No newline at end of file
+        return SyncResult(False, f"Sync failed: {error_msg}")
@@ -0,0 +1,107 @@
+import asyncio
+import multiprocessing
+import signal
+import time
+from syncapp.config.database import init_db
+from syncapp.backend.job_queue import JobWorkerPool
+from syncapp.backend.sync_auto_run import start_scheduler, stop_scheduler
+from syncapp.core.clean_pool import shutdown_clean_pool
+from syncapp.core.driver_pool import shutdown_driver_pool, start_driver_pool
+from syncapp.core.mermaid import shutdown_mermaid_renderer
+from syncapp.core.zendesk import shutdown_zendesk_client
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+# How often a worker process's scheduler looks for schedules saved in the web UI
+SCHEDULE_POLL_SECONDS = 10
+# A worker process that exits unexpectedly is started again after this delay
+RESTART_DELAY_SECONDS = 5
+
+def _install_stop_handlers(loop, stop):
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except NotImplementedError:  # Windows
+            signal.signal(signum, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+async def _serve(concurrency, run_scheduler):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    _install_stop_handlers(loop, stop)
+
+    pool = JobWorkerPool(concurrency)
+    pool.start()
+    if run_scheduler:
+        await start_scheduler(SCHEDULE_POLL_SECONDS)
+    try:
+        await stop.wait()
+    finally:
+        stop_scheduler()
+        await pool.stop()
+
+def serve(concurrency=None, run_scheduler=True):
+    """Runs sync workers (and the scheduler) in this process until SIGINT or SIGTERM."""
+    # Pre-launch browsers so the first sync does not pay Chrome startup
+    start_driver_pool()
+    try:
+        asyncio.run(_serve(concurrency, run_scheduler))
+    finally:
+        shutdown_driver_pool()
+        shutdown_clean_pool()
+        shutdown_mermaid_renderer()
+        shutdown_zendesk_client()
+
+def _start_process(context, number, concurrency, run_scheduler):
+    process = context.Process(target=serve, args=(concurrency, run_scheduler), name=f"syncapp-worker-{number}")
+    process.start()
+    logger.info("Started worker process %d (pid %s%s)", number, process.pid, ", scheduler" if run_scheduler else "")
+    return process
+
+# ---------------------------- WORKER PROCESSES ----------------------------
+def run_workers(processes=1, concurrency=None, run_scheduler=True):
+    """
+    Runs `processes` worker processes that take sync jobs from the database.
+
+    With one process the workers run in this one. Otherwise this process only
+    supervises: a child that dies is started again and SIGINT/SIGTERM stops
+    them all. Every process runs a scheduler; the leader lease keeps all but
+    one of them on standby.
+    """
+    init_db()
+    if processes <= 1:
+        serve(concurrency, run_scheduler)
+        return
+
+    # "spawn" so every child starts clean instead of inheriting this process's threads
+    context = multiprocessing.get_context("spawn")
+    children = {number: _start_process(context, number, concurrency, run_scheduler)
+                for number in range(1, processes + 1)}
+    stopping = False
+
+    def request_stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    try:
+        while not stopping:
+            time.sleep(1)
+            for number, process in list(children.items()):
+                if process.is_alive() or stopping:
+                    continue
+                logger.error("Worker process %d exited with code %s, restarting it in %ds",
+                             number, process.exitcode, RESTART_DELAY_SECONDS)
+                time.sleep(RESTART_DELAY_SECONDS)
+                children[number] = _start_process(context, number, concurrency, run_scheduler)
+    finally:
+        logger.info("Stopping %d worker processes...", len(children))
+        for process in children.values():
+            if process.is_alive():
+                process.terminate()
+        for process in children.values():
+            process.join(timeout=30)
+            if process.is_alive():
+                process.kill()
+        logger.info("Worker processes stopped")
@@ -0,0 +1,136 @@
+# bench/e2e.py
+# Run with: python -m syncapp.bench.e2e page1.html page2.html --articles 200 --concurrency 16
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+import typer
+from syncapp.bench.fake_zendesk import FakeZendesk, start_server
+from syncapp.bench.fixtures import FixturePages
+from syncapp.utils.timing import get_stage_stats, percentile, reset_stage_stats
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+app = typer.Typer(help="End-to-end sync throughput against a local Zendesk stand-in.")
+
+def _peak_memory_mb():
+    """Peak resident memory of this process and of its finished children (e.g. cleaning workers)."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in KiB on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f}" if seconds is not None else "     n/a"
+
+async def _bench(pages, articles, concurrency, passes, fake):
+    # Imported here so they pick up SYNCAPP_CONFIG_DIR
+    import syncapp.config.database as db
+    from syncapp.backend.sync_runnerv2 import STATUS_FAILED, run_sync_async
+
+    fixtures = FixturePages(pages)
+    zendesk_runner, zendesk_url = await start_server(fake.make_app())
+    fixture_runner, fixture_url = await start_server(fixtures.make_app())
+    settings_file = Path(os.environ["SYNCAPP_CONFIG_DIR"]) / "settings.json"
+    current_settings = json.loads(settings_file.read_text(encoding="utf-8"))
+    current_settings["ZENDESK_DOMAIN"] = zendesk_url
+    settings_file.write_text(json.dumps(current_settings, indent=2), encoding="utf-8")
+
+    db.init_db()
+    rows = [(f"Article {n}", fixtures.url(fixture_url, n), str(100000 + n)) for n in range(articles)]
+    db.insert_articles(rows)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sync_one(title, source_url, article_id):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await run_sync_async(article_id, source_url, title)
+            return result, time.perf_counter() - start
+
+    report = []
+    try:
+        for number in range(1, passes + 1):
+            reset_stage_stats()
+            start = time.perf_counter()
+            outcomes = await asyncio.gather(*[sync_one(*row) for row in rows])
+            elapsed = time.perf_counter() - start
+            latencies = [latency for _, latency in outcomes]
+            statuses = {}
+            for result, _ in outcomes:
+                statuses[result.status] = statuses.get(result.status, 0) + 1
+            report.append((number, elapsed, latencies, statuses, get_stage_stats()))
+            if statuses.get(STATUS_FAILED):
+                failed = next(result for result, _ in outcomes if result.status == STATUS_FAILED)
+                typer.echo(f"pass {number}: first failure: {failed.message}", err=True)
+    finally:
+        await zendesk_runner.cleanup()
+        await fixture_runner.cleanup()
+    return report
+
+@app.command()
+def run(
+    pages: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Saved page sources to serve"),
+    articles: int = typer.Option(100, min=1, help="Articles to sync per pass"),
+    concurrency: int = typer.Option(16, min=1, help="Syncs in flight at once"),
+    passes: int = typer.Option(2, min=1, help="Passes over the same articles; later ones exercise the caches"),
+    locale: str = typer.Option("en-us", help="Locale to push"),
+    latency_ms: float = typer.Option(50, help="Zendesk base latency per request"),
+    jitter_ms: float = typer.Option(20, help="Zendesk random extra latency per request"),
+    throttle_rate: float = typer.Option(0.0, min=0, max=1, help="Share of Zendesk requests answered with 429"),
+    error_rate: float = typer.Option(0.0, min=0, max=1, help="Share of Zendesk requests answered with 500"),
+    clean_processes: Optional[int] = typer.Option(None, min=0, help="Cleaning processes (default: the app default)"),
+    config_dir: Optional[Path] = typer.Option(None, file_okay=False, help="Keep the run's databases here"),
+):
+    """Syncs N fixture articles into the stand-in and reports throughput, stage latencies and peak memory."""
+    logging.disable(logging.INFO)
+    # Must be set before any syncapp.config module is imported
+    run_dir = config_dir or Path(tempfile.mkdtemp(prefix="syncapp-bench-"))
+    run_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["SYNCAPP_CONFIG_DIR"] = str(run_dir)
+    bench_settings = {"ZENDESK_DOMAIN": "", "EMAIL": "bench@example.com", "API_TOKEN": "bench-token", "LOCAL": locale}
+    if clean_processes is not None:
+        bench_settings["CLEAN_PROCESSES"] = clean_processes
+    (run_dir / "settings.json").write_text(json.dumps(bench_settings, indent=2), encoding="utf-8")
+
+    from syncapp.core.clean_pool import shutdown_clean_pool
+    from syncapp.core.zendesk import get_zendesk_stats, shutdown_zendesk_client
+
+    fake = FakeZendesk(latency_ms, jitter_ms, throttle_rate, error_rate)
+    try:
+        report = asyncio.run(_bench(pages, articles, concurrency, passes, fake))
+        zendesk_stats = get_zendesk_stats()
+    finally:
+        shutdown_zendesk_client()
+        # Waits for the workers to exit so their peak memory is counted below
+        shutdown_clean_pool(wait=True)
+
+    typer.echo(f"{articles} articles, concurrency {concurrency}, data in {run_dir}")
+    for number, elapsed, latencies, statuses, stages in report:
+        typer.echo(f"\npass {number}: {elapsed:.2f}s, {articles / elapsed:.1f} articles/s, "
+                   + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+        typer.echo(f"  {'stage':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for stage, stats in sorted(stages.items()):
+            typer.echo(f"  {stage:<16}{stats['count']:>7}{_ms(stats['p50'])}  {_ms(stats['p95'])}  {_ms(stats['max'])}")
+        typer.echo(f"  {'sync':<16}{len(latencies):>7}{_ms(percentile(latencies, 50))}  "
+                   f"{_ms(percentile(latencies, 95))}  {_ms(max(latencies))}")
+
+    typer.echo(f"\nfake Zendesk: {fake.stats}")
+    for stats in zendesk_stats.values():
+        typer.echo(f"client: {stats}")
+    own_mb, children_mb = _peak_memory_mb()
+    if own_mb is None:
+        typer.echo("peak memory: n/a on this platform")
+    else:
+        typer.echo(f"peak memory: {own_mb:.0f} MB (this process), {children_mb:.0f} MB (largest cleaning worker)")
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,129 @@
+# bench/fake_zendesk.py
+# Run with: python -m syncapp.bench.fake_zendesk --port 8900 --latency-ms 80 --throttle-rate 0.05
+import asyncio
+import random
+import re
+from aiohttp import web
+import typer
+
+app = typer.Typer(help="Local stand-in for the Zendesk Help Center translation endpoints.")
+
+TRANSLATION_ROUTE = "/api/v2/help_center/articles/{article_id}/translations/{locale}.json"
+CREATE_ROUTE = "/api/v2/help_center/articles/{article_id}/translations.json"
+LIST_ROUTE = "/api/v2/help_center/{locale}/articles.json"
+FAKE_RATE_LIMIT = 700
+# Like Zendesk's sanitizer: drops these attributes and rewrites self-closing void tags
+SANITIZED_ATTRIBUTES = re.compile(r'\s(?:style|tabindex|data-[\w-]+|aria-[\w-]+)="[^"]*"')
+SELF_CLOSING = re.compile(r"<(br|img|hr)([^>]*?)\s*/>")
+
+class FakeZendesk:
+    """
+    In-memory translations behind the endpoints core/zendesk.py and core/remote_index.py use.
+
+    Every request waits `latency_ms` (plus up to `jitter_ms`), then answers
+    429 with Retry-After with probability `throttle_rate`, or 500 with
+    probability `error_rate`. Translation PUTs to unknown articles create them.
+    With `sanitize` stored bodies are rewritten the way Zendesk does, so they
+    differ from what was sent.
+    """
+
+    def __init__(self, latency_ms=50, jitter_ms=20, throttle_rate=0.0, error_rate=0.0, retry_after=1,
+                 sanitize=True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.sanitize = sanitize
+        self.translations = {}
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "puts": 0, "gets": 0}
+
+    @web.middleware
+    async def _faults(self, request, handler):
+        self.stats["requests"] += 1
+        await asyncio.sleep((self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000)
+        headers = {"X-Rate-Limit": str(FAKE_RATE_LIMIT)}
+        roll = random.random()
+        if roll < self.throttle_rate:
+            self.stats["throttled"] += 1
+            return web.json_response({"error": "TooManyRequests"}, status=429,
+                                     headers=dict(headers, **{"Retry-After": str(self.retry_after)}))
+        if roll < self.throttle_rate + self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "InternalError"}, status=500, headers=headers)
+        response = await handler(request)
+        response.headers.update(headers)
+        return response
+
+    def _translation(self, article_id, locale, title, body):
+        if self.sanitize and body:
+            body = SELF_CLOSING.sub(r"<\1\2>", SANITIZED_ATTRIBUTES.sub("", body))
+        return {"article_id": int(article_id) if article_id.isdigit() else article_id, "locale": locale,
+                "title": title, "body": body, "updated_at": "2025-01-01T00:00:00Z"}
+
+    async def _get(self, request):
+        self.stats["gets"] += 1
+        key = (request.match_info["article_id"], request.match_info["locale"])
+        if key not in self.translations:
+            return web.json_response({"error": "RecordNotFound"}, status=404)
+        return web.json_response({"translation": self.translations[key]})
+
+    async def _put(self, request):
+        self.stats["puts"] += 1
+        article_id, locale = request.match_info["article_id"], request.match_info["locale"]
+        data = (await request.json())["translation"]
+        translation = self._translation(article_id, locale, data.get("title"), data.get("body"))
+        self.translations[(article_id, locale)] = translation
+        return web.json_response({"translation": translation})
+
+    async def _create(self, request):
+        article_id = request.match_info["article_id"]
+        data = (await request.json())["translation"]
+        translation = self._translation(article_id, data["locale"], data.get("title"), data.get("body"))
+        self.translations[(article_id, data["locale"])] = translation
+        return web.json_response({"translation": translation}, status=201)
+
+    async def _list(self, request):
+        locale = request.match_info["locale"]
+        size = int(request.query.get("page[size]", 30))
+        after = int(request.query.get("page[after]", 0))
+        articles = [dict(translation, id=translation["article_id"])
+                    for (_, translation_locale), translation in sorted(self.translations.items(), key=str)
+                    if translation_locale == locale]
+        page = articles[after:after + size]
+        has_more = after + size < len(articles)
+        next_url = str(request.url.update_query({"page[after]": after + size})) if has_more else None
+        return web.json_response({"articles": page, "meta": {"has_more": has_more}, "links": {"next": next_url}})
+
+    def make_app(self):
+        web_app = web.Application(middlewares=[self._faults])
+        web_app.router.add_get(TRANSLATION_ROUTE, self._get)
+        web_app.router.add_put(TRANSLATION_ROUTE, self._put)
+        web_app.router.add_post(CREATE_ROUTE, self._create)
+        web_app.router.add_get(LIST_ROUTE, self._list)
+        return web_app
+
+async def start_server(web_app, host="127.0.0.1", port=0):
+    """Starts an aiohttp app on the running loop and returns (runner, base URL); port 0 picks a free port."""
+    runner = web.AppRunner(web_app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}"
+
+@app.command()
+def serve(
+    port: int = typer.Option(8900, help="Port to listen on"),
+    latency_ms: float = typer.Option(50, help="Base latency per request"),
+    jitter_ms: float = typer.Option(20, help="Random extra latency per request"),
+    throttle_rate: float = typer.Option(0.0, min=0, max=1, help="Share of requests answered with 429"),
+    error_rate: float = typer.Option(0.0, min=0, max=1, help="Share of requests answered with 500"),
+    sanitize: bool = typer.Option(True, help="Rewrite stored bodies like Zendesk's sanitizer"),
+):
+    """Serves the fake; set ZENDESK_DOMAIN to http://127.0.0.1:<port> to sync against it."""
+    fake = FakeZendesk(latency_ms, jitter_ms, throttle_rate, error_rate, sanitize=sanitize)
+    web.run_app(fake.make_app(), host="127.0.0.1", port=port)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,55 @@
+# bench/fixtures.py
+# Run with: python -m syncapp.bench.fixtures page1.html page2.html --port 8901
+import hashlib
+from pathlib import Path
+from typing import List
+from aiohttp import web
+import typer
+
+app = typer.Typer(help="Serve saved documentation pages as many distinct source pages.")
+
+class FixturePages:
+    """
+    Serves saved page sources at /pages/{n}/index.html for any n.
+
+    Page n is the saved page n modulo the number of pages with a comment
+    naming n added, so every article has its own source hash and gets
+    cleaned instead of hitting the cleaning memo. ETags are sent and
+    honoured, as a static docs host would.
+    """
+
+    def __init__(self, pages):
+        self.sources = [Path(page).read_text(encoding="utf-8") for page in pages]
+        self.requests = 0
+
+    def url(self, base_url, n):
+        return f"{base_url}/pages/{n}/index.html"
+
+    def _page(self, n):
+        source = self.sources[n % len(self.sources)]
+        marker = f"<!-- fixture page {n} -->"
+        return source.replace("</body>", marker + "</body>", 1) if "</body>" in source else source + marker
+
+    async def _serve(self, request):
+        self.requests += 1
+        body = self._page(int(request.match_info["n"]))
+        etag = '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+    def make_app(self):
+        web_app = web.Application()
+        web_app.router.add_get(r"/pages/{n:\d+}/index.html", self._serve)
+        return web_app
+
+@app.command()
+def serve(
+    pages: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Saved page sources"),
+    port: int = typer.Option(8901, help="Port to listen on"),
+):
+    """Serves the pages at http://127.0.0.1:<port>/pages/<n>/index.html."""
+    web.run_app(FixturePages(pages).make_app(), host="127.0.0.1", port=port)
+
+if __name__ == "__main__":
+    app()
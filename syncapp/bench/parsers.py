@@ -0,0 +1,53 @@
+# bench/parsers.py
+# Run with: python -m syncapp.bench.parsers page1.html page2.html ...
+import logging
+import time
+from pathlib import Path
+from typing import List
+import typer
+from syncapp.core.fetcher import clean_page
+from syncapp.core.parsers import available_parsers, parse_html
+
+app = typer.Typer(help="Compare HTML parser backends on saved Docusaurus pages.")
+
+REFERENCE_PARSER = "html.parser"
+
+def _time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+@app.command()
+def parsers(
+    pages: List[Path] = typer.Argument(..., exists=True, dir_okay=False, help="Saved page sources"),
+    repeat: int = typer.Option(5, help="Runs per page and backend"),
+):
+    """Reports parse and clean time per backend and whether the cleaned output matches html.parser."""
+    # The fetcher logs every rule it applies, which would dominate the timings
+    logging.disable(logging.INFO)
+
+    backends = available_parsers()
+    typer.echo(f"Backends: {', '.join(backends)}")
+    mismatches = 0
+    for page in pages:
+        source = page.read_text(encoding="utf-8")
+        typer.echo(f"\n{page.name} ({len(source) / 1024:.0f} KiB)")
+        reference = clean_page(source, REFERENCE_PARSER)
+        for backend in backends:
+            parse_seconds, _ = _time(lambda: parse_html(source, backend), repeat)
+            clean_seconds, cleaned = _time(lambda: clean_page(source, backend), repeat)
+            same = cleaned == reference
+            mismatches += not same
+            typer.echo(
+                f"  {backend:<12} parse {parse_seconds * 1000:8.1f} ms | "
+                f"parse+clean {clean_seconds * 1000:8.1f} ms | "
+                f"{'same output' if same else 'DIFFERENT OUTPUT'}"
+            )
+
+    if mismatches:
+        typer.echo(f"\n{mismatches} backend/page combinations differ from {REFERENCE_PARSER}")
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
@@ -12,7 +12,7 @@ def check_node_and_mmdc():
     # Check Mermaid CLI
     if not shutil.which("mmdc"):
         print("🛠 Installing mermaid-cli...")
-        subprocess.run(["npm", "install", "-g", "mermaid.cli"])
+        subprocess.run(["npm", "install", "-g", "@mermaid-js/mermaid-cli"])
 
 def start_app():
     from syncapp.main import main
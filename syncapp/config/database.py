@@ -1,3 +1,4 @@
+import os
 import sqlite3
 from pathlib import Path
 from syncapp.loggers.log_cli import setup_logger
@@ -8,7 +9,7 @@ logger = setup_logger(__name__)
 
 #------------ Database ------------
 APP_NAME = "SyncImporter"
-CONFIG_DIR = Path(user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
+CONFIG_DIR = Path(os.environ.get("SYNCAPP_CONFIG_DIR") or user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
 DB_FILE = CONFIG_DIR / "articles.db"
 logger.info("Database file: %s", DB_FILE)
 
@@ -20,6 +21,74 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row  # This allows accessing columns by name
     return conn
 
+def _create_translations_table(cursor):
+    # Per-locale sync state of an article; articles.locales lists the locales to push to
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_translations (
+            article_id TEXT NOT NULL,
+            locale TEXT NOT NULL,
+            status TEXT DEFAULT 'Pending',
+            last_synced TEXT,
+            content_hash TEXT,
+            remote_hash TEXT,
+            PRIMARY KEY (article_id, locale)
+        )
+    ''')
+    # content_hash is the hash of what was sent; remote_hash the hash of the translation Zendesk returned for it
+    cursor.execute("PRAGMA table_info(article_translations)")
+    if 'remote_hash' not in [column[1] for column in cursor.fetchall()]:
+        logger.info("Adding remote_hash column")
+        cursor.execute("ALTER TABLE article_translations ADD COLUMN remote_hash TEXT")
+
+def _create_jobs_table(cursor):
+    # Durable queue of syncs to run; see backend/job_queue.py
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sync_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_row_id INTEGER NOT NULL,
+            trigger TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            lease_owner TEXT,
+            lease_expires_at REAL,
+            result_status TEXT,
+            message TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT
+        )
+    ''')
+    # At most one queued or running job per article
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_jobs_active
+        ON sync_jobs (article_row_id) WHERE state IN ('queued', 'running')
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_jobs_state ON sync_jobs (state, id)")
+    cursor.execute("PRAGMA table_info(sync_jobs)")
+    if 'dispatched_by' not in [column[1] for column in cursor.fetchall()]:
+        # Scheduler instance that queued a scheduled job
+        logger.info("Adding dispatched_by column")
+        cursor.execute("ALTER TABLE sync_jobs ADD COLUMN dispatched_by TEXT")
+
+def _create_scheduler_lease_table(cursor):
+    # One row per lease; only the instance holding the "scheduler" lease queues scheduled syncs
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scheduler_lease (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            acquired_at TEXT NOT NULL
+        )
+    ''')
+
+def _create_next_run_index(cursor):
+    # The scheduler only reads articles whose next run is due
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_next_run_at ON articles (next_run_at)")
+
+def parse_locales(value):
+    """Splits a comma separated locales column into a list, e.g. "en-us, de" -> ["en-us", "de"]."""
+    return [locale.strip() for locale in (value or "").split(",") if locale.strip()]
+
 def init_db():
     """Initializes the database and creates the table if it doesn't exist."""
     logger.info("Initializing database: %s", DB_FILE)
@@ -41,6 +110,22 @@ def init_db():
             logger.info("Adding last_cron_update column")
             cursor.execute("ALTER TABLE articles ADD COLUMN last_cron_update TEXT")
             
+        if 'content_hash' not in existing_columns:
+            logger.info("Adding content_hash column")
+            cursor.execute("ALTER TABLE articles ADD COLUMN content_hash TEXT")
+
+        if 'locales' not in existing_columns:
+            logger.info("Adding locales column")
+            cursor.execute("ALTER TABLE articles ADD COLUMN locales TEXT")
+
+        if 'next_run_at' not in existing_columns:
+            logger.info("Adding next_run_at column")
+            cursor.execute("ALTER TABLE articles ADD COLUMN next_run_at TEXT")
+
+        _create_next_run_index(cursor)
+        _create_translations_table(cursor)
+        _create_jobs_table(cursor)
+        _create_scheduler_lease_table(cursor)
         conn.commit()
         conn.close()
         return
@@ -57,9 +142,42 @@ def init_db():
             status TEXT DEFAULT 'Pending',
             last_synced TEXT,
             cron_schedule TEXT,
-            last_cron_update TEXT
+            last_cron_update TEXT,
+            content_hash TEXT,
+            locales TEXT,
+            next_run_at TEXT
         )
     ''')
+    _create_next_run_index(cursor)
+    _create_translations_table(cursor)
+    _create_jobs_table(cursor)
+    _create_scheduler_lease_table(cursor)
     conn.commit()
     conn.close()
-    logger.info("Database initialized successfully")
\ No newline at end of file
+    logger.info("Database initialized successfully")
+
+def get_registered_source_urls():
+    """Returns the set of source URLs that already have an article."""
+    conn = get_db_connection()
+    try:
+        return {row['source_url'] for row in conn.execute('SELECT source_url FROM articles')}
+    finally:
+        conn.close()
+
+def insert_articles(rows):
+    """
+    Inserts (title, source_url, article_id) rows in a single transaction.
+
+    Either all rows are inserted or, on error, none are.
+    """
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.executemany(
+                'INSERT INTO articles (title, source_url, article_id) VALUES (?, ?, ?)',
+                rows
+            )
+        logger.info("Inserted %d articles", len(rows))
+        return len(rows)
+    finally:
+        conn.close()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from platformdirs import user_config_dir
 
@@ -8,7 +9,7 @@ from platformdirs import user_config_dir
 def create_log_file():
     # Create logs directory if it doesn't exist
     APP_NAME = "SyncImporter"
-    CONFIG_DIR = Path(user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
+    CONFIG_DIR = Path(os.environ.get("SYNCAPP_CONFIG_DIR") or user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
     LOG_FILE = CONFIG_DIR / "syncapp.log"
 
     return LOG_FILE
\ No newline at end of file
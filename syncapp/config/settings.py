@@ -1,8 +1,10 @@
+import os
 import json
+import tempfile
+import threading
 from pathlib import Path
+from types import MappingProxyType
 from syncapp.loggers.log_cli import setup_logger
-import json
-from pathlib import Path
 from platformdirs import user_config_dir
 
 #------------ logger ------------
@@ -10,7 +12,8 @@ logger = setup_logger(__name__)
 
 # Set up application configuration directory
 APP_NAME = "SyncImporter"
-CONFIG_DIR = Path(user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
+# SYNCAPP_CONFIG_DIR points a run (e.g. a benchmark) at its own settings, databases and logs
+CONFIG_DIR = Path(os.environ.get("SYNCAPP_CONFIG_DIR") or user_config_dir(APP_NAME, appauthor=False))  # appauthor=False prevents duplicate folder
 SETTINGS_FILE = CONFIG_DIR / "settings.json"
 
 def ensure_settings_file():
@@ -90,17 +93,68 @@ SETTINGS_FILE = ensure_settings_file()
 
 logger.info("SETTINGS_FILE exists: %s", SETTINGS_FILE.exists())
 
+#------------ Settings cache ------------
+# Parsed settings are kept until settings.json changes on disk or is saved from here
+_cache_lock = threading.Lock()
+_cached_stamp = None
+_cached_settings = None
+# Bumped on every save so a read that raced with it is not cached
+_generation = 0
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    # Undoes _freeze so a (possibly nested) snapshot can be written back as JSON
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+def _file_stamp():
+    stat = SETTINGS_FILE.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+def invalidate_settings_cache():
+    global _cached_stamp, _cached_settings, _generation
+    with _cache_lock:
+        _cached_stamp = _cached_settings = None
+        _generation += 1
+
 def load_settings():
+    """
+    Returns a read-only snapshot of the settings.
+
+    The file is only read and parsed again when its modification time or
+    size changed, so callers can ask for the settings as often as they like.
+    Use dict(load_settings()) for a copy to modify and save.
+    """
+    global _cached_stamp, _cached_settings
     try:
-        logger.info("Loading settings from %s...", SETTINGS_FILE)
-        if SETTINGS_FILE.exists():
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+        stamp = _file_stamp()
+    except OSError:
         logger.error("Failed to load settings: %s", SETTINGS_FILE)
-        return {}
+        return MappingProxyType({})
+    with _cache_lock:
+        if stamp == _cached_stamp:
+            return _cached_settings
+        generation = _generation
+    try:
+        logger.info("Loading settings from %s...", SETTINGS_FILE)
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as f:
+            loaded = _freeze(json.load(f))
     except Exception as e:
         logger.error("Error loading settings: %s", str(e))
-        return {}
+        return MappingProxyType({})
+    with _cache_lock:
+        if generation == _generation:
+            _cached_stamp, _cached_settings = stamp, loaded
+    return loaded
 
 settings = load_settings()
 logger.info("Settings loaded successfully")
@@ -118,10 +172,11 @@ logger.info("API_TOKEN: %s", masked_token)
 LOCAL = settings.get("LOCAL", "en-us")
 logger.info("LOCAL: %s", LOCAL)
 
-def validate():
+def validate(current_settings=None):
+    """Raises EnvironmentError when a required setting is missing; checks `current_settings` when given."""
     logger.info("Validating started")
-    # Load settings fresh
-    current_settings = load_settings()
+    if current_settings is None:
+        current_settings = load_settings()
     
     # Check required fields
     required_fields = {
@@ -144,7 +199,17 @@ def validate():
     logger.info("Settings validated successfully")
 
 def save_settings_to_file(data):
-    data = dict(data)
-    with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    """Writes `data` (a dict or a load_settings() snapshot) to settings.json."""
+    data = _thaw(data)
+    # Write next to the real file and swap it in, so a failed dump leaves the old settings intact
+    fd, tmp_path = tempfile.mkstemp(dir=SETTINGS_FILE.parent, prefix=".settings-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, SETTINGS_FILE)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    # The new file may have the same mtime and size as the old one
+    invalidate_settings_cache()
     logger.info("Settings saved to %s", SETTINGS_FILE)
\ No newline at end of file
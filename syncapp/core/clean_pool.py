@@ -0,0 +1,55 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_CLEAN_PROCESSES = max(1, (os.cpu_count() or 2) - 1)
+
+# ---------------------------- CLEANING PROCESS POOL ----------------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_clean_executor():
+    """
+    Returns the shared process pool used for cleaning pages.
+
+    Returns None when CLEAN_PROCESSES is 0, in which case cleaning runs in
+    the default thread pool instead.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            processes = int(load_settings().get("CLEAN_PROCESSES", DEFAULT_CLEAN_PROCESSES))
+            if processes <= 0:
+                return None
+            # "spawn" because the app already runs threads (scheduler, browser pool), which fork does not copy safely
+            _executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            logger.info("Started cleaning process pool with %d workers", processes)
+        return _executor
+
+async def run_clean(func, *args):
+    """Runs a synchronous, picklable cleaning function off the event loop."""
+    loop = asyncio.get_event_loop()
+    executor = get_clean_executor()
+    if executor is None:
+        return await loop.run_in_executor(None, func, *args)
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.error("Cleaning process pool broke, restarting it and cleaning in a thread")
+        shutdown_clean_pool()
+        return await loop.run_in_executor(None, func, *args)
+
+def shutdown_clean_pool(wait=False):
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Cleaning process pool stopped")
@@ -1,25 +1,19 @@
 from syncapp.loggers.log_cli import setup_logger
-import asyncio
 
 logger = setup_logger(__name__)
 # ---------------------------- CONVERT TABS TO STATIC ----------------------------
-async def convert_tabs_to_static(soup, tab_container):
+def convert_tabs_to_static(soup, tab_container):
     """Converts a tabs UI block into static H3 headings and wraps tab content in <blockquote> for indentation."""
-    # Run the conversion in a separate thread since BeautifulSoup operations are CPU-bound
-    loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _convert_tabs_to_static_sync, soup, tab_container)
-
-def _convert_tabs_to_static_sync(soup, tab_container):
-    """Synchronous version of convert_tabs_to_static that runs in a separate thread."""
     logger.info("Converting a tabs-container section to static content")
 
-    # Grab tab labels
-    tabs = tab_container.select("ul.tabs > li")
+    # Grab tab labels (same elements as "ul.tabs > li", without the CSS selector engine)
+    tabs = [tab for tab_list in tab_container.find_all("ul", class_="tabs")
+            for tab in tab_list.find_all("li", recursive=False)]
     tab_titles = [tab.get_text(strip=True) for tab in tabs]
     logger.info("Tab titles found: %s", tab_titles)
 
     # Grab tab content blocks (even hidden ones)
-    all_panels = tab_container.select("div[role='tabpanel']")
+    all_panels = tab_container.find_all("div", attrs={"role": "tabpanel"})
     logger.info("Total tab panels found: %d", len(all_panels))
 
     static_sections = []
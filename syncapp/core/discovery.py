@@ -0,0 +1,168 @@
+import asyncio
+import aiohttp
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin, urldefrag, urlparse
+from syncapp.config.settings import load_settings
+from syncapp.core.http_fetch import USER_AGENT, DEFAULT_STATIC_FETCH_TIMEOUT
+from syncapp.core.parsers import parse_html
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_CRAWL_CONCURRENCY = 8
+DEFAULT_CRAWL_MAX_PAGES = 500
+# Nested sitemap indexes deeper than this are ignored
+MAX_SITEMAP_DEPTH = 3
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+# Links to these are never documentation pages
+SKIPPED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico", ".pdf", ".zip",
+                      ".css", ".js", ".json", ".xml", ".txt")
+
+class DiscoveredPage:
+    """A candidate source page. `lastmod` is the sitemap date or Last-Modified header, if any."""
+
+    def __init__(self, url, title, lastmod=None):
+        self.url = url
+        self.title = title
+        self.lastmod = lastmod
+
+def title_from_url(url):
+    """Builds a readable title from the last path segment, e.g. /docs/getting-started -> Getting Started."""
+    segment = urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or urlparse(url).hostname or url
+    return segment.replace("-", " ").replace("_", " ").title()
+
+def _session():
+    timeout = aiohttp.ClientTimeout(
+        total=load_settings().get("STATIC_FETCH_TIMEOUT", DEFAULT_STATIC_FETCH_TIMEOUT)
+    )
+    return aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": USER_AGENT})
+
+# ---------------------------- SITEMAP ----------------------------
+async def _read_sitemap(session, sitemap_url, pages, seen, depth):
+    async with session.get(sitemap_url) as response:
+        if response.status != 200:
+            logger.warning("Sitemap %s returned status %d", sitemap_url, response.status)
+            return
+        body = await response.read()
+    root = ET.fromstring(body)
+
+    if root.tag == f"{SITEMAP_NS}sitemapindex":
+        if depth >= MAX_SITEMAP_DEPTH:
+            logger.warning("Sitemap index %s is nested too deeply, skipping", sitemap_url)
+            return
+        for loc in root.iter(f"{SITEMAP_NS}loc"):
+            child_url = (loc.text or "").strip()
+            if not child_url:
+                continue
+            # One broken child sitemap should not hide the pages of the others
+            try:
+                await _read_sitemap(session, child_url, pages, seen, depth + 1)
+            except (aiohttp.ClientError, TimeoutError, ET.ParseError) as e:
+                logger.warning("Skipping sitemap %s: %s", child_url, str(e) or type(e).__name__)
+        return
+
+    for entry in root.iter(f"{SITEMAP_NS}url"):
+        loc = entry.findtext(f"{SITEMAP_NS}loc")
+        if not loc or loc.strip() in seen:
+            continue
+        url = loc.strip()
+        seen.add(url)
+        lastmod = entry.findtext(f"{SITEMAP_NS}lastmod")
+        pages.append(DiscoveredPage(url, title_from_url(url), lastmod.strip() if lastmod else None))
+
+async def discover_from_sitemap(sitemap_url):
+    """
+    Lists the pages of a sitemap.xml, following sitemap indexes.
+
+    Raises aiohttp.ClientError or ET.ParseError when the sitemap cannot be read.
+    """
+    logger.info("Reading sitemap: %s", sitemap_url)
+    pages = []
+    async with _session() as session:
+        await _read_sitemap(session, sitemap_url, pages, set(), 0)
+    logger.info("Found %d pages in sitemap %s", len(pages), sitemap_url)
+    return pages
+
+# ---------------------------- CRAWLER ----------------------------
+def _in_scope(url, root):
+    parsed = urlparse(url)
+    return (parsed.scheme in ("http", "https") and parsed.netloc == root.netloc
+            and parsed.path.startswith(root.path) and not parsed.path.lower().endswith(SKIPPED_EXTENSIONS))
+
+async def crawl_site(root_url, max_pages=None, concurrency=None):
+    """
+    Crawls same-site links below `root_url` and lists the HTML pages found.
+
+    At most `concurrency` requests are in flight and the crawl stops after
+    `max_pages` pages (CRAWL_CONCURRENCY / CRAWL_MAX_PAGES settings).
+    """
+    settings = load_settings()
+    max_pages = max_pages or settings.get("CRAWL_MAX_PAGES", DEFAULT_CRAWL_MAX_PAGES)
+    concurrency = concurrency or settings.get("CRAWL_CONCURRENCY", DEFAULT_CRAWL_CONCURRENCY)
+    root_url = urldefrag(root_url)[0]
+    root = urlparse(root_url)
+    logger.info("Crawling %s (max %d pages, %d concurrent requests)", root_url, max_pages, concurrency)
+
+    pages = []
+    seen = {root_url}
+    queue = asyncio.Queue()
+    queue.put_nowait(root_url)
+
+    async def worker(session):
+        while True:
+            url = await queue.get()
+            try:
+                if len(pages) < max_pages:
+                    await _crawl_page(session, url)
+            except (aiohttp.ClientError, TimeoutError) as e:
+                logger.warning("Crawl of %s failed: %s", url, str(e) or type(e).__name__)
+            except Exception as e:
+                # e.g. an undecodable body or a parser error; the worker must survive or queue.join() never returns
+                logger.error("Error crawling %s: %s", url, str(e) or type(e).__name__)
+            finally:
+                queue.task_done()
+
+    async def _crawl_page(session, url):
+        async with session.get(url) as response:
+            if response.status != 200 or "html" not in response.headers.get("Content-Type", ""):
+                return
+            text = await response.text()
+            lastmod = response.headers.get("Last-Modified")
+        soup = parse_html(text)
+        title = soup.title.get_text(strip=True) if soup.title else title_from_url(url)
+        pages.append(DiscoveredPage(url, title, lastmod))
+        for link in soup.find_all("a", href=True):
+            target = urldefrag(urljoin(url, link["href"]))[0]
+            if target not in seen and _in_scope(target, root):
+                seen.add(target)
+                queue.put_nowait(target)
+
+    async with _session() as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(concurrency)]
+        await queue.join()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    logger.info("Crawl of %s found %d pages", root_url, len(pages))
+    return pages[:max_pages]
+
+# ---------------------------- DISCOVERY ----------------------------
+async def discover_pages(url):
+    """
+    Lists candidate pages for a sitemap URL or a site root.
+
+    For a root URL the site's /sitemap.xml is tried first and the site is
+    crawled when there is none.
+    """
+    if urlparse(url).path.endswith(".xml"):
+        return await discover_from_sitemap(url)
+    try:
+        pages = await discover_from_sitemap(urljoin(url, "/sitemap.xml"))
+        root_path = urlparse(url).path
+        pages = [page for page in pages if urlparse(page.url).path.startswith(root_path)]
+        if pages:
+            return pages
+    except (aiohttp.ClientError, TimeoutError, ET.ParseError) as e:
+        logger.info("No usable sitemap for %s (%s), crawling instead", url, str(e))
+    return await crawl_site(url)
@@ -0,0 +1,212 @@
+import queue
+import threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES_PER_DRIVER = 50
+
+# ---------------------------- POOLED DRIVER ----------------------------
+class _PooledDriver:
+    """A Chrome driver together with the number of pages it has rendered."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """
+    Keeps a bounded set of warm headless Chrome drivers.
+
+    Drivers are checked out per fetch and returned afterwards. A driver is
+    recycled once it has rendered `max_pages` pages or when it stops
+    responding, so long-running apps keep a bounded memory footprint.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_pages=DEFAULT_MAX_PAGES_PER_DRIVER):
+        self.size = max(1, int(size))
+        self.max_pages = max(1, int(max_pages))
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._live = 0
+        self._driver_path = None
+        self._closed = False
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "launched": 0,
+            "recycled": 0,
+            "crashed": 0,
+        }
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _driver_executable(self):
+        # ChromeDriverManager().install() checks the network, so resolve it once per pool
+        with self._lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+            return self._driver_path
+
+    def _reserve(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            self._live += 1
+
+    def _release(self):
+        with self._lock:
+            self._live -= 1
+
+    def _launch(self):
+        """Launches a new headless Chrome driver. The caller must have reserved a slot."""
+        try:
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless")
+            driver = webdriver.Chrome(service=Service(self._driver_executable()), options=options)
+        except Exception:
+            self._release()
+            raise
+        self._count("launched")
+        logger.info("Launched Chrome driver (live drivers: %d)", self._live)
+        return _PooledDriver(driver)
+
+    def _quit(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            logger.warning("Error while quitting Chrome driver: %s", str(e))
+        finally:
+            self._release()
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def warm_up(self):
+        """Launches drivers until the pool holds `size` of them."""
+        logger.info("Warming up driver pool with %d drivers", self.size)
+        while True:
+            with self._lock:
+                if self._closed or self._live >= self.size:
+                    break
+                self._live += 1
+            try:
+                self._idle.put(self._launch())
+            except Exception as e:
+                logger.error("Failed to pre-launch Chrome driver: %s", str(e))
+                break
+        logger.info("Driver pool warm-up finished: %s", self.get_stats())
+
+    def warm_up_in_background(self):
+        thread = threading.Thread(target=self.warm_up, name="driver-pool-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @contextmanager
+    def checkout(self):
+        """Yields a warm driver, launching a new one if none is idle."""
+        self._slots.acquire()
+        try:
+            try:
+                entry = self._idle.get_nowait()
+                self._count("hits")
+            except queue.Empty:
+                self._count("misses")
+                self._reserve()
+                entry = self._launch()
+
+            failed = False
+            try:
+                yield entry.driver
+            except Exception:
+                failed = True
+                raise
+            finally:
+                entry.pages += 1
+                self._check_in(entry, failed)
+        finally:
+            self._slots.release()
+
+    def _check_in(self, entry, failed):
+        if failed and not self._is_alive(entry.driver):
+            self._count("crashed")
+            logger.warning("Chrome driver stopped responding, discarding it")
+            self._quit(entry)
+        elif entry.pages >= self.max_pages:
+            self._count("recycled")
+            logger.info("Recycling Chrome driver after %d pages (stats: %s)", entry.pages, self.get_stats())
+            self._quit(entry)
+        elif self._closed or self._live > self.size:
+            self._quit(entry)
+        else:
+            self._idle.put(entry)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = self.size
+            stats["max_pages"] = self.max_pages
+            stats["live"] = self._live
+        stats["idle"] = self._idle.qsize()
+        return stats
+
+    def close(self):
+        """Quits every idle driver. Drivers still checked out are quit on return."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(entry)
+        logger.info("Driver pool closed: %s", self.get_stats())
+
+
+# ---------------------------- SHARED POOL ----------------------------
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_driver_pool():
+    """Returns the process-wide driver pool, creating it from settings on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            current_settings = load_settings()
+            _pool = DriverPool(
+                size=current_settings.get("DRIVER_POOL_SIZE", DEFAULT_POOL_SIZE),
+                max_pages=current_settings.get("DRIVER_MAX_PAGES", DEFAULT_MAX_PAGES_PER_DRIVER),
+            )
+        return _pool
+
+def start_driver_pool():
+    """Creates the shared pool and pre-launches its drivers in the background."""
+    get_driver_pool().warm_up_in_background()
+
+def shutdown_driver_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+def get_driver_pool_stats():
+    with _pool_lock:
+        pool = _pool
+    return pool.get_stats() if pool is not None else {}
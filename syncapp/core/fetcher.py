@@ -1,116 +1,238 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
 import asyncio
-from syncapp.core.cleaner import convert_tabs_to_static
-from syncapp.loggers.log_cli import setup_logger
+import contextlib
+import hashlib
+import inspect
+import sys
+import threading
 import time
+from pathlib import Path
+from syncapp.config.settings import load_settings
+from syncapp.core import cleaner, snapshots, transform
+from syncapp.core.clean_pool import run_clean
+from syncapp.core.driver_pool import get_driver_pool
+from syncapp.core.http_fetch import fetch_static_page, is_js_only
+from syncapp.core.mermaid import DEFAULT_FORMAT, DEFAULT_THEME, diagram_source, render_diagrams
+from syncapp.core.parsers import parse_html, resolve_parser
+from syncapp.core.readiness import wait_until_ready
+from syncapp.core.source_cache import hash_source
+from syncapp.core.transform import transform_content
+from syncapp.utils.timing import timed
+from syncapp.loggers.log_cli import setup_logger
 
 logger = setup_logger(__name__)
+
+FETCH_PATH_STATIC = "static"
+FETCH_PATH_BROWSER = "browser"
+
+class ContentNotFoundError(Exception):
+    """Raised when a page does not contain the Docusaurus content block."""
+
+# ---------------------------- FETCH PATH STATS ----------------------------
+_path_stats = {
+    FETCH_PATH_STATIC: {"count": 0, "seconds": 0.0},
+    FETCH_PATH_BROWSER: {"count": 0, "seconds": 0.0},
+    "static_fallbacks": 0,
+}
+_path_stats_lock = threading.Lock()
+
+def _record_fetch(path, elapsed):
+    with _path_stats_lock:
+        _path_stats[path]["count"] += 1
+        _path_stats[path]["seconds"] += elapsed
+
+def get_fetch_path_stats():
+    """Returns how many fetches used each path and their average duration in seconds."""
+    with _path_stats_lock:
+        stats = {"static_fallbacks": _path_stats["static_fallbacks"]}
+        for path in (FETCH_PATH_STATIC, FETCH_PATH_BROWSER):
+            count = _path_stats[path]["count"]
+            stats[path] = {
+                "count": count,
+                "avg_seconds": round(_path_stats[path]["seconds"] / count, 3) if count else None,
+            }
+    return stats
+
 # ---------------------------- FETCH AND CLEAN HTML CONTENT ----------------------------
-async def fetch_content(url):
-    """Fetches the web page content and applies transformations for Zendesk formatting."""
+class FetchResult:
+    """
+    Outcome of fetching one page.
+
+    `content` is the cleaned HTML, or None when `unchanged` is True because
+    the source matched the cached validators and cleaning was skipped.
+    `pipeline_version` identifies the code and settings that produced it.
+    """
+
+    def __init__(self, path, content, source_hash, etag=None, last_modified=None, unchanged=False,
+                 pipeline_version=None):
+        self.path = path
+        self.content = content
+        self.source_hash = source_hash
+        self.etag = etag
+        self.last_modified = last_modified
+        self.unchanged = unchanged
+        self.pipeline_version = pipeline_version
+
+async def fetch_content(url, cache_entry=None, browser_slots=None):
+    """
+    Fetches the web page content and applies transformations for Zendesk formatting.
+
+    `cache_entry` holds the validators stored after the last successful sync;
+    when the page has not changed since then, and neither has the cleaning
+    pipeline (see pipeline_version), the clean-up steps are skipped.
+    `browser_slots` is an optional semaphore held while the page is rendered
+    in Chrome, so a bulk sync does not queue more renders than there are browsers.
+    """
+    loop = asyncio.get_event_loop()
+    # Resolved here so pool workers do not each have to read the settings file
+    parser = resolve_parser()
+    version = pipeline_version(parser)
+    if cache_entry and cache_entry.get("pipeline_version") != version:
+        # Same source, but it would clean or render differently now
+        logger.info("Cleaning pipeline changed since %s was last synced, processing it again", url)
+        cache_entry = None
+    known_hash = cache_entry["content_hash"] if cache_entry else None
+
+    # Docusaurus pages are pre-rendered, so try the raw HTML before starting a browser
+    if not is_js_only(url):
+        start = time.monotonic()
+        with timed("fetch_static"):
+            response = await fetch_static_page(
+                url,
+                etag=cache_entry.get("etag") if cache_entry else None,
+                last_modified=cache_entry.get("last_modified") if cache_entry else None,
+            )
+        if response is not None:
+            result = None
+            if response.not_modified and known_hash:
+                result = FetchResult(FETCH_PATH_STATIC, None, known_hash,
+                                     response.etag, response.last_modified, unchanged=True,
+                                     pipeline_version=version)
+            elif response.text is not None:
+                source_hash = hash_source(response.text)
+                if source_hash == known_hash:
+                    result = FetchResult(FETCH_PATH_STATIC, None, source_hash,
+                                         response.etag, response.last_modified, unchanged=True,
+                                         pipeline_version=version)
+                else:
+                    try:
+                        content = await _render_diagrams(await _clean(url, response.text, source_hash, parser))
+                        result = FetchResult(FETCH_PATH_STATIC, content, source_hash,
+                                             response.etag, response.last_modified, pipeline_version=version)
+                    except ContentNotFoundError as e:
+                        logger.info("Static HTML for %s is incomplete (%s), falling back to browser", url, str(e))
+            if result is not None:
+                elapsed = time.monotonic() - start
+                _record_fetch(FETCH_PATH_STATIC, elapsed)
+                logger.info("Fetched %s via %s path in %.2fs (unchanged: %s)",
+                            url, FETCH_PATH_STATIC, elapsed, result.unchanged)
+                return result
+        with _path_stats_lock:
+            _path_stats["static_fallbacks"] += 1
+
     # Run Selenium in a separate thread to avoid blocking
+    start = time.monotonic()
+    async with browser_slots or contextlib.nullcontext():
+        with timed("render_browser"):
+            page_source = await loop.run_in_executor(None, _render_page_sync, url)
+    source_hash = hash_source(page_source)
+    if source_hash == known_hash:
+        result = FetchResult(FETCH_PATH_BROWSER, None, source_hash, unchanged=True, pipeline_version=version)
+    else:
+        content = await _render_diagrams(await _clean(url, page_source, source_hash, parser))
+        result = FetchResult(FETCH_PATH_BROWSER, content, source_hash, pipeline_version=version)
+    elapsed = time.monotonic() - start
+    _record_fetch(FETCH_PATH_BROWSER, elapsed)
+    logger.info("Fetched %s via %s path in %.2fs (unchanged: %s)",
+                url, FETCH_PATH_BROWSER, elapsed, result.unchanged)
+    return result
+
+async def _clean(url, page_source, source_hash, parser):
+    """Cleans a page source, reusing the memoized output when this source was cleaned by the same code before."""
     loop = asyncio.get_event_loop()
-    content = await loop.run_in_executor(None, _fetch_content_sync, url)
+    content = await loop.run_in_executor(None, snapshots.get_cleaned, source_hash, CLEANING_VERSION, parser)
+    if content is None:
+        with timed("clean"):
+            content = await run_clean(clean_page, page_source, parser)
+        await loop.run_in_executor(None, snapshots.store_cleaned, source_hash, CLEANING_VERSION, parser, content)
+    else:
+        logger.info("Reusing cleaned output of %s (source %s)", url, source_hash[:12])
+    # Stored only once the page cleaned, so incomplete static pages are not kept
+    await loop.run_in_executor(None, snapshots.store_snapshot, url, source_hash, page_source)
     return content
 
+async def _render_diagrams(content):
+    with timed("diagrams"):
+        return await render_diagrams(content)
+
 def load_page(driver, url):
     logger.info("Fetching content from %s", url)
     driver.get(url)
     logger.info("Waiting for page load...")
-    time.sleep(3)
+    wait_until_ready(driver, url)
     logger.info("Page loaded, getting source...")
     return driver.page_source
 
 def find_main_element(soup):
     main = soup.find('main')
     if not main:
-        raise Exception("Could not find <main> element.")
+        raise ContentNotFoundError("Could not find <main> element.")
     logger.info("Found main element")
     return main
 
 def find_markdown_content(main):
     content_div = main.find("div", class_="theme-doc-markdown")
     if not content_div:
-        raise Exception("Could not find markdown content block.")
+        raise ContentNotFoundError("Could not find markdown content block.")
     logger.info("Found markdown content block")
     return content_div
 
-def remove_copy_buttons(content_div):
-    for copy_button in content_div.select("button"):
-        logger.info("Removing copy button with text: '%s'", copy_button.text.strip())
-        copy_button.decompose()
-
-def remove_images_from_info_admonitions(content_div):
-    for admonition in content_div.find_all("div", class_=lambda c: c and "theme-admonition-info" in c):
-        for img in admonition.find_all("img"):
-            logger.info("Removing image from info admonition")
-            img.decompose()
-
-def convert_admonition_heading_to_h2(soup, content_div):
-    for heading in content_div.find_all(class_=lambda c: c and "admonitionHeading" in c):
-        heading_text = heading.get_text(strip=True).upper()
-        new_heading = soup.new_tag("h2")
-        new_heading.string = heading_text
-        heading.replace_with(new_heading)
-        logger.info("Converted admonition heading to H2: %s", heading_text)
-
-def remove_h4_anchors_with_sticky_navbar(content_div):
-    for h4 in content_div.find_all("h4", class_=lambda c: c and c.startswith("anchor anchorWithStickyNavbar")):
-        logger.info("Removing <h4> anchor starting with 'anchor anchorWithStickyNavbar'")
-        h4.decompose()
-
-def convert_tab_containers_to_static(soup, content_div):
-    for tab_container in content_div.find_all("div", class_=lambda c: c and "tabs-container" in c):
-        logger.info("Converting tab containers into static H3 + content")
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(convert_tabs_to_static(soup, tab_container))
-        loop.close()
-
-def normalize_code_blocks(soup, content_div):
-    for code_wrapper in content_div.select("div[class*=codeBlock]"):
-        pre = code_wrapper.find("pre")
-        if pre:
-            code = pre.find("code")
-            if not code:
-                code = soup.new_tag("code")
-                code.string = pre.get_text()
-                pre.clear()
-                pre.append(code)
-            pre.attrs.clear()
-            code.attrs.clear()
-            pre.replace_with(BeautifulSoup(str(pre), "html.parser"))
-            logger.info("Cleaned code block preview: %s...", pre.get_text(strip=True)[:60])
-
-def convert_inline_code_to_strong(soup, content_div):
-    for inline_code in content_div.find_all("code"):
-        if inline_code.find_parent("pre") is None:
-            strong_tag = soup.new_tag("strong")
-            strong_tag.string = inline_code.get_text()
-            inline_code.replace_with(strong_tag)
-            logger.info("Converted inline code to <strong>: %s", strong_tag.string)
-
-def _fetch_content_sync(url):
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+def clean_page(page_source, parser=None):
+    """
+    Extracts the markdown content block from a page and applies the Zendesk clean-up steps.
+
+    `parser` overrides the HTML_PARSER setting.
+    """
+    soup = parse_html(page_source, parser)
+    main = find_main_element(soup)
+    content_div = find_markdown_content(main)
+    transform_content(soup, content_div)
+    content = content_div.decode_contents()
+    logger.info("Final content length: %d", len(content))
+    return content
+
+def _code_version(objects):
+    """
+    Identifies a piece of code, so output made with it is only reused while it is unchanged.
+
+    Hashes the source of the objects; frozen builds have no source and use
+    the executable instead.
+    """
+    digest = hashlib.sha256()
     try:
-        page_source = load_page(driver, url)
-        soup = BeautifulSoup(page_source, "html.parser")
-        main = find_main_element(soup)
-        content_div = find_markdown_content(main)
-        remove_copy_buttons(content_div)
-        remove_images_from_info_admonitions(content_div)
-        convert_admonition_heading_to_h2(soup, content_div)
-        remove_h4_anchors_with_sticky_navbar(content_div)
-        convert_tab_containers_to_static(soup, content_div)
-        normalize_code_blocks(soup, content_div)
-        convert_inline_code_to_strong(soup, content_div)
-        content = content_div.decode_contents()
-        logger.info("Final content length: %d", len(content))
-        return content
-    finally:
-        driver.quit()
\ No newline at end of file
+        for obj in objects:
+            digest.update(inspect.getsource(obj).encode("utf-8"))
+    except (OSError, TypeError):
+        executable = Path(sys.executable).stat()
+        digest.update(f"{sys.executable}:{executable.st_size}:{executable.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+CLEANING_VERSION = _code_version((transform, cleaner, find_main_element, find_markdown_content, clean_page))
+# Diagrams are rendered after the memoized cleaning step, so their code is versioned on its own
+DIAGRAM_VERSION = _code_version((diagram_source, render_diagrams))
+
+def pipeline_version(parser):
+    """
+    Identifies everything besides the source that shapes a page's output.
+
+    The cleaning code, the parser and the diagram code, format and theme; a
+    cached page is only treated as unchanged while this stays the same.
+    """
+    current_settings = load_settings()
+    return ":".join((CLEANING_VERSION, parser, DIAGRAM_VERSION,
+                     current_settings.get("MERMAID_FORMAT", DEFAULT_FORMAT),
+                     current_settings.get("MERMAID_THEME", DEFAULT_THEME)))
+
+def _render_page_sync(url):
+    # Hold the browser only while rendering; cleaning is a separate stage
+    with get_driver_pool().checkout() as driver:
+        return load_page(driver, url)
@@ -0,0 +1,65 @@
+import aiohttp
+from urllib.parse import urlparse
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_STATIC_FETCH_TIMEOUT = 15
+USER_AGENT = "Mozilla/5.0 (compatible; SyncImporter/0.1; +https://github.com/Girishm428/sync_article)"
+
+class StaticResponse:
+    """Status, body and cache validators of a static page fetch. `text` is None on a 304."""
+
+    def __init__(self, status, text, etag=None, last_modified=None):
+        self.status = status
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+# ---------------------------- STATIC HTTP FETCH ----------------------------
+def is_js_only(url):
+    """True when the URL's host is listed in JS_ONLY_HOSTS and must be rendered in Chrome."""
+    host = urlparse(url).hostname or ""
+    js_only_hosts = load_settings().get("JS_ONLY_HOSTS", []) or []
+    return host in js_only_hosts
+
+async def fetch_static_page(url, etag=None, last_modified=None):
+    """
+    Fetches the raw server-rendered HTML for a page without a browser.
+
+    When validators from a previous fetch are given the request is sent as a
+    conditional GET. Returns a StaticResponse for 200 and 304 responses, or
+    None when the page could not be fetched so the caller can fall back to
+    Selenium.
+    """
+    timeout = aiohttp.ClientTimeout(
+        total=load_settings().get("STATIC_FETCH_TIMEOUT", DEFAULT_STATIC_FETCH_TIMEOUT)
+    )
+    headers = {"User-Agent": USER_AGENT}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("Static fetch of %s: not modified", url)
+                    return StaticResponse(304, None, etag, last_modified)
+                if response.status != 200:
+                    logger.warning("Static fetch of %s returned status %d", url, response.status)
+                    return None
+                return StaticResponse(
+                    200,
+                    await response.text(),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+    except (aiohttp.ClientError, TimeoutError) as e:
+        logger.warning("Static fetch of %s failed: %s", url, str(e))
+        return None
@@ -0,0 +1,271 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from bs4 import Comment, NavigableString
+from syncapp.config.database import CONFIG_DIR
+from syncapp.config.settings import load_settings
+from syncapp.core.parsers import parse_html
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+MERMAID_CACHE_DIR = CONFIG_DIR / "mermaid_cache"
+RENDERER_SCRIPT = Path(__file__).with_name("mermaid_renderer.mjs")
+MERMAID_CLI_PACKAGE = "@mermaid-js/mermaid-cli"
+FORMAT_SVG = "svg"
+FORMAT_PNG = "png"
+DEFAULT_FORMAT = FORMAT_SVG
+DEFAULT_THEME = "default"
+DEFAULT_RENDER_TIMEOUT = 60
+# Docusaurus code blocks keep "language-mermaid" on their container, plain HTML uses "mermaid"
+MERMAID_CLASS = re.compile(r"^(language-mermaid|mermaid)$")
+
+# ---------------------------- RENDER CACHE ----------------------------
+_stats = {"cache_hits": 0, "rendered": 0, "failed": 0}
+_stats_lock = threading.Lock()
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+def get_mermaid_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+def diagram_key(source, output_format, theme):
+    """Content address of a rendered diagram: same source, format and theme give the same key."""
+    return hashlib.sha256(f"{output_format}\n{theme}\n{source.strip()}".encode("utf-8")).hexdigest()
+
+def _cache_path(key, output_format):
+    return MERMAID_CACHE_DIR / f"{key}.{output_format}"
+
+def _read_cached(key, output_format):
+    path = _cache_path(key, output_format)
+    return path.read_bytes() if path.exists() else None
+
+def _write_cached(key, output_format, data):
+    MERMAID_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _cache_path(key, output_format)
+    # Write then rename so a crash never leaves a half-written entry behind
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+# ---------------------------- RENDERERS ----------------------------
+def _find_cli_dir():
+    configured = load_settings().get("MERMAID_CLI_DIR")
+    if configured:
+        return Path(configured)
+    npm = shutil.which("npm")
+    if not npm:
+        return None
+    try:
+        root = subprocess.run([npm, "root", "-g"], capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+    cli_dir = Path(root) / MERMAID_CLI_PACKAGE
+    return cli_dir if (cli_dir / "package.json").exists() else None
+
+class MermaidRenderer:
+    """
+    Renders diagrams through one long-lived Node process (mermaid_renderer.mjs).
+
+    The browser behind it is started once, so a diagram costs a page render
+    instead of a Chrome launch. Requests are serialized; the process is
+    restarted after it exits or stops answering.
+    """
+
+    def __init__(self, cli_dir, timeout=DEFAULT_RENDER_TIMEOUT):
+        self.cli_dir = cli_dir
+        self.timeout = timeout
+        self._process = None
+        self._replies = None
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def _start(self):
+        env = dict(os.environ, MERMAID_CLI_DIR=str(self.cli_dir))
+        self._process = subprocess.Popen(
+            [shutil.which("node") or "node", str(RENDERER_SCRIPT)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", env=env,
+        )
+        self._replies = queue.Queue()
+        threading.Thread(target=self._read_replies, args=(self._process, self._replies), daemon=True).start()
+        logger.info("Started Mermaid renderer process (pid %d)", self._process.pid)
+
+    @staticmethod
+    def _read_replies(process, replies):
+        for line in process.stdout:
+            replies.put(line)
+        # EOF: the process exited
+        replies.put(None)
+
+    def _stop(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+
+    def render(self, source, output_format, theme):
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start()
+            self._next_id += 1
+            request_id = self._next_id
+            try:
+                self._process.stdin.write(json.dumps(
+                    {"id": request_id, "source": source, "format": output_format, "theme": theme}
+                ) + "\n")
+                self._process.stdin.flush()
+                line = self._replies.get(timeout=self.timeout)
+            except (OSError, queue.Empty) as e:
+                self._stop()
+                raise RuntimeError(f"Mermaid renderer did not answer: {e!r}")
+            if line is None:
+                code = self._process.wait()
+                self._process = None
+                raise RuntimeError(f"Mermaid renderer exited with code {code}")
+            reply = json.loads(line)
+            if reply.get("error"):
+                raise RuntimeError(reply["error"])
+            return base64.b64decode(reply["data"])
+
+    def close(self):
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()
+                    self._process.wait(timeout=10)
+                except (OSError, subprocess.TimeoutExpired):
+                    self._process.kill()
+                self._process = None
+                logger.info("Mermaid renderer stopped")
+
+def _render_with_mmdc(source, output_format, theme):
+    """Fallback for installs where the renderer script cannot find mermaid-cli: one mmdc run per diagram."""
+    mmdc = shutil.which("mmdc")
+    if not mmdc:
+        raise RuntimeError("Mermaid CLI (mmdc) is not installed")
+    with tempfile.TemporaryDirectory() as tmp:
+        source_file = Path(tmp) / "diagram.mmd"
+        output_file = Path(tmp) / f"diagram.{output_format}"
+        source_file.write_text(source, encoding="utf-8")
+        subprocess.run([mmdc, "-i", str(source_file), "-o", str(output_file), "-t", theme, "-b", "white"],
+                       check=True, capture_output=True, timeout=DEFAULT_RENDER_TIMEOUT)
+        return output_file.read_bytes()
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+def _render(source, output_format, theme):
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            cli_dir = _find_cli_dir()
+            _renderer = MermaidRenderer(cli_dir) if cli_dir else False
+            if not _renderer:
+                logger.warning("%s not found, rendering Mermaid diagrams with one mmdc run each", MERMAID_CLI_PACKAGE)
+        renderer = _renderer
+    if renderer:
+        return renderer.render(source, output_format, theme)
+    return _render_with_mmdc(source, output_format, theme)
+
+def shutdown_mermaid_renderer():
+    global _renderer
+    with _renderer_lock:
+        renderer, _renderer = _renderer, None
+    if renderer:
+        renderer.close()
+
+# ---------------------------- PIPELINE STAGE ----------------------------
+def render_diagram(source, output_format=None, theme=None):
+    """
+    Returns the rendered bytes of one diagram, from the cache when it was rendered before.
+
+    Blocking; raises RuntimeError or subprocess errors when rendering fails.
+    """
+    settings = load_settings()
+    output_format = output_format or settings.get("MERMAID_FORMAT", DEFAULT_FORMAT)
+    theme = theme or settings.get("MERMAID_THEME", DEFAULT_THEME)
+    key = diagram_key(source, output_format, theme)
+    data = _read_cached(key, output_format)
+    if data is not None:
+        _count("cache_hits")
+        return data
+    data = _render(source, output_format, theme)
+    _write_cached(key, output_format, data)
+    _count("rendered")
+    logger.info("Rendered Mermaid diagram %s (%d bytes)", key[:12], len(data))
+    return data
+
+def diagram_source(block):
+    """
+    The Mermaid text of a code block, one line per code line.
+
+    Docusaurus renders every line as a "token-line" element ending in <br>,
+    and get_text() alone would glue the lines together.
+    """
+    lines = block.find_all(class_="token-line")
+    if lines:
+        return "\n".join(line.get_text().rstrip("\n") for line in lines).strip()
+    parts = []
+    for node in block.descendants:
+        if isinstance(node, Comment):
+            continue
+        if isinstance(node, NavigableString):
+            parts.append(str(node))
+        elif node.name == "br":
+            parts.append("\n")
+    return "".join(parts).strip()
+
+def _diagram_markup(data, output_format):
+    if output_format == FORMAT_PNG:
+        return f'<img alt="diagram" src="data:image/png;base64,{base64.b64encode(data).decode("ascii")}"/>'
+    return data.decode("utf-8")
+
+async def render_diagrams(content):
+    """
+    Replaces the Mermaid blocks of cleaned content with rendered diagrams.
+
+    Unchanged diagrams come from the content-addressed cache. A diagram that
+    fails to render is left as its code block.
+    """
+    if "mermaid" not in content:
+        return content
+    soup = parse_html(content, "html.parser")
+    blocks = [block for block in soup.find_all(class_=MERMAID_CLASS)
+              if block.find_parent(class_=MERMAID_CLASS) is None]
+    if not blocks:
+        return content
+
+    output_format = load_settings().get("MERMAID_FORMAT", DEFAULT_FORMAT)
+    loop = asyncio.get_event_loop()
+    rendered = {}
+    for index, block in enumerate(blocks):
+        source = diagram_source(block)
+        try:
+            data = await loop.run_in_executor(None, render_diagram, source, output_format)
+        except (RuntimeError, OSError, subprocess.SubprocessError, ValueError) as e:
+            _count("failed")
+            logger.warning("Could not render Mermaid diagram, keeping the code block: %s", str(e))
+            continue
+        # The rendered markup is spliced in after serialization so the SVG is not re-parsed
+        slot = soup.new_tag("div", attrs={"data-mermaid-slot": str(index)})
+        block.replace_with(slot)
+        rendered[str(slot)] = _diagram_markup(data, output_format)
+
+    content = str(soup)
+    for slot, markup in rendered.items():
+        content = content.replace(slot, markup)
+    logger.info("Rendered %d of %d Mermaid diagrams", len(rendered), len(blocks))
+    return content
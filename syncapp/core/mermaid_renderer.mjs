@@ -0,0 +1,39 @@
+// Long-lived Mermaid renderer used by syncapp/core/mermaid.py.
+//
+// Starts one headless browser through @mermaid-js/mermaid-cli and renders
+// diagrams read from stdin, one JSON request per line:
+//   {"id": 1, "source": "graph TD; A-->B", "format": "svg", "theme": "default"}
+// and answers each with one JSON line on stdout:
+//   {"id": 1, "data": "<base64>"}  or  {"id": 1, "error": "..."}
+//
+// MERMAID_CLI_DIR points at the installed @mermaid-js/mermaid-cli package.
+import { createRequire } from "node:module";
+import { join } from "node:path";
+import { createInterface } from "node:readline";
+import { pathToFileURL } from "node:url";
+
+const cliDir = process.env.MERMAID_CLI_DIR;
+const requireFromCli = createRequire(join(cliDir, "package.json"));
+const { renderMermaid } = await import(pathToFileURL(join(cliDir, "src", "index.js")).href);
+const puppeteer = (await import(pathToFileURL(requireFromCli.resolve("puppeteer")).href)).default;
+
+const browser = await puppeteer.launch({ headless: true, args: ["--no-sandbox"] });
+
+const lines = createInterface({ input: process.stdin });
+for await (const line of lines) {
+  if (!line.trim()) continue;
+  const request = JSON.parse(line);
+  let reply;
+  try {
+    const { data } = await renderMermaid(browser, request.source, request.format, {
+      backgroundColor: "white",
+      mermaidConfig: { theme: request.theme },
+    });
+    reply = { id: request.id, data: Buffer.from(data).toString("base64") };
+  } catch (error) {
+    reply = { id: request.id, error: String(error && error.message ? error.message : error) };
+  }
+  process.stdout.write(JSON.stringify(reply) + "\n");
+}
+
+await browser.close();
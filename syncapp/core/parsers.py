@@ -0,0 +1,36 @@
+from importlib.util import find_spec
+from bs4 import BeautifulSoup
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+PARSER_AUTO = "auto"
+# Fastest first: "auto" picks the first one that is installed
+PARSER_BACKENDS = ["lxml", "html.parser", "html5lib"]
+_PARSER_MODULES = {"lxml": "lxml", "html.parser": None, "html5lib": "html5lib"}
+
+# ---------------------------- PARSER BACKENDS ----------------------------
+def available_parsers():
+    """Returns the BeautifulSoup backends that can be used in this environment."""
+    return [name for name in PARSER_BACKENDS
+            if _PARSER_MODULES[name] is None or find_spec(_PARSER_MODULES[name]) is not None]
+
+def resolve_parser(name=None):
+    """
+    Maps a configured parser name to an installed BeautifulSoup backend.
+
+    `name` defaults to the HTML_PARSER setting. "auto" (or a backend that is
+    not installed) resolves to the fastest available one.
+    """
+    if name is None:
+        name = load_settings().get("HTML_PARSER", PARSER_AUTO)
+    available = available_parsers()
+    if name in available:
+        return name
+    if name != PARSER_AUTO:
+        logger.warning("HTML parser '%s' is not available, falling back to '%s'", name, available[0])
+    return available[0]
+
+def parse_html(markup, parser=None):
+    return BeautifulSoup(markup, resolve_parser(parser))
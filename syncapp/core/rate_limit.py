@@ -0,0 +1,129 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 60.0
+# The bucket holds this many seconds' worth of requests, so bursts stay short
+BURST_SECONDS = 10
+
+def parse_retry_after(value):
+    """Returns the wait in seconds of a Retry-After header (delay in seconds or an HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF_BASE, cap=DEFAULT_BACKOFF_CAP):
+    """Exponential backoff with full jitter: a random delay up to base * 2**attempt seconds."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+# ---------------------------- RATE LIMITER ----------------------------
+class RateLimiter:
+    """
+    Shared limits for every request sent to one API host.
+
+    Combines a token bucket refilled at the account's per-minute rate, a
+    pause that all callers honour after a Retry-After, and an adaptive
+    in-flight limit: it grows by one after a window of successes and halves
+    on every throttle (AIMD). Not thread-safe; use it from one event loop.
+    """
+
+    def __init__(self, name, rate_per_minute, max_concurrency, initial_concurrency=2):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = max(1, min(initial_concurrency, self.max_concurrency))
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._set_rate(rate_per_minute)
+        self.tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._successes = 0
+        self._slot_freed = None
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "wait_seconds": 0.0, "paused_seconds": 0.0}
+
+    def _set_rate(self, rate_per_minute):
+        self.rate_per_minute = max(1, int(rate_per_minute))
+        self.capacity = max(1.0, self.rate_per_minute / 60 * BURST_SECONDS)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._refilled_at) * self.rate_per_minute / 60)
+        self._refilled_at = now
+
+    async def acquire(self):
+        """Waits for an in-flight slot, the end of any pause and a token."""
+        if self._slot_freed is None:
+            self._slot_freed = asyncio.Condition()
+        start = time.monotonic()
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(lambda: self.in_flight < self.concurrency)
+            self.in_flight += 1
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    self.stats["paused_seconds"] += time.monotonic() - now
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                await asyncio.sleep((1 - self.tokens) * 60 / self.rate_per_minute)
+        except BaseException:
+            await self.release()
+            raise
+        self.stats["requests"] += 1
+        self.stats["wait_seconds"] += time.monotonic() - start
+
+    async def release(self):
+        self.in_flight -= 1
+        async with self._slot_freed:
+            self._slot_freed.notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            self._successes = 0
+            logger.info("%s: raising concurrency to %d", self.name, self.concurrency)
+
+    def on_throttle(self, retry_after=None):
+        """Records a 429: halves the concurrency and pauses every caller for `retry_after` seconds."""
+        self.stats["throttled"] += 1
+        self._successes = 0
+        self.concurrency = max(1, self.concurrency // 2)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        # Whatever is left in the bucket was evidently too much
+        self.tokens = 0
+        logger.warning("%s: throttled, concurrency %d, pausing %.1fs", self.name, self.concurrency, retry_after or 0)
+
+    def update_from_headers(self, headers):
+        """Follows the account's rate-limit headers (X-Rate-Limit, X-Rate-Limit-Remaining, ratelimit-reset)."""
+        limit = headers.get("X-Rate-Limit")
+        if limit and limit.isdigit() and int(limit) != self.rate_per_minute:
+            self._set_rate(int(limit))
+            logger.info("%s: rate limit is %d requests per minute", self.name, self.rate_per_minute)
+        remaining = headers.get("X-Rate-Limit-Remaining") or headers.get("ratelimit-remaining")
+        reset = headers.get("ratelimit-reset")
+        if remaining and remaining.isdigit() and int(remaining) == 0 and reset and reset.isdigit():
+            self.paused_until = max(self.paused_until, time.monotonic() + int(reset))
+
+    def get_stats(self):
+        return dict(self.stats, concurrency=self.concurrency, rate_per_minute=self.rate_per_minute,
+                    wait_seconds=round(self.stats["wait_seconds"], 1),
+                    paused_seconds=round(self.stats["paused_seconds"], 1))
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+from statistics import median
+from urllib.parse import urlparse
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+READY_SELECTOR = "main div.theme-doc-markdown"
+DEFAULT_READY_TIMEOUT = 15
+POLL_INTERVAL = 0.1
+STABLE_SAMPLES = 3
+SAMPLES_PER_HOST = 200
+
+# Cheap DOM fingerprint: changes while the client-side renderer is still mutating the content block
+_DOM_SIGNATURE_JS = """
+const el = document.querySelector(arguments[0]);
+return [document.readyState, el ? el.getElementsByTagName('*').length : -1, el ? el.innerHTML.length : -1].join(':');
+"""
+
+# ---------------------------- LATENCY PROFILE ----------------------------
+class _HostProfile:
+    def __init__(self):
+        self.samples = deque(maxlen=SAMPLES_PER_HOST)
+        self.timeouts = 0
+
+_profiles = {}
+_profiles_lock = threading.Lock()
+
+def _record(host, elapsed, timed_out):
+    with _profiles_lock:
+        profile = _profiles.setdefault(host, _HostProfile())
+        if timed_out:
+            profile.timeouts += 1
+        else:
+            profile.samples.append(elapsed)
+
+def get_readiness_stats():
+    """Returns the observed time-to-ready profile per host, in seconds."""
+    stats = {}
+    with _profiles_lock:
+        for host, profile in _profiles.items():
+            samples = sorted(profile.samples)
+            stats[host] = {
+                "count": len(samples),
+                "timeouts": profile.timeouts,
+                "p50": round(median(samples), 3) if samples else None,
+                "p95": round(samples[int(0.95 * (len(samples) - 1))], 3) if samples else None,
+                "max": round(samples[-1], 3) if samples else None,
+            }
+    return stats
+
+# ---------------------------- READINESS WAIT ----------------------------
+def get_ready_timeout(host):
+    """Per-host timeout from PAGE_READY_TIMEOUTS, falling back to PAGE_READY_TIMEOUT."""
+    current_settings = load_settings()
+    per_host = current_settings.get("PAGE_READY_TIMEOUTS", {}) or {}
+    return float(per_host.get(host, current_settings.get("PAGE_READY_TIMEOUT", DEFAULT_READY_TIMEOUT)))
+
+def _wait_for_stable_dom(driver, deadline):
+    """Polls the content block until its fingerprint is unchanged for STABLE_SAMPLES polls."""
+    last_signature = None
+    stable = 0
+    while time.monotonic() < deadline:
+        signature = driver.execute_script(_DOM_SIGNATURE_JS, READY_SELECTOR)
+        if signature == last_signature and signature.startswith("complete"):
+            stable += 1
+            if stable >= STABLE_SAMPLES:
+                return True
+        else:
+            stable = 1
+            last_signature = signature
+        time.sleep(POLL_INTERVAL)
+    return False
+
+def wait_until_ready(driver, url):
+    """
+    Waits until the Docusaurus markdown block is present and the DOM has settled.
+
+    Returns the seconds spent waiting. On timeout the caller still gets the
+    current page source so the parser can report what is missing.
+    """
+    host = urlparse(url).hostname or ""
+    timeout = get_ready_timeout(host)
+    start = time.monotonic()
+    deadline = start + timeout
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, READY_SELECTOR))
+        )
+        if not _wait_for_stable_dom(driver, deadline):
+            raise TimeoutException("DOM did not settle")
+    except TimeoutException as e:
+        elapsed = time.monotonic() - start
+        _record(host, elapsed, timed_out=True)
+        logger.warning("Page %s not ready after %.2fs (timeout %.1fs): %s", url, elapsed, timeout, str(e).strip())
+        return elapsed
+
+    elapsed = time.monotonic() - start
+    _record(host, elapsed, timed_out=False)
+    logger.info("Page ready in %.2fs (host: %s)", elapsed, host)
+    return elapsed
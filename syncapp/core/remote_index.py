@@ -0,0 +1,150 @@
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from syncapp.config.database import CONFIG_DIR
+from syncapp.config.settings import load_settings
+from syncapp.core.zendesk import ZendeskAPIError, get_zendesk_client
+from syncapp.loggers.log_cli import setup_logger
+from syncapp.utils.hashing import content_hash
+
+logger = setup_logger(__name__)
+
+#------------ Remote index ------------
+# Local copy of what Zendesk currently holds per (article, locale), built from the paged article list
+INDEX_DB_FILE = CONFIG_DIR / "remote_index.db"
+PAGE_SIZE = 100
+# Entries older than this are not trusted for skip decisions
+DEFAULT_MAX_AGE_MINUTES = 15
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_initialized = False
+
+
+def get_index_connection():
+    global _initialized
+    conn = sqlite3.connect(INDEX_DB_FILE)
+    conn.row_factory = sqlite3.Row
+    if not _initialized:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS remote_articles (
+                article_id TEXT NOT NULL,
+                locale TEXT NOT NULL,
+                title TEXT,
+                updated_at TEXT,
+                content_hash TEXT NOT NULL,
+                indexed_at TEXT NOT NULL,
+                PRIMARY KEY (article_id, locale)
+            )
+        ''')
+        conn.commit()
+        _initialized = True
+    return conn
+
+def _row(article_id, locale, title, updated_at, body):
+    # Hashes what Zendesk holds, after its sanitizer; compare with translation_hash(), not with what was sent
+    return (str(article_id), locale, title, updated_at, content_hash(locale, title, body or ""),
+            datetime.now().strftime(TIMESTAMP_FORMAT))
+
+def _store_rows(rows):
+    conn = get_index_connection()
+    try:
+        conn.executemany('''
+            INSERT OR REPLACE INTO remote_articles
+                (article_id, locale, title, updated_at, content_hash, indexed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+# ---------------------------- BUILD ----------------------------
+async def refresh_remote_index(locale=None):
+    """
+    Pages through every article of a locale once and records its updated_at and content hash.
+
+    One request per PAGE_SIZE articles instead of one per article.
+    Returns the number of articles indexed.
+    """
+    current_settings = load_settings()
+    locale = locale or current_settings.get('LOCAL', 'en-us')
+    domain = current_settings.get('ZENDESK_DOMAIN', '')
+    client = get_zendesk_client()
+    loop = asyncio.get_event_loop()
+
+    path = f"/api/v2/help_center/{locale}/articles.json?page[size]={PAGE_SIZE}"
+    pages = 0
+    count = 0
+    while path:
+        response = await client.request("GET", domain, path)
+        if response.status != 200:
+            raise ZendeskAPIError(response.status, "GET", path, response.text)
+        data = response.json()
+        rows = [_row(article['id'], locale, article.get('title'), article.get('updated_at'), article.get('body'))
+                for article in data.get('articles', [])]
+        await loop.run_in_executor(None, _store_rows, rows)
+        pages += 1
+        count += len(rows)
+
+        next_url = data.get('links', {}).get('next') if data.get('meta', {}).get('has_more') else None
+        path = None
+        if next_url:
+            parsed = urlparse(next_url)
+            path = f"{parsed.path}?{parsed.query}" if parsed.query else parsed.path
+    logger.info("Indexed %d remote %s articles with %d requests", count, locale, pages)
+    return count
+
+def translation_hash(locale, translation):
+    """Hash of a translation Zendesk returned, comparable with the hashes in the index."""
+    return content_hash(locale, translation.get('title'), translation.get('body') or "")
+
+def record_translation(article_id, locale, translation):
+    """Updates the index from a translation Zendesk returned, e.g. the answer to a PUT."""
+    _store_rows([_row(article_id, locale, translation.get('title'), translation.get('updated_at'),
+                      translation.get('body'))])
+
+# ---------------------------- LOOKUPS ----------------------------
+def get_remote_hash(article_id, locale, max_age_minutes=None):
+    """Returns the indexed content hash of an article translation, or None when unknown or too old."""
+    if max_age_minutes is None:
+        max_age_minutes = load_settings().get("REMOTE_INDEX_MAX_AGE_MINUTES", DEFAULT_MAX_AGE_MINUTES)
+    oldest = (datetime.now() - timedelta(minutes=max_age_minutes)).strftime(TIMESTAMP_FORMAT)
+    conn = get_index_connection()
+    try:
+        row = conn.execute(
+            "SELECT content_hash FROM remote_articles WHERE article_id = ? AND locale = ? AND indexed_at >= ?",
+            (str(article_id), locale, oldest)
+        ).fetchone()
+        return row['content_hash'] if row else None
+    finally:
+        conn.close()
+
+def get_index(locale):
+    """Returns article_id -> indexed row for a locale."""
+    conn = get_index_connection()
+    try:
+        rows = conn.execute("SELECT * FROM remote_articles WHERE locale = ?", (locale,)).fetchall()
+        return {row['article_id']: dict(row) for row in rows}
+    finally:
+        conn.close()
+
+def drift_report(articles, locale):
+    """
+    Compares what Zendesk held after each article's last push with the index.
+
+    `articles` are rows with article_id and content_hash, the
+    translation_hash() of the translation returned for that push. Returns
+    (article_id, state) pairs where state is "in sync", "drifted" (changed
+    in Zendesk or never pushed from here) or "missing" (not in Zendesk).
+    """
+    index = get_index(locale)
+    report = []
+    for article in articles:
+        remote = index.get(str(article['article_id']))
+        if remote is None:
+            state = "missing"
+        elif remote['content_hash'] == article['content_hash']:
+            state = "in sync"
+        else:
+            state = "drifted"
+        report.append((article['article_id'], state))
+    return report
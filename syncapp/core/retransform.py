@@ -0,0 +1,75 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from syncapp.core import snapshots
+from syncapp.core.clean_pool import DEFAULT_CLEAN_PROCESSES
+from syncapp.core.fetcher import CLEANING_VERSION, ContentNotFoundError, clean_page
+from syncapp.core.parsers import resolve_parser
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+# Outcome of re-transforming one snapshot
+MEMOIZED = "memoized"
+CHANGED = "changed"
+SAME = "same"
+NEW = "new"
+FAILED = "failed"
+
+class RetransformResult:
+    """
+    Cleaned output of one stored snapshot.
+
+    `status` compares it with the output of the previous clean-up version:
+    CHANGED or SAME, NEW when there is none, MEMOIZED when the current
+    version already cleaned this source, FAILED when cleaning raised.
+    """
+
+    def __init__(self, source_url, source_hash, status, content=None, error=None):
+        self.source_url = source_url
+        self.source_hash = source_hash
+        self.status = status
+        self.content = content
+        self.error = error
+
+def _clean_snapshot(source_hash, parser):
+    # Runs in a worker process: the snapshot is read there so only the hash crosses the process boundary
+    try:
+        return clean_page(snapshots.load_snapshot(source_hash), parser), None
+    except (ContentNotFoundError, OSError) as e:
+        return None, str(e)
+
+def retransform_snapshots(url_filter=None, processes=None, parser=None):
+    """
+    Replays the cleaning pipeline over the newest snapshot of every URL, without network access.
+
+    Sources already cleaned by the current clean-up code are served from the
+    memo; the rest are cleaned in parallel and memoized.
+    """
+    parser = resolve_parser(parser)
+    rows = snapshots.latest_snapshots(url_filter)
+    results = []
+    pending = []
+    for row in rows:
+        content = snapshots.get_cleaned(row['source_hash'], CLEANING_VERSION, parser)
+        if content is not None:
+            results.append(RetransformResult(row['source_url'], row['source_hash'], MEMOIZED, content))
+        else:
+            pending.append(row)
+    logger.info("Re-transforming %d snapshots (%d memoized) with clean-up version %s",
+                len(pending), len(results), CLEANING_VERSION)
+
+    if pending:
+        workers = min(processes or DEFAULT_CLEAN_PROCESSES, len(pending))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            cleaned = executor.map(_clean_snapshot, [row['source_hash'] for row in pending],
+                                   [parser] * len(pending))
+            for row, (content, error) in zip(pending, cleaned):
+                if error is not None:
+                    logger.warning("Re-transform of %s failed: %s", row['source_url'], error)
+                    results.append(RetransformResult(row['source_url'], row['source_hash'], FAILED, error=error))
+                    continue
+                previous = snapshots.get_previous_cleaned(row['source_hash'], CLEANING_VERSION, parser)
+                snapshots.store_cleaned(row['source_hash'], CLEANING_VERSION, parser, content)
+                status = NEW if previous is None else SAME if previous == content else CHANGED
+                results.append(RetransformResult(row['source_url'], row['source_hash'], status, content))
+    return results
@@ -0,0 +1,165 @@
+import gzip
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timedelta
+from syncapp.config.database import CONFIG_DIR
+from syncapp.config.settings import load_settings
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+#------------ Snapshot store ------------
+# Raw page sources as gzip files named by their hash; the index and the memoized cleaned output live in SQLite
+SNAPSHOT_DIR = CONFIG_DIR / "snapshots"
+SNAPSHOT_DB_FILE = CONFIG_DIR / "snapshots.db"
+DEFAULT_KEEP_PER_URL = 5
+DEFAULT_RETENTION_DAYS = 30
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def get_snapshot_connection():
+    global _initialized
+    conn = sqlite3.connect(SNAPSHOT_DB_FILE)
+    conn.row_factory = sqlite3.Row
+    with _init_lock:
+        if not _initialized:
+            SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    source_url TEXT NOT NULL,
+                    source_hash TEXT NOT NULL,
+                    size INTEGER,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (source_url, source_hash)
+                )
+            ''')
+            # Cleaned output per raw page, clean-up code version and parser
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cleaned (
+                    source_hash TEXT NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    parser TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (source_hash, ruleset, parser)
+                )
+            ''')
+            conn.commit()
+            _initialized = True
+    return conn
+
+def snapshot_path(source_hash):
+    return SNAPSHOT_DIR / f"{source_hash}.html.gz"
+
+# ---------------------------- RAW SNAPSHOTS ----------------------------
+def store_snapshot(source_url, source_hash, page_source):
+    """Stores a fetched raw page source (once per hash) and applies the retention policy to its URL."""
+    conn = get_snapshot_connection()
+    try:
+        path = snapshot_path(source_hash)
+        if not path.exists():
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(page_source.encode("utf-8")))
+            tmp.replace(path)
+        conn.execute(
+            "INSERT OR REPLACE INTO snapshots (source_url, source_hash, size, fetched_at) VALUES (?, ?, ?, ?)",
+            (source_url, source_hash, len(page_source), datetime.now().strftime(TIMESTAMP_FORMAT))
+        )
+        conn.commit()
+        _prune(conn, source_url)
+    finally:
+        conn.close()
+
+def load_snapshot(source_hash):
+    """Returns the stored raw page source for a hash."""
+    return gzip.decompress(snapshot_path(source_hash).read_bytes()).decode("utf-8")
+
+def latest_snapshots(url_filter=None):
+    """Returns the newest snapshot row of every URL, optionally only URLs containing `url_filter`."""
+    conn = get_snapshot_connection()
+    try:
+        rows = conn.execute('''
+            SELECT source_url, source_hash, size, MAX(fetched_at) AS fetched_at
+            FROM snapshots GROUP BY source_url ORDER BY source_url
+        ''').fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows if not url_filter or url_filter in row['source_url']]
+
+# ---------------------------- MEMOIZED CLEANING ----------------------------
+def get_cleaned(source_hash, ruleset, parser):
+    """Returns the cleaned output of a raw page for this clean-up version and parser, or None."""
+    conn = get_snapshot_connection()
+    try:
+        row = conn.execute(
+            "SELECT content FROM cleaned WHERE source_hash = ? AND ruleset = ? AND parser = ?",
+            (source_hash, ruleset, parser)
+        ).fetchone()
+    finally:
+        conn.close()
+    return zlib.decompress(row['content']).decode("utf-8") if row else None
+
+def get_previous_cleaned(source_hash, ruleset, parser):
+    """Returns the most recent cleaned output of a raw page made by another clean-up version, or None."""
+    conn = get_snapshot_connection()
+    try:
+        row = conn.execute('''
+            SELECT content FROM cleaned WHERE source_hash = ? AND ruleset != ? AND parser = ?
+            ORDER BY created_at DESC LIMIT 1
+        ''', (source_hash, ruleset, parser)).fetchone()
+    finally:
+        conn.close()
+    return zlib.decompress(row['content']).decode("utf-8") if row else None
+
+def store_cleaned(source_hash, ruleset, parser, content):
+    conn = get_snapshot_connection()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO cleaned (source_hash, ruleset, parser, content, created_at) VALUES (?, ?, ?, ?, ?)",
+            (source_hash, ruleset, parser, zlib.compress(content.encode("utf-8")),
+             datetime.now().strftime(TIMESTAMP_FORMAT))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+# ---------------------------- RETENTION ----------------------------
+def _prune(conn, source_url=None):
+    settings = load_settings()
+    keep = settings.get("SNAPSHOT_KEEP_PER_URL", DEFAULT_KEEP_PER_URL)
+    cutoff = (datetime.now() - timedelta(days=settings.get("SNAPSHOT_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)))
+    cutoff = cutoff.strftime(TIMESTAMP_FORMAT)
+
+    urls = [source_url] if source_url else [row[0] for row in conn.execute("SELECT DISTINCT source_url FROM snapshots")]
+    removed = []
+    for url in urls:
+        rows = conn.execute(
+            "SELECT source_hash, fetched_at FROM snapshots WHERE source_url = ? ORDER BY fetched_at DESC", (url,)
+        ).fetchall()
+        # The newest snapshot of a URL is always kept, however old it is
+        removed.extend((url, row['source_hash']) for index, row in enumerate(rows)
+                       if index > 0 and (index >= keep or row['fetched_at'] < cutoff))
+    if not removed:
+        return 0
+
+    conn.executemany("DELETE FROM snapshots WHERE source_url = ? AND source_hash = ?", removed)
+    orphaned = [source_hash for _, source_hash in removed if conn.execute(
+        "SELECT 1 FROM snapshots WHERE source_hash = ? LIMIT 1", (source_hash,)).fetchone() is None]
+    conn.executemany("DELETE FROM cleaned WHERE source_hash = ?", [(source_hash,) for source_hash in orphaned])
+    conn.commit()
+    for source_hash in orphaned:
+        snapshot_path(source_hash).unlink(missing_ok=True)
+    logger.info("Pruned %d snapshots (%d files removed)", len(removed), len(orphaned))
+    return len(removed)
+
+def prune_snapshots():
+    """Applies the retention policy (SNAPSHOT_KEEP_PER_URL, SNAPSHOT_RETENTION_DAYS) to all URLs."""
+    conn = get_snapshot_connection()
+    try:
+        return _prune(conn)
+    finally:
+        conn.close()
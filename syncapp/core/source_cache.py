@@ -0,0 +1,77 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+from syncapp.config.database import CONFIG_DIR
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+#------------ Source cache ------------
+# Kept in its own file next to articles.db so it can be deleted at any time to force a full refetch
+CACHE_DB_FILE = CONFIG_DIR / "source_cache.db"
+_initialized = False
+
+
+def hash_source(page_source):
+    """Returns a stable hash of a raw page source."""
+    return hashlib.sha256(page_source.encode("utf-8")).hexdigest()
+
+def get_cache_connection():
+    global _initialized
+    conn = sqlite3.connect(CACHE_DB_FILE)
+    conn.row_factory = sqlite3.Row
+    if not _initialized:
+        # One row per (source page, Zendesk article) so two articles sharing a URL are tracked separately
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS source_cache (
+                source_url TEXT NOT NULL,
+                article_id TEXT NOT NULL,
+                title TEXT,
+                locale TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                updated_at TEXT,
+                pipeline_version TEXT,
+                PRIMARY KEY (source_url, article_id)
+            )
+        ''')
+        columns = [column[1] for column in conn.execute("PRAGMA table_info(source_cache)")]
+        if 'pipeline_version' not in columns:
+            # Rows from before have no version and count as misses once
+            conn.execute("ALTER TABLE source_cache ADD COLUMN pipeline_version TEXT")
+        conn.commit()
+        _initialized = True
+    return conn
+
+def get_entry(source_url, article_id):
+    """Returns the cached validators for a page/article pair, or None."""
+    conn = get_cache_connection()
+    try:
+        row = conn.execute(
+            "SELECT * FROM source_cache WHERE source_url = ? AND article_id = ?",
+            (source_url, article_id)
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+def store_entry(source_url, article_id, title, locale, etag, last_modified, content_hash, pipeline_version=None):
+    """
+    Records the validators of a page after it was successfully pushed to Zendesk.
+
+    `pipeline_version` identifies the cleaning code and settings the pushed content was made with.
+    """
+    conn = get_cache_connection()
+    try:
+        conn.execute('''
+            INSERT OR REPLACE INTO source_cache
+                (source_url, article_id, title, locale, etag, last_modified, content_hash, updated_at,
+                 pipeline_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (source_url, article_id, title, locale, etag, last_modified, content_hash,
+              datetime.now().strftime('%Y-%m-%d %H:%M:%S'), pipeline_version))
+        conn.commit()
+        logger.info("Source cache updated for %s", source_url)
+    finally:
+        conn.close()
@@ -0,0 +1,221 @@
+import re
+from bs4 import Tag
+from syncapp.core.cleaner import convert_tabs_to_static
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+# A rule runs either when its tag is entered (before the children) or when it is left (after them)
+ENTER = "enter"
+LEAVE = "leave"
+
+# ---------------------------- RULES ----------------------------
+class Rule:
+    """
+    A single clean-up rule.
+
+    `tags` limits the rule to those tag names (None matches any tag) and
+    `class_pattern` is a regex searched in the tag's space-joined class
+    attribute. Both are compiled once when the engine is built. `requires`
+    and `excludes` name scopes the tag must or must not be inside. `action`
+    receives the transform context and the tag and returns True when it
+    removed or replaced the tag, which stops further processing of it.
+    """
+
+    def __init__(self, name, action, tags=None, class_pattern=None, phase=ENTER, requires=None, excludes=None):
+        self.name = name
+        self.action = action
+        self.tags = frozenset(tags) if tags else None
+        self.class_regex = re.compile(class_pattern) if class_pattern else None
+        self.phase = phase
+        self.requires = requires
+        self.excludes = excludes
+
+    def matches(self, ctx, class_string):
+        if self.requires and not ctx.depth[self.requires]:
+            return False
+        if self.excludes and ctx.depth[self.excludes]:
+            return False
+        return self.class_regex is None or self.class_regex.search(class_string) is not None
+
+
+class Scope:
+    """
+    A kind of ancestor the rules need to know about, e.g. "inside a <pre>".
+
+    The engine keeps a depth counter per scope while it walks the tree. A
+    scope with `within` only counts when already inside that other scope.
+    """
+
+    def __init__(self, name, tag, class_pattern=None, within=None):
+        self.name = name
+        self.tag = tag
+        self.class_regex = re.compile(class_pattern) if class_pattern else None
+        self.within = within
+
+    def matches(self, tag, class_string):
+        return tag.name == self.tag and (self.class_regex is None or self.class_regex.search(class_string) is not None)
+
+
+class _Context:
+    """Traversal state shared by the rules while one content block is transformed."""
+
+    def __init__(self, soup, scopes):
+        self.soup = soup
+        self.depth = {scope.name: 0 for scope in scopes}
+        self.tab_containers = []
+        self.deferred = []
+
+
+def _remove_copy_button(ctx, tag):
+    logger.info("Removing copy button with text: '%s'", tag.text.strip())
+    tag.decompose()
+    return True
+
+def _remove_info_admonition_image(ctx, tag):
+    logger.info("Removing image from info admonition")
+    tag.decompose()
+    return True
+
+def _convert_admonition_heading(ctx, tag):
+    # Copy buttons are removed before headings are converted, so keep their text out of the heading
+    for button in tag.find_all("button"):
+        button.decompose()
+    heading_text = tag.get_text(strip=True).upper()
+    new_heading = ctx.soup.new_tag("h2")
+    new_heading.string = heading_text
+    tag.replace_with(new_heading)
+    logger.info("Converted admonition heading to H2: %s", heading_text)
+    return True
+
+def _remove_sticky_anchor(ctx, tag):
+    logger.info("Removing <h4> anchor starting with 'anchor anchorWithStickyNavbar'")
+    tag.decompose()
+    return True
+
+def _collect_tab_container(ctx, tag):
+    # Tabs move their panels around, so they are converted after the traversal in document order
+    ctx.tab_containers.append(tag)
+    return False
+
+def _normalize_code_block(ctx, tag):
+    pre = tag.find("pre")
+    if pre:
+        code = pre.find("code")
+        if not code:
+            code = ctx.soup.new_tag("code")
+            code.string = pre.get_text()
+            pre.clear()
+            pre.append(code)
+        pre.attrs.clear()
+        code.attrs.clear()
+        logger.info("Cleaned code block preview: %s...", pre.get_text(strip=True)[:60])
+    return False
+
+def _convert_inline_code(ctx, tag):
+    strong_tag = ctx.soup.new_tag("strong")
+    strong_tag.string = tag.get_text()
+    tag.replace_with(strong_tag)
+    logger.info("Converted inline code to <strong>: %s", strong_tag.string)
+    return True
+
+# Order matters: for a tag matched by several rules the first one that removes it wins
+DEFAULT_RULES = [
+    Rule("remove_copy_buttons", _remove_copy_button, tags=["button"]),
+    Rule("remove_images_from_info_admonitions", _remove_info_admonition_image, tags=["img"],
+         requires="info_admonition"),
+    Rule("convert_admonition_heading_to_h2", _convert_admonition_heading, class_pattern=r"admonitionHeading"),
+    Rule("remove_h4_anchors_with_sticky_navbar", _remove_sticky_anchor, tags=["h4"],
+         class_pattern=r"^anchor anchorWithStickyNavbar"),
+    Rule("convert_tab_containers_to_static", _collect_tab_container, tags=["div"], class_pattern=r"tabs-container"),
+    Rule("normalize_code_blocks", _normalize_code_block, tags=["div"], class_pattern=r"codeBlock", phase=LEAVE),
+    Rule("convert_inline_code_to_strong", _convert_inline_code, tags=["code"], phase=LEAVE, excludes="pre"),
+]
+
+DEFAULT_SCOPES = [
+    Scope("info_admonition", "div", r"theme-admonition-info"),
+    Scope("pre", "pre"),
+    Scope("tab_container", "div", r"tabs-container"),
+    # Tab titles are read before the leave-phase rules would run, so those rules are deferred in here
+    Scope("tab_list", "ul", r"(^| )tabs( |$)", within="tab_container"),
+]
+
+# ---------------------------- ENGINE ----------------------------
+class TransformEngine:
+    """
+    Applies all clean-up rules to a content block in a single traversal.
+
+    Rules are bucketed by tag name up front so each element only checks the
+    rules that can apply to it. The output is identical to running the
+    rules one after another as separate passes.
+    """
+
+    def __init__(self, rules=None, scopes=None):
+        self.rules = list(rules or DEFAULT_RULES)
+        self.scopes = list(scopes or DEFAULT_SCOPES)
+        self._by_tag = {}
+        self._any_tag = []
+        for rule in self.rules:
+            if rule.tags is None:
+                self._any_tag.append(rule)
+            else:
+                for name in rule.tags:
+                    self._by_tag.setdefault(name, []).append(rule)
+
+    def _rules_for(self, name, phase):
+        candidates = self._by_tag.get(name, []) + self._any_tag
+        return [rule for rule in self.rules if rule in candidates and rule.phase == phase]
+
+    def run(self, soup, content_div):
+        ctx = _Context(soup, self.scopes)
+        enter_cache = {}
+        leave_cache = {}
+
+        # Explicit stack of (tag, entered scopes) entries; scopes is None on the way down
+        stack = [(child, None) for child in reversed(list(content_div.children)) if isinstance(child, Tag)]
+        while stack:
+            tag, entered = stack.pop()
+
+            if entered is not None:
+                for name in entered:
+                    ctx.depth[name] -= 1
+                rules = leave_cache.get(tag.name)
+                if rules is None:
+                    rules = leave_cache[tag.name] = self._rules_for(tag.name, LEAVE)
+                class_string = " ".join(tag.get("class") or [])
+                for rule in rules:
+                    if not rule.matches(ctx, class_string):
+                        continue
+                    if ctx.depth["tab_list"]:
+                        ctx.deferred.append((rule, tag))
+                    elif rule.action(ctx, tag):
+                        break
+                continue
+
+            class_string = " ".join(tag.get("class") or [])
+            rules = enter_cache.get(tag.name)
+            if rules is None:
+                rules = enter_cache[tag.name] = self._rules_for(tag.name, ENTER)
+            if any(rule.matches(ctx, class_string) and rule.action(ctx, tag) for rule in rules):
+                continue
+
+            entered = [scope.name for scope in self.scopes
+                       if scope.matches(tag, class_string) and (scope.within is None or ctx.depth[scope.within])]
+            for name in entered:
+                ctx.depth[name] += 1
+            stack.append((tag, entered))
+            stack.extend((child, None) for child in reversed(list(tag.children)) if isinstance(child, Tag))
+
+        for tab_container in ctx.tab_containers:
+            logger.info("Converting tab containers into static H3 + content")
+            convert_tabs_to_static(soup, tab_container)
+
+        # Only matters for tab lists of containers that were left in place
+        for rule, tag in ctx.deferred:
+            rule.action(ctx, tag)
+
+_default_engine = TransformEngine()
+
+def transform_content(soup, content_div):
+    """Runs the default clean-up rules over the content block in place."""
+    _default_engine.run(soup, content_div)
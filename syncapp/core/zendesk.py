@@ -1,16 +1,222 @@
+import asyncio
+import json
+import random
+import threading
 import aiohttp
+from syncapp.core.rate_limit import RateLimiter, backoff_delay, parse_retry_after
+from syncapp.utils.hashing import sanitized_body_hash
 from syncapp.loggers.log_cli import setup_logger
 from syncapp.config.settings import load_settings
 
 
 logger = setup_logger(__name__)
+
+DEFAULT_POOL_LIMIT = 20
+DEFAULT_POOL_LIMIT_PER_HOST = 10
+DEFAULT_DNS_TTL = 300
+DEFAULT_REQUEST_TIMEOUT = 60
+# Requests per minute until Zendesk's X-Rate-Limit header says otherwise (lowest Help Center plan limit)
+DEFAULT_RATE_LIMIT = 200
+DEFAULT_INITIAL_CONCURRENCY = 2
+DEFAULT_MAX_RETRIES = 5
+# Safe to send again: translation PUTs replace the whole translation
+RETRYABLE_METHODS = {"GET", "PUT"}
+RETRYABLE_STATUSES = {500, 502, 503, 504}
+DEFAULT_VERIFY_AUDIT_EVERY = 0
+
+class ZendeskAPIError(Exception):
+    """Raised when Zendesk answers with an error status."""
+
+    def __init__(self, status, method, url, text):
+        super().__init__(f"Zendesk returned status {status} for {method} {url}")
+        self.status = status
+        self.text = text
+
+class ZendeskResponse:
+    """Status, headers (case-insensitive) and body of a finished Zendesk request."""
+
+    def __init__(self, status, headers, text):
+        self.status = status
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+# ---------------------------- ZENDESK CLIENT ----------------------------
+class ZendeskClient:
+    """
+    Long-lived HTTP client shared by every Zendesk call.
+
+    Keeps one keep-alive connection pool and one RateLimiter per Zendesk
+    domain; 429s and 5xx answers to idempotent requests are retried with
+    jittered backoff, honouring Retry-After. aiohttp sessions belong to the
+    event loop that created them, while syncs run on the UI loop and on the
+    scheduler's own loops, so the sessions live on a dedicated I/O loop
+    thread and callers on any loop hand their requests to it.
+    """
+
+    def __init__(self, limit=DEFAULT_POOL_LIMIT, limit_per_host=DEFAULT_POOL_LIMIT_PER_HOST,
+                 dns_ttl=DEFAULT_DNS_TTL, timeout=DEFAULT_REQUEST_TIMEOUT, rate_limit=DEFAULT_RATE_LIMIT,
+                 initial_concurrency=DEFAULT_INITIAL_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.initial_concurrency = initial_concurrency
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._limiters = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="zendesk-io", daemon=True)
+        self._thread.start()
+        logger.info("Zendesk client started (limit %d, per host %d, DNS cache %ds)", limit, limit_per_host, dns_ttl)
+
+    def _session(self, domain):
+        # Only called on the client loop, so no locking is needed
+        session = self._sessions.get(domain)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+            )
+            session = aiohttp.ClientSession(
+                # A domain with a scheme (e.g. a local stand-in at http://127.0.0.1:8900) is used as is
+                base_url=domain if "://" in domain else f"https://{domain}",
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._sessions[domain] = session
+            logger.info("Opened Zendesk connection pool for %s", domain)
+        return session
+
+    def _limiter(self, domain):
+        limiter = self._limiters.get(domain)
+        if limiter is None:
+            limiter = self._limiters[domain] = RateLimiter(
+                domain, self.rate_limit, self.limit_per_host, self.initial_concurrency
+            )
+        return limiter
+
+    async def _send(self, limiter, method, domain, path, auth, payload):
+        await limiter.acquire()
+        try:
+            async with self._session(domain).request(method, path, auth=auth, json=payload) as response:
+                return ZendeskResponse(response.status, response.headers.copy(), await response.text())
+        finally:
+            await limiter.release()
+
+    async def _request(self, method, domain, path, auth, payload):
+        limiter = self._limiter(domain)
+        retryable = method in RETRYABLE_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await self._send(limiter, method, domain, path, auth, payload)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning("%s %s failed (%s), retrying in %.1fs", method, path, str(e) or type(e).__name__, delay)
+            else:
+                limiter.update_from_headers(response.headers)
+                if response.status == 429:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    limiter.on_throttle(retry_after)
+                    if not retryable or attempt >= self.max_retries:
+                        return response
+                    # The limiter already pauses everyone for Retry-After; the jitter spreads the retries out
+                    delay = backoff_delay(0) if retry_after is not None else backoff_delay(attempt)
+                elif response.status in RETRYABLE_STATUSES and retryable and attempt < self.max_retries:
+                    delay = parse_retry_after(response.headers.get("Retry-After")) or backoff_delay(attempt)
+                    logger.warning("%s %s returned %d, retrying in %.1fs", method, path, response.status, delay)
+                else:
+                    if response.status < 400:
+                        limiter.on_success()
+                    return response
+            limiter.stats["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def get_stats(self):
+        """Per-domain request, throttle, retry and wait counters."""
+        return {domain: limiter.get_stats() for domain, limiter in list(self._limiters.items())}
+
+    async def request(self, method, domain, path, payload=None):
+        """
+        Sends a request to https://{domain}{path} with the configured credentials.
+
+        Can be awaited from any event loop. Returns a ZendeskResponse whatever
+        the status; connection problems raise aiohttp.ClientError.
+        """
+        current_settings = load_settings()
+        auth = aiohttp.BasicAuth(current_settings.get('EMAIL', '') + "/token", current_settings.get('API_TOKEN', ''))
+        future = asyncio.run_coroutine_threadsafe(self._request(method, domain, path, auth, payload), self._loop)
+        return await asyncio.wrap_future(future)
+
+    async def _close_sessions(self):
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions.clear()
+
+    def close(self):
+        if not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_sessions(), self._loop).result(timeout=10)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop.close()
+            logger.info("Zendesk client stopped")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_zendesk_client():
+    """Returns the shared client, creating it from the ZENDESK_POOL_* settings on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            current_settings = load_settings()
+            _client = ZendeskClient(
+                limit=current_settings.get("ZENDESK_POOL_LIMIT", DEFAULT_POOL_LIMIT),
+                limit_per_host=current_settings.get("ZENDESK_POOL_LIMIT_PER_HOST", DEFAULT_POOL_LIMIT_PER_HOST),
+                dns_ttl=current_settings.get("ZENDESK_DNS_TTL", DEFAULT_DNS_TTL),
+                timeout=current_settings.get("ZENDESK_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT),
+                rate_limit=current_settings.get("ZENDESK_RATE_LIMIT", DEFAULT_RATE_LIMIT),
+                initial_concurrency=current_settings.get("ZENDESK_INITIAL_CONCURRENCY", DEFAULT_INITIAL_CONCURRENCY),
+                max_retries=current_settings.get("ZENDESK_MAX_RETRIES", DEFAULT_MAX_RETRIES),
+            )
+        return _client
+
+def shutdown_zendesk_client():
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+
+def get_zendesk_stats():
+    """Throttle and retry counters of the shared client, empty before the first request."""
+    with _client_lock:
+        client = _client
+    return client.get_stats() if client is not None else {}
+
+def translation_path(article_id, locale):
+    return f"/api/v2/help_center/articles/{article_id}/translations/{locale}.json"
+
 # ---------------------------- ZENDESK UPDATE ----------------------------
 async def update_zendesk_translation(article_id, zendesk_domain, locale, title, body_html):
-    # Load fresh settings
-    current_settings = load_settings()
-    
-    url = f"https://{zendesk_domain}/api/v2/help_center/articles/{article_id}/translations/{locale}.json"
-    headers = {"Content-Type": "application/json"}
+    """
+    Replaces the title and body of an article translation and returns the translation Zendesk stored.
+
+    A translation that does not exist yet is created.
+    """
+    path = translation_path(article_id, locale)
     payload = {
         "translation": {
             "title": title,
@@ -18,50 +224,82 @@ async def update_zendesk_translation(article_id, zendesk_domain, locale, title,
         }
     }
     logger.info("Updating Zendesk localized translation...")
-    logger.info("URL: %s", url)
-    logger.info("EMAIL: %s", current_settings.get('EMAIL', ''))
-    logger.info("HEADERS: %s", headers)
-    
-    async with aiohttp.ClientSession() as session:
-        async with session.put(
-            url,
-            auth=aiohttp.BasicAuth(current_settings.get('EMAIL', '') + "/token", current_settings.get('API_TOKEN', '')),
-            headers=headers,
-            json=payload
-        ) as response:
-            if response.status == 200:
-                logger.info("Zendesk translation updated successfully!")
-            else:
-                logger.error("Failed to update translation. Status code: %d", response.status)
-                error_text = await response.text()
-                logger.error("Response: %s", error_text)
-                response.raise_for_status()
+    logger.info("URL: https://%s%s", zendesk_domain, path)
+
+    client = get_zendesk_client()
+    method = "PUT"
+    response = await client.request(method, zendesk_domain, path, payload)
+    if response.status == 200:
+        logger.info("Zendesk translation updated successfully!")
+        return response.json().get('translation', {})
+    if response.status == 404:
+        # The article exists but has no translation in this locale yet
+        logger.info("No %s translation of article %s yet, creating it", locale, article_id)
+        payload["translation"]["locale"] = locale
+        method = "POST"
+        path = f"/api/v2/help_center/articles/{article_id}/translations.json"
+        response = await client.request(method, zendesk_domain, path, payload)
+        if response.status == 201:
+            logger.info("Zendesk translation created successfully!")
+            return response.json().get('translation', {})
+    logger.error("Failed to update translation. Status code: %d", response.status)
+    logger.error("Response: %s", response.text)
+    raise ZendeskAPIError(response.status, method, path, response.text)
 
 # ---------------------------- VERIFICATION ----------------------------
-async def verify_article_update(article_id, locale=None):
+def verify_translation(sent_body, translation):
+    """
+    True when the body Zendesk stored holds the body that was sent.
+
+    Differences Zendesk's sanitizer makes (attributes, entities, stripped
+    markup, whitespace) are ignored; lost or altered text, links and images are not.
+    """
+    stored_body = translation.get('body')
+    if stored_body is None:
+        logger.error("No body found in translation.")
+        return False
+    if sanitized_body_hash(stored_body) != sanitized_body_hash(sent_body):
+        logger.warning("Zendesk stored a different body than was sent (first 500 chars): %s", stored_body[:500])
+        return False
+    return True
+
+def should_audit():
+    """
+    Picks the syncs whose update is re-read with a separate GET.
+
+    VERIFY_AUDIT_EVERY = N audits about one sync in N; 0 (the default) never does.
+    """
+    every = load_settings().get("VERIFY_AUDIT_EVERY", DEFAULT_VERIFY_AUDIT_EVERY)
+    return every > 0 and random.randrange(every) == 0
+
+async def verify_article_update(article_id, locale=None, expected_body=None):
+    """
+    Fetches the translation back from Zendesk.
+
+    Returns whether it matches `expected_body` when one is given, otherwise
+    whether the translation could be read.
+    """
     # Load fresh settings
     current_settings = load_settings()
-    
+
     # Use provided locale or default from settings
     if locale is None:
         locale = current_settings.get('LOCAL', 'en-us')
-    
-    url = f"https://{current_settings.get('ZENDESK_DOMAIN', '')}/api/v2/help_center/articles/{article_id}/translations/{locale}.json"
-    
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            url,
-            auth=aiohttp.BasicAuth(current_settings.get('EMAIL', '') + "/token", current_settings.get('API_TOKEN', ''))
-        ) as response:
-            if response.status == 200:
-                data = await response.json()
-                body = data.get('translation', {}).get('body')
-                if body:
-                    logger.info("Updated article preview (first 500 chars):")
-                    logger.info("%s", body[:500])
-                else:
-                    logger.error("No body found in translation.")
-            else:
-                logger.error("Failed to fetch localized article. Status code: %d", response.status)
-                error_text = await response.text()
-                logger.error("Response text: %s", error_text)
\ No newline at end of file
+
+    response = await get_zendesk_client().request(
+        "GET", current_settings.get('ZENDESK_DOMAIN', ''), translation_path(article_id, locale)
+    )
+    if response.status != 200:
+        logger.error("Failed to fetch localized article. Status code: %d", response.status)
+        logger.error("Response text: %s", response.text)
+        return False
+    translation = response.json().get('translation', {})
+    if expected_body is not None:
+        return verify_translation(expected_body, translation)
+    body = translation.get('body')
+    if not body:
+        logger.error("No body found in translation.")
+        return False
+    logger.info("Updated article preview (first 500 chars):")
+    logger.info("%s", body[:500])
+    return True
@@ -0,0 +1,95 @@
+# main.py
+# Command line entry point: python -m syncapp.main --help
+import logging
+import re
+import runpy
+from pathlib import Path
+from typing import Optional
+import typer
+
+app = typer.Typer(help="Sync documentation pages into Zendesk Help Center articles.")
+
+@app.command()
+def web():
+    """Starts the web UI and the scheduler."""
+    runpy.run_module("syncapp.webui.appv5", run_name="__main__")
+
+@app.command()
+def worker(
+    processes: int = typer.Option(1, min=1, help="Worker processes to run on this host"),
+    concurrency: Optional[int] = typer.Option(None, min=1, help="Syncs at once per process (default: BULK_CONCURRENCY)"),
+    scheduler: bool = typer.Option(True, help="Also queue scheduled syncs"),
+):
+    """Runs the sync workers and the scheduler outside the web UI; they only talk to it through the database."""
+    from syncapp.backend.worker import run_workers
+    run_workers(processes, concurrency, scheduler)
+
+@app.command()
+def retransform(
+    url: Optional[str] = typer.Option(None, help="Only snapshots whose URL contains this text"),
+    processes: Optional[int] = typer.Option(None, min=1, help="Worker processes (default: CPU count - 1)"),
+    output: Optional[Path] = typer.Option(None, file_okay=False, help="Write the cleaned output of each page here"),
+):
+    """Re-runs the cleaning pipeline over stored page snapshots without fetching anything."""
+    # Every rule logs what it does, which would bury the summary
+    logging.disable(logging.INFO)
+    from syncapp.core.retransform import CHANGED, FAILED, retransform_snapshots
+    from syncapp.core.snapshots import prune_snapshots
+
+    prune_snapshots()
+    results = retransform_snapshots(url, processes)
+    if not results:
+        typer.echo("No snapshots stored yet; sync some articles first.")
+        return
+
+    if output:
+        output.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+        if result.status in (CHANGED, FAILED):
+            typer.echo(f"{result.status:<8} {result.source_url}" + (f" ({result.error})" if result.error else ""))
+        if output and result.content is not None:
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", result.source_url.split("://", 1)[-1]).strip("-")
+            (output / f"{slug}.html").write_text(result.content, encoding="utf-8")
+
+    typer.echo(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    if counts.get(FAILED):
+        raise typer.Exit(code=1)
+
+@app.command()
+def drift(locale: Optional[str] = typer.Option(None, help="Locale to check (default: the LOCAL setting)")):
+    """Lists articles whose Zendesk content differs from what was last pushed from here."""
+    logging.disable(logging.INFO)
+    import asyncio
+    import syncapp.config.database as db
+    from syncapp.config.settings import load_settings
+    from syncapp.backend.sync_runnerv2 import get_stored_hash
+    from syncapp.core.remote_index import drift_report, refresh_remote_index
+    from syncapp.core.zendesk import shutdown_zendesk_client
+
+    default_locale = load_settings().get("LOCAL", "en-us")
+    locale = locale or default_locale
+    try:
+        indexed = asyncio.run(refresh_remote_index(locale))
+    finally:
+        shutdown_zendesk_client()
+    conn = db.get_db_connection()
+    articles = [dict(row) for row in conn.execute("SELECT title, article_id, locales FROM articles ORDER BY title")
+                if locale in (db.parse_locales(row['locales']) or [default_locale])]
+    conn.close()
+    for article in articles:
+        article['content_hash'] = get_stored_hash(article['article_id'], locale)
+
+    report = drift_report(articles, locale)
+    for article, (article_id, state) in zip(articles, report):
+        if state != "in sync":
+            typer.echo(f"{state:<8} {article_id:<14} {article['title']}")
+    in_sync = sum(state == "in sync" for _, state in report)
+    typer.echo(f"{in_sync} of {len(report)} {locale} articles in sync ({indexed} in Zendesk)")
+
+def main():
+    app()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+# "sec min hour day month weekday" as stored by the schedule dialog; five-field expressions get second 0
+FIELDS = (
+    ("second", 0, 59),
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+MONTH_NAMES = {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}
+WEEKDAY_NAMES = {"sun": 0, "mon": 1, "tue": 2, "wed": 3, "thu": 4, "fri": 5, "sat": 6}
+# Leap days can be 8 years apart (2096 -> 2104); a schedule with no match within that never fires
+MAX_YEARS_AHEAD = 9
+
+class CronError(ValueError):
+    """Raised for an expression that is not a valid schedule."""
+
+def _value(text, name, low, high):
+    names = MONTH_NAMES if name == "month" else WEEKDAY_NAMES if name == "weekday" else {}
+    value = names.get(text.lower())
+    if value is None:
+        if not text.isdigit():
+            raise CronError(f"Invalid {name} value: {text!r}")
+        value = int(text)
+    if not low <= value <= high:
+        raise CronError(f"{name.capitalize()} {value} is out of range {low}-{high}")
+    return value
+
+def _parse_field(text, name, low, high):
+    """Returns the set of values a field allows, e.g. "*/15" -> {0, 15, 30, 45}."""
+    values = set()
+    for item in text.split(","):
+        item, _, step_text = item.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise CronError(f"Invalid {name} step: {step_text!r}")
+            step = int(step_text)
+        if item == "*":
+            start, end = low, high
+        elif "-" in item:
+            start_text, _, end_text = item.partition("-")
+            start, end = _value(start_text, name, low, high), _value(end_text, name, low, high)
+            if start > end:
+                raise CronError(f"Invalid {name} range: {item!r}")
+        else:
+            start = _value(item, name, low, high)
+            # "5/10" means from 5 to the end in steps of 10
+            end = high if step_text else start
+        values.update(range(start, end + 1, step))
+    return values
+
+def _next_table(values, high):
+    """table[v] is the smallest allowed value >= v, or None when there is none."""
+    table = [None] * (high + 2)
+    upcoming = None
+    for value in range(high, -1, -1):
+        if value in values:
+            upcoming = value
+        table[value] = upcoming
+    return table
+
+# ---------------------------- COMPILED SCHEDULE ----------------------------
+class CronSchedule:
+    """
+    A compiled cron expression.
+
+    Each field becomes a bitmask (for matching) and a next-value table, so
+    finding the next fire time is a handful of lookups instead of a scan
+    over minutes. Day of month and weekday follow cron: when both are
+    restricted a day matching either fires. Weekday 0 and 7 are Sunday.
+    """
+
+    def __init__(self, expression):
+        parts = expression.split() if isinstance(expression, str) else []
+        if len(parts) == 5:
+            parts = ["0"] + parts
+        if len(parts) != 6:
+            raise CronError("Expected 6 fields (second minute hour day month weekday) or 5 without seconds")
+        self.expression = " ".join(parts)
+        fields = {}
+        for text, (name, low, high) in zip(parts, FIELDS):
+            fields[name] = _parse_field(text, name, low, high)
+        if 7 in fields["weekday"]:
+            fields["weekday"] = (fields["weekday"] - {7}) | {0}
+        self._masks = {name: sum(1 << value for value in values) for name, values in fields.items()}
+        self._next = {name: _next_table(values, high) for (name, _, high), values in zip(FIELDS, fields.values())}
+        # Vixie cron: a field is unrestricted when it starts with *
+        self._day_restricted = not parts[3].startswith("*")
+        self._weekday_restricted = not parts[5].startswith("*")
+
+    def _day_matches(self, year, month, day):
+        day_ok = self._masks["day"] >> day & 1
+        weekday_ok = self._masks["weekday"] >> (date(year, month, day).isoweekday() % 7) & 1
+        if self._day_restricted and self._weekday_restricted:
+            return bool(day_ok or weekday_ok)
+        if self._weekday_restricted:
+            return bool(weekday_ok)
+        return bool(day_ok)
+
+    def matches(self, moment):
+        """True when the schedule fires at this second."""
+        return bool(self._masks["second"] >> moment.second & 1 and self._masks["minute"] >> moment.minute & 1
+                    and self._masks["hour"] >> moment.hour & 1 and self._masks["month"] >> moment.month & 1
+                    and self._day_matches(moment.year, moment.month, moment.day))
+
+    def _next_day(self, year, month, day):
+        for candidate in range(day, calendar.monthrange(year, month)[1] + 1):
+            if self._day_matches(year, month, candidate):
+                return candidate
+        return None
+
+    def next_after(self, after):
+        """Returns the first fire time strictly after `after` (a naive datetime), or None if it never fires."""
+        start = after.replace(microsecond=0) + timedelta(seconds=1)
+        year, month, day = start.year, start.month, start.day
+        hour, minute, second = start.hour, start.minute, start.second
+        next_month, next_hour = self._next["month"], self._next["hour"]
+        next_minute, next_second = self._next["minute"], self._next["second"]
+        while year <= start.year + MAX_YEARS_AHEAD:
+            # Carry overflowing fields upwards; a field without a next value is set one past its maximum
+            # and the fields below it to their minimum
+            if second > 59:
+                second, minute = 0, minute + 1
+            if minute > 59:
+                minute, hour = 0, hour + 1
+            if hour > 23:
+                hour, day = 0, day + 1
+            if month <= 12 and day > calendar.monthrange(year, month)[1]:
+                day, month = 1, month + 1
+            if month > 12:
+                month, year = 1, year + 1
+                continue
+
+            value = next_month[month]
+            if value is None:
+                month, day, hour, minute, second = 13, 1, 0, 0, 0
+                continue
+            if value != month:
+                month, day, hour, minute, second = value, 1, 0, 0, 0
+
+            value = self._next_day(year, month, day)
+            if value is None:
+                day, hour, minute, second = 32, 0, 0, 0
+                continue
+            if value != day:
+                day, hour, minute, second = value, 0, 0, 0
+
+            value = next_hour[hour]
+            if value is None:
+                hour, minute, second = 24, 0, 0
+                continue
+            if value != hour:
+                hour, minute, second = value, 0, 0
+
+            value = next_minute[minute]
+            if value is None:
+                minute, second = 60, 0
+                continue
+            if value != minute:
+                minute, second = value, 0
+
+            value = next_second[second]
+            if value is None:
+                second = 60
+                continue
+            return datetime(year, month, day, hour, minute, value)
+        return None
+
+@lru_cache(maxsize=1024)
+def compile_cron(expression):
+    """Compiles an expression once and reuses it; raises CronError when it is invalid."""
+    return CronSchedule(expression)
+
+def validate_cron(expression):
+    """Returns the normalized expression (single spaces, seconds field added) or raises CronError."""
+    schedule = compile_cron((expression or "").strip())
+    if schedule.next_after(datetime.now()) is None:
+        raise CronError("The schedule never fires")
+    return schedule.expression
+
+def next_run_after(expression, after):
+    """Next fire time of an expression after `after`, or None when it is invalid or never fires."""
+    try:
+        return compile_cron(expression).next_after(after)
+    except CronError:
+        return None
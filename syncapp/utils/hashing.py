@@ -0,0 +1,63 @@
+import hashlib
+import re
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+_WHITESPACE = re.compile(r"\s+")
+_PRESERVE_WHITESPACE = {"pre", "textarea"}
+
+# ---------------------------- CANONICAL HTML ----------------------------
+def _serialize(node, parts, preserve):
+    for child in node.children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, NavigableString):
+            text = str(child)
+            parts.append(text if preserve else _WHITESPACE.sub(" ", text))
+            continue
+        attrs = []
+        for name in sorted(child.attrs):
+            value = child.attrs[name]
+            if isinstance(value, list):
+                value = " ".join(value)
+            attrs.append(f' {name}="{value}"')
+        parts.append(f"<{child.name}{''.join(attrs)}>")
+        _serialize(child, parts, preserve or child.name in _PRESERVE_WHITESPACE)
+        parts.append(f"</{child.name}>")
+
+def canonicalize_html(html):
+    """
+    Serializes HTML into a canonical form for change detection.
+
+    Attributes are sorted, comments dropped and whitespace runs collapsed
+    outside <pre>, so formatting-only differences do not count as changes.
+    """
+    parts = []
+    _serialize(BeautifulSoup(html or "", "html.parser"), parts, False)
+    return "".join(parts).strip()
+
+def sanitized_body_hash(body_html):
+    """
+    Hash of what survives Zendesk's HTML sanitizer: the text and the link and image targets.
+
+    Zendesk reorders and drops attributes, rewrites entities, unwraps or
+    strips tags and reflows whitespace, so the body it stores rarely hashes
+    like the body that was sent. This hash only differs when text or a
+    link or image was lost or altered.
+    """
+    soup = BeautifulSoup(body_html or "", "html.parser")
+    for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+        comment.extract()
+    digest = hashlib.sha256()
+    digest.update("".join(soup.get_text().split()).encode("utf-8"))
+    for tag in soup.find_all(["a", "img"]):
+        digest.update(b"\0")
+        digest.update((tag.get("href") or tag.get("src") or "").strip().encode("utf-8"))
+    return digest.hexdigest()
+
+def content_hash(locale, title, body_html):
+    """Hash of everything pushed to a Zendesk translation: locale, title and canonical body."""
+    digest = hashlib.sha256()
+    for part in (locale or "", title or "", canonicalize_html(body_html)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
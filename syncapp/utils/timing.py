@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Only the most recent samples per stage are kept
+MAX_SAMPLES = 10000
+
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_samples_lock = threading.Lock()
+
+# ---------------------------- STAGE TIMINGS ----------------------------
+def record_stage(stage, seconds):
+    with _samples_lock:
+        _samples[stage].append(seconds)
+
+@contextmanager
+def timed(stage):
+    """Records how long the block took under `stage`, e.g. with timed("push"): ..."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers, or None when it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+def get_stage_stats():
+    """Returns stage -> count, p50, p95 and max in seconds."""
+    with _samples_lock:
+        samples = {stage: list(values) for stage, values in _samples.items()}
+    return {
+        stage: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "max": max(values),
+        }
+        for stage, values in samples.items() if values
+    }
+
+def reset_stage_stats():
+    with _samples_lock:
+        _samples.clear()
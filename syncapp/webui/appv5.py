@@ -1,11 +1,22 @@
-from nicegui import ui
+from nicegui import app, ui
 from syncapp.webui.pages.addarticle import index_page
 from syncapp.webui.pages.listarticle import list_page
 from syncapp.webui.pages.settingspage import settings_page
 from syncapp.webui.pages.log_viewer import log_viewer_page
+from syncapp.webui.pages.discoverpage import discover_page
 from syncapp.loggers.log_cli import setup_logger
 from syncapp.config.database import init_db
-from syncapp.backend.sync_auto_run import run_scheduler, stop_scheduler
+from syncapp.config.settings import load_settings
+from syncapp.backend.sync_auto_run import start_scheduler, stop_scheduler
+from syncapp.backend.job_queue import start_job_workers, stop_job_workers
+from syncapp.core.driver_pool import start_driver_pool, shutdown_driver_pool
+from syncapp.core.clean_pool import shutdown_clean_pool
+from syncapp.core.mermaid import shutdown_mermaid_renderer
+from syncapp.core.zendesk import shutdown_zendesk_client
+import multiprocessing
+
+# Cleaning-pool workers of PyInstaller builds start from this script, so they must stop here
+multiprocessing.freeze_support()
 
 logger = setup_logger(__name__)
 
@@ -16,17 +27,33 @@ def initialize_application():
         logger.info("Initializing database...")
         init_db()
         
-        # Start scheduler
-        logger.info("Starting scheduler...")
-        run_scheduler()
+        if load_settings().get("SEPARATE_WORKERS", False):
+            # Syncs run in `syncapp worker` processes; this process only queues and watches them
+            logger.info("Sync workers and scheduler run in separate worker processes")
+        else:
+            # The sync workers and the scheduler run on the app's event loop once it is up;
+            # they stop first on shutdown, while the pools they use are still open
+            app.on_startup(start_job_workers)
+            app.on_startup(start_scheduler)
+            app.on_shutdown(stop_scheduler)
+            app.on_shutdown(stop_job_workers)
+
+            # Pre-launch browsers so the first sync does not pay Chrome startup
+            logger.info("Starting browser pool...")
+            start_driver_pool()
+            app.on_shutdown(shutdown_driver_pool)
+        app.on_shutdown(shutdown_clean_pool)
+        app.on_shutdown(shutdown_mermaid_renderer)
+        app.on_shutdown(shutdown_zendesk_client)
         logger.info("Application initialization completed successfully")
         
     except Exception as e:
         logger.error("Error during application initialization: %s", str(e))
         raise
 
-# Initialize application components
-initialize_application()
+# Initialize application components (not in spawned worker processes, which import this as __mp_main__)
+if __name__ != "__mp_main__":
+    initialize_application()
 
 @ui.page('/')
 def main():
@@ -55,4 +82,8 @@ if __name__ == "__main__":
         logger.error("Error starting web server: %s", str(e))
         # Ensure scheduler is stopped if application fails to start
         stop_scheduler()
+        shutdown_driver_pool()
+        shutdown_clean_pool()
+        shutdown_mermaid_renderer()
+        shutdown_zendesk_client()
         raise  
\ No newline at end of file
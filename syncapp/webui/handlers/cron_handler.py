@@ -1,75 +1,41 @@
 import syncapp.config.database as db
+from syncapp.backend.sync_auto_run import save_schedule
 from nicegui import ui
-from datetime import datetime, timedelta
+from datetime import datetime
+from syncapp.utils.cron import CronError, compile_cron, next_run_after
 
 def get_next_run_time(cron_schedule):
     """Calculate the next run time for a cron schedule."""
-    try:
-        parts = cron_schedule.split()
-        if len(parts) >= 6:
-            minute = int(parts[1])
-            hour = int(parts[2])
-            day = parts[3]
-            month = parts[4]
-            weekday = parts[5]
-            
-            now = datetime.now()
-            next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            
-            # If the time has already passed today, move to next occurrence
-            if next_run <= now:
-                if day == '*' and month == '*' and weekday == '*':  # Daily
-                    next_run += timedelta(days=1)
-                elif day == '*' and month == '*' and weekday == '0':  # Weekly
-                    days_until_sunday = (7 - now.weekday()) % 7
-                    next_run += timedelta(days=days_until_sunday)
-                elif day == '1' and month == '*' and weekday == '*':  # Monthly
-                    if now.day >= 1:
-                        # Move to next month
-                        if now.month == 12:
-                            next_run = next_run.replace(year=now.year + 1, month=1, day=1)
-                        else:
-                            next_run = next_run.replace(month=now.month + 1, day=1)
-                    else:
-                        next_run = next_run.replace(day=1)
-            
-            return next_run.strftime('%Y-%m-%d %H:%M:%S')
-    except Exception as e:
-        return "Error calculating next run time"
-    return "Unknown schedule"
+    next_run = next_run_after(cron_schedule, datetime.now())
+    return next_run.strftime('%Y-%m-%d %H:%M:%S') if next_run else "Never"
 
-def format_cron_schedule(cron_schedule):
-    """Convert cron expression to user-friendly format."""
+def format_cron_schedule(cron_schedule, next_run_at=None):
+    """
+    Convert cron expression to user-friendly format.
+
+    `next_run_at` is the next run the scheduler stored; it is computed when missing.
+    """
     if not cron_schedule:
         return 'Not scheduled'
     
     try:
-        parts = cron_schedule.split()
-        if len(parts) >= 6:
-            minute = parts[1]
-            hour = parts[2]
-            day = parts[3]
-            month = parts[4]
-            weekday = parts[5]
-            
-            # Format time
-            time_str = f"{hour.zfill(2)}:{minute.zfill(2)}"
-            
-            # Determine frequency
-            if day == '*' and month == '*' and weekday == '*':
-                next_run = get_next_run_time(cron_schedule)
-                return f"Daily at {time_str} (Next: {next_run})"
-            elif day == '*' and month == '*' and weekday == '0':
-                next_run = get_next_run_time(cron_schedule)
-                return f"Weekly on Sunday at {time_str} (Next: {next_run})"
-            elif day == '1' and month == '*' and weekday == '*':
-                next_run = get_next_run_time(cron_schedule)
-                return f"Monthly on 1st at {time_str} (Next: {next_run})"
-            else:
-                next_run = get_next_run_time(cron_schedule)
-                return f"Custom: {cron_schedule} (Next: {next_run})"
-    except Exception:
-        return cron_schedule
+        schedule = compile_cron(cron_schedule)
+    except CronError:
+        return f"Invalid: {cron_schedule}"
+    next_run = next_run_at or get_next_run_time(cron_schedule)
+    second, minute, hour, day, month, weekday = schedule.expression.split()
+    if second == '0' and minute.isdigit() and hour.isdigit():
+        # Format time
+        time_str = f"{hour.zfill(2)}:{minute.zfill(2)}"
+
+        # Determine frequency
+        if day == '*' and month == '*' and weekday == '*':
+            return f"Daily at {time_str} (Next: {next_run})"
+        elif day == '*' and month == '*' and weekday == '0':
+            return f"Weekly on Sunday at {time_str} (Next: {next_run})"
+        elif day == '1' and month == '*' and weekday == '*':
+            return f"Monthly on 1st at {time_str} (Next: {next_run})"
+    return f"Custom: {cron_schedule} (Next: {next_run})"
 
 def create_cron_handler(article, refresh_callback):
     """
@@ -174,15 +140,12 @@ def create_cron_handler(article, refresh_callback):
                 elif frequency == 'Monthly':
                     cron_schedule = f"0 {time.split(':')[1]} {time.split(':')[0]} 1 * *"
             
-            # Update database
-            conn = db.get_db_connection()
-            conn.execute("""
-                UPDATE articles 
-                SET cron_schedule = ?, last_cron_update = ?
-                WHERE id = ?
-            """, (cron_schedule, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), article_id))
-            conn.commit()
-            conn.close()
+            # Update database and let the scheduler pick up the new next run
+            try:
+                save_schedule([article_id], cron_schedule)
+            except CronError as e:
+                ui.notify(f'Invalid cron expression: {e}', type='negative')
+                return
             
             ui.notify('Schedule updated successfully!', type='positive')
             dialog.close()
@@ -312,16 +275,12 @@ def create_bulk_cron_handler(selected_articles, refresh_callback):
                 elif frequency == 'Monthly':
                     cron_schedule = f"0 {time.split(':')[1]} {time.split(':')[0]} 1 * *"
             
-            # Update database
-            conn = db.get_db_connection()
-            conn.execute("""
-                UPDATE articles 
-                SET cron_schedule = ?, last_cron_update = ?
-                WHERE id IN ({})
-            """.format(','.join('?' * len(article_ids))), 
-            [cron_schedule, datetime.now().strftime('%Y-%m-%d %H:%M:%S')] + article_ids)
-            conn.commit()
-            conn.close()
+            # Update database and let the scheduler pick up the new next runs
+            try:
+                save_schedule(article_ids, cron_schedule)
+            except CronError as e:
+                ui.notify(f'Invalid cron expression: {e}', type='negative')
+                return
             
             ui.notify(f'Successfully scheduled {len(article_ids)} articles', type='positive')
             dialog.close()
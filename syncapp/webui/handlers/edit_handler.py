@@ -20,6 +20,8 @@ def create_edit_handler(article, refresh_callback):
             title_input = ui.input('Title', value=article['title']).classes('w-full')
             url_input = ui.input('Source URL', value=article['source_url']).classes('w-full')
             zendesk_id_input = ui.input('Zendesk ID', value=article['article_id']).classes('w-full')
+            locales_input = ui.input('Locales (comma separated, empty = default locale)',
+                                     value=article['locales'] or '').classes('w-full')
             
             with ui.row().classes('w-full justify-end'):
                 ui.button('Cancel', on_click=dialog.close).props('flat')
@@ -28,11 +30,12 @@ def create_edit_handler(article, refresh_callback):
                     title_input.value,
                     url_input.value,
                     zendesk_id_input.value,
+                    locales_input.value,
                     dialog
                 )).props('flat color=primary')
         dialog.open()
     
-    def save_changes(article_id, new_title, new_url, new_zendesk_id, dialog):
+    def save_changes(article_id, new_title, new_url, new_zendesk_id, new_locales, dialog):
         try:
             logger.info("Updating article: %s", new_title)
             # Validate all fields are filled
@@ -46,12 +49,15 @@ def create_edit_handler(article, refresh_callback):
                 ui.notify('Zendesk ID cannot be empty', type='negative')
                 return
 
+            # Clear the pushed content hash so the next sync always pushes to the (possibly new) target
             conn = db.get_db_connection()
             conn.execute("""
                 UPDATE articles 
-                SET title = ?, source_url = ?, article_id = ?, status = 'Pending'
+                SET title = ?, source_url = ?, article_id = ?, locales = ?, status = 'Pending', content_hash = NULL
                 WHERE id = ?
-            """, (new_title, new_url, new_zendesk_id, article_id))
+            """, (new_title, new_url, new_zendesk_id, ', '.join(db.parse_locales(new_locales)) or None, article_id))
+            conn.execute("UPDATE article_translations SET content_hash = NULL, remote_hash = NULL WHERE article_id IN (?, ?)",
+                         (article['article_id'], new_zendesk_id))
             conn.commit()
             conn.close()
             
@@ -1,6 +1,6 @@
-from datetime import datetime
-import syncapp.config.database as db
-from syncapp.backend.sync_runnerv2 import run_sync_async
+import asyncio
+from syncapp.backend.bulk_sync import get_articles, refresh_indexes
+from syncapp.backend.job_queue import TRIGGER_BULK, TRIGGER_MANUAL, enqueue_jobs, wait_for_jobs
 from syncapp.loggers.log_cli import setup_logger
 from nicegui import ui
 
@@ -18,35 +18,23 @@ def create_sync_handler(article, refresh_callback, sync_button):
     async def handle_sync():
         # Visually disable button and show spinner
         sync_button.props('loading=true')
-        
-        # Update status in DB and refresh UI to show "Syncing"
-        conn = db.get_db_connection()
-        conn.execute("UPDATE articles SET status = 'Syncing' WHERE id = ?", (article['id'],))
-        conn.commit()
-        conn.close()
-        refresh_callback()
-        logger.info("Starting sync process for article: %s", article['title'])
-        
-        # Run the actual sync
-        success, message = await run_sync_async(
-            article_id=article['article_id'],
-            source_url=article['source_url'],
-            title=article['title']
-        )
-        ui.notify(message, type='positive' if success else 'negative')
-        
-        # Update DB with final status
-        conn = db.get_db_connection()
-        new_status = 'Success' if success else 'Failed'
-        last_synced_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        conn.execute("UPDATE articles SET status = ?, last_synced = ? WHERE id = ?", 
-                     (new_status, last_synced_time, article['id']))
-        conn.commit()
-        conn.close()
-        
-        # Reset button state and refresh the grid
-        sync_button.props('loading=false')
-        refresh_callback()
+        logger.info("Queueing sync for article: %s", article['title'])
+
+        try:
+            # The job runs in the worker pool; this only watches it, so leaving the page does not stop it
+            loop = asyncio.get_event_loop()
+            jobs = await loop.run_in_executor(None, enqueue_jobs, [article['id']], TRIGGER_MANUAL)
+            job_id = jobs[article['id']]
+            refresh_callback()
+            result = (await wait_for_jobs([job_id])).results[article['id']]
+            ui.notify(result.message, type='positive' if result.success else 'negative')
+        except Exception as e:
+            logger.error("Error syncing article %s: %s", article['title'], str(e))
+            ui.notify(f'Error during sync: {str(e)}', type='negative')
+        finally:
+            # Reset button state and refresh the grid
+            sync_button.props('loading=false')
+            refresh_callback()
     
     return handle_sync
 
@@ -67,43 +55,16 @@ def create_bulk_sync_handler(selected_articles, refresh_callback):
         sync_button = ui.button(icon='sync').props('loading=true flat round color=primary')
         
         try:
-            # Update status to Syncing for selected articles
-            conn = db.get_db_connection()
-            conn.execute("UPDATE articles SET status = 'Syncing' WHERE id IN ({})".format(
-                ','.join('?' * len(selected_articles))
-            ), list(selected_articles))
-            conn.commit()
-            conn.close()
-            
+            logger.info("Queueing bulk sync for %d articles", len(selected_articles))
+            # Workers hold the database lock while claiming; keep these calls off the UI event loop
+            loop = asyncio.get_event_loop()
+            articles = await loop.run_in_executor(None, get_articles, list(selected_articles))
+            await refresh_indexes(articles)
+            jobs = await loop.run_in_executor(None, enqueue_jobs, [article['id'] for article in articles], TRIGGER_BULK)
             refresh_callback()
-            logger.info(f"Starting bulk sync for {len(selected_articles)} articles")
-
-            # Sync each article
-            for article_id in selected_articles:
-                article = db.get_db_connection().execute(
-                    'SELECT * FROM articles WHERE id = ?', (article_id,)
-                ).fetchone()
-                
-                if article:
-                    success, message = await run_sync_async(
-                        article_id=article['article_id'],
-                        source_url=article['source_url'],
-                        title=article['title']
-                    )
-                    ui.notify(message, type='positive' if success else 'negative')
-                    
-                    # Update status
-                    conn = db.get_db_connection()
-                    new_status = 'Success' if success else 'Failed'
-                    last_synced_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    conn.execute(
-                        "UPDATE articles SET status = ?, last_synced = ? WHERE id = ?",
-                        (new_status, last_synced_time, article_id)
-                    )
-                    conn.commit()
-                    conn.close()
 
-            ui.notify(f'Successfully synced {len(selected_articles)} articles', type='positive')
+            result = await wait_for_jobs(jobs.values())
+            ui.notify(result.summary(), type='positive' if result.success else 'warning')
         except Exception as e:
             ui.notify(f'Error during bulk sync: {str(e)}', type='negative')
         finally:
@@ -15,6 +15,7 @@ def index_page():
         title_input = ui.input('Article Title').props('outlined').classes('w-full')
         source_url_input = ui.input('Source Content URL').props('outlined').classes('w-full')
         zendesk_id_input = ui.input('Zendesk Article ID').props('outlined').classes('w-full')
+        locales_input = ui.input('Locales (comma separated, empty = default locale)').props('outlined').classes('w-full')
 
         async def save_article():
             title = title_input.value
@@ -27,8 +28,8 @@ def index_page():
             
             conn = db.get_db_connection()
             conn.execute(
-                'INSERT INTO articles (title, source_url, article_id) VALUES (?, ?, ?)',
-                (title, url, zid)
+                'INSERT INTO articles (title, source_url, article_id, locales) VALUES (?, ?, ?, ?)',
+                (title, url, zid, ', '.join(db.parse_locales(locales_input.value)) or None)
             )
             conn.commit()
             conn.close()
@@ -38,6 +39,7 @@ def index_page():
             title_input.value = ''
             source_url_input.value = ''
             zendesk_id_input.value = ''
+            locales_input.value = ''
             
             # Navigate to the list page to see the new entry
             # ui.open('/list')
@@ -0,0 +1,89 @@
+import aiohttp
+import xml.etree.ElementTree as ET
+from nicegui import ui
+import syncapp.config.database as db
+from syncapp.core.discovery import discover_pages
+from syncapp.webui.pages.header import header
+from syncapp.loggers.log_cli import setup_logger
+
+logger = setup_logger(__name__)
+
+# -----------------
+# Page 5: Discover Articles
+# -----------------
+@ui.page('/discover')
+def discover_page():
+    header()
+
+    with ui.card().classes('w-full max-w-7xl mx-auto mt-8'):
+        ui.label('Discover Source Pages').classes('text-h6')
+        ui.label(
+            'Enter a sitemap.xml URL or a docs root URL. Fill in the Zendesk article ID of the pages to add, '
+            'select them and register them in one go.'
+        ).classes('text-sm text-gray-500')
+
+        with ui.row().classes('w-full items-center gap-2'):
+            url_input = ui.input('Sitemap or root URL').props('outlined').classes('flex-grow')
+            discover_button = ui.button('Discover', icon='travel_explore').props('color=primary')
+        status_label = ui.label('').classes('text-sm text-gray-500')
+
+        grid = ui.aggrid({
+            'columnDefs': [
+                {'field': 'title', 'headerName': 'Title', 'editable': True,
+                 'checkboxSelection': True, 'headerCheckboxSelection': True},
+                {'field': 'url', 'headerName': 'Source URL'},
+                {'field': 'lastmod', 'headerName': 'Last Modified'},
+                {'field': 'article_id', 'headerName': 'Zendesk Article ID', 'editable': True},
+            ],
+            'rowData': [],
+            'rowSelection': 'multiple',
+            'stopEditingWhenCellsLoseFocus': True,
+        }).classes('w-full h-96')
+
+        async def discover():
+            url = url_input.value.strip()
+            if not url:
+                ui.notify('Enter a sitemap or root URL', type='negative')
+                return
+            discover_button.disable()
+            status_label.text = f'Discovering pages from {url}...'
+            try:
+                pages = await discover_pages(url)
+            except (aiohttp.ClientError, TimeoutError, ET.ParseError) as e:
+                logger.error("Discovery from %s failed: %s", url, str(e))
+                ui.notify(f'Discovery failed: {str(e)}', type='negative')
+                status_label.text = ''
+                return
+            finally:
+                discover_button.enable()
+
+            registered = db.get_registered_source_urls()
+            new_pages = [page for page in pages if page.url not in registered]
+            grid.options['rowData'] = [
+                {'title': page.title, 'url': page.url, 'lastmod': page.lastmod or '', 'article_id': ''}
+                for page in new_pages
+            ]
+            grid.update()
+            status_label.text = (f'Found {len(pages)} pages, {len(pages) - len(new_pages)} of them already registered')
+
+        async def register_selected():
+            selected_urls = {row['url'] for row in await grid.get_selected_rows()}
+            if not selected_urls:
+                ui.notify('No pages selected', type='warning')
+                return
+            # Edited cells only live in the browser, so read the rows back from there
+            rows = [row for row in await grid.get_client_data() if row['url'] in selected_urls]
+            missing = [row['url'] for row in rows if not str(row.get('article_id') or '').strip()]
+            if missing:
+                ui.notify(f'{len(missing)} selected pages have no Zendesk article ID', type='negative')
+                return
+
+            count = db.insert_articles([
+                (row['title'].strip() or row['url'], row['url'], str(row['article_id']).strip()) for row in rows
+            ])
+            grid.options['rowData'] = [row for row in await grid.get_client_data() if row['url'] not in selected_urls]
+            grid.update()
+            ui.notify(f'Registered {count} articles', type='positive')
+
+        discover_button.on_click(discover)
+        ui.button('Register Selected', icon='playlist_add', on_click=register_selected).props('color=primary')
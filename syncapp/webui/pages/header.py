@@ -7,5 +7,6 @@ def header():
         ui.space()
         ui.link('Add Article', '/').classes('text-white')
         ui.link('View List', '/list').classes('text-white')
+        ui.link('Discover', '/discover').classes('text-white')
         ui.link('Settings', '/settings').classes('text-white')
         ui.link('Logs', '/logs').classes('text-white')
\ No newline at end of file
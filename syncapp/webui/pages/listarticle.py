@@ -1,7 +1,9 @@
 import syncapp.config.database as db
-from datetime import datetime
+from datetime import datetime, timedelta
 from nicegui import ui
 from syncapp.webui.pages.header import header
+from syncapp.backend.sync_runnerv2 import get_locale_statuses
+from syncapp.backend.sync_auto_run import get_dispatch_cap, get_load_histogram
 from syncapp.loggers.log_cli import setup_logger
 from syncapp.webui.handlers.sync_handler import create_sync_handler, create_bulk_sync_handler
 from syncapp.webui.handlers.edit_handler import create_edit_handler
@@ -49,6 +51,7 @@ def list_page():
     @ui.refreshable
     def article_grid():
         articles = db.get_db_connection().execute('SELECT * FROM articles ORDER BY id DESC').fetchall()
+        all_locale_statuses = get_locale_statuses()
         
         if not articles:
             with ui.card().classes('w-full max-w-3xl mx-auto'):
@@ -74,10 +77,13 @@ def list_page():
                 with ui.link(target=article['source_url']).classes('col-span-1'):
                     ui.label(article['source_url'][:30] + '...').classes('text-blue-500 cursor-pointer truncate')
                 ui.label(article['article_id']).classes('truncate')
-                ui.label(article['status']).classes(f"p-1 rounded text-white {'bg-green-500' if article['status'] == 'Success' else 'bg-red-500' if article['status'] == 'Failed' else 'bg-yellow-500' if article['status'] == 'Syncing' else 'bg-gray-400'}")
+                status_label = ui.label(article['status']).classes(f"p-1 rounded text-white {'bg-green-500' if article['status'] == 'Success' else 'bg-teal-500' if article['status'] == 'Unchanged' else 'bg-red-500' if article['status'] == 'Failed' else 'bg-yellow-500' if article['status'] == 'Syncing' else 'bg-blue-400' if article['status'] == 'Queued' else 'bg-gray-400'}")
+                locale_statuses = all_locale_statuses.get(article['article_id'])
+                if locale_statuses:
+                    status_label.tooltip(', '.join(f"{locale}: {status}" for locale, status in locale_statuses.items()))
                 ui.label(article['last_synced'] or 'Never').classes('truncate')
                 article_dict = dict(article)
-                ui.label(format_cron_schedule(article_dict.get('cron_schedule'))).classes('truncate')
+                ui.label(format_cron_schedule(article_dict.get('cron_schedule'), article_dict.get('next_run_at'))).classes('truncate')
                 with ui.row().classes('gap-2'):
                     sync_button = ui.button(icon='sync').props('flat round color=primary')
                     sync_button.on_click(create_sync_handler(article, article_grid.refresh, sync_button))
@@ -88,3 +94,28 @@ def list_page():
     # Initial drawing of the grid
     article_grid()
 
+    # Projected scheduled syncs per minute, to spot runs bunching up in the same minute
+    with ui.expansion('Scheduled load (next 24 hours)', icon='bar_chart').classes('w-full max-w-7xl mx-auto mt-4'):
+        @ui.refreshable
+        def load_chart():
+            start, counts = get_load_histogram()
+            if not any(counts):
+                ui.label('No scheduled articles.')
+                return
+            busiest = max(range(len(counts)), key=counts.__getitem__)
+            labels = [(start + timedelta(minutes=minute)).strftime('%H:%M') for minute in range(len(counts))]
+            ui.label(
+                f"Busiest minute: {labels[busiest]} with {counts[busiest]} syncs | "
+                f"at most {get_dispatch_cap()} are queued per minute"
+            ).classes('text-sm text-gray-500')
+            ui.echart({
+                'tooltip': {'trigger': 'axis'},
+                'xAxis': {'type': 'category', 'data': labels},
+                'yAxis': {'type': 'value', 'name': 'Syncs per minute'},
+                'dataZoom': [{'type': 'inside'}, {'type': 'slider'}],
+                'series': [{'type': 'bar', 'data': counts}],
+            }).classes('w-full h-64')
+
+        load_chart()
+        ui.button('Refresh', icon='refresh', on_click=load_chart.refresh).props('flat')
+
@@ -2,6 +2,17 @@ from nicegui import ui
 from syncapp.webui.pages.header import header
 from syncapp.config.settings import ensure_settings_file, load_settings, save_settings_to_file
 from syncapp.loggers.log_cli import setup_logger
+from syncapp.core.driver_pool import DEFAULT_POOL_SIZE, DEFAULT_MAX_PAGES_PER_DRIVER, get_driver_pool_stats
+from syncapp.core.readiness import DEFAULT_READY_TIMEOUT, get_readiness_stats
+from syncapp.core.fetcher import get_fetch_path_stats
+from syncapp.core.parsers import PARSER_AUTO, available_parsers
+from syncapp.core.clean_pool import DEFAULT_CLEAN_PROCESSES
+from syncapp.backend.bulk_sync import DEFAULT_BULK_CONCURRENCY
+from syncapp.backend.sync_auto_run import (
+    DEFAULT_DISPATCH_CAP, DEFAULT_SPREAD_MINUTES, get_scheduler_leader, respread_schedules
+)
+from syncapp.core.zendesk import DEFAULT_VERIFY_AUDIT_EVERY, get_zendesk_stats
+from syncapp.core.mermaid import DEFAULT_FORMAT, FORMAT_PNG, FORMAT_SVG, get_mermaid_stats
 
 #------------ logger ------------
 logger = setup_logger(__name__)
@@ -14,6 +25,16 @@ load_settings()
 
 settings = load_settings()
 
+# Stats are counted in memory by the process that syncs; a worker process's are not visible here
+WORKER_STATS_NOTE = 'Stats not available: syncs run in separate workers'
+
+def workers_stats_note(current_settings):
+    """Shows the note instead of a stats panel and returns True when syncs run in separate workers."""
+    if not current_settings.get("SEPARATE_WORKERS", False):
+        return False
+    ui.label(WORKER_STATS_NOTE).classes('text-sm text-gray-500 mb-4')
+    return True
+
 # -----------------
 # Page 3: Settings
 # -----------------
@@ -28,20 +49,118 @@ def settings_page():
         email = ui.input('Email', value=current_settings.get("EMAIL", "")).props('outlined')
         api_token = ui.input('API Token', value=current_settings.get("API_TOKEN", ""),password=True).classes('mb-4').props('outlined')
         locale = ui.input('Locale', value=current_settings.get("LOCAL", "en-us")).props('outlined')
+        verify_audit_every = ui.number('Re-read 1 in N updates with a separate GET (0 = never)',
+                                       value=current_settings.get("VERIFY_AUDIT_EVERY", DEFAULT_VERIFY_AUDIT_EVERY),
+                                       min=0, precision=0).props('outlined')
+        if not workers_stats_note(current_settings):
+            for domain, zendesk_stats in get_zendesk_stats().items():
+                ui.label(
+                    f"{domain}: {zendesk_stats['requests']} requests | throttled {zendesk_stats['throttled']} | "
+                    f"retries {zendesk_stats['retries']} | paused {zendesk_stats['paused_seconds']}s | "
+                    f"concurrency {zendesk_stats['concurrency']} | limit {zendesk_stats['rate_per_minute']}/min"
+                ).classes('text-sm text-gray-500')
+
+        ui.label('Browser Pool (applies after restart)').classes('text-subtitle2 mt-4')
+        pool_size = ui.number('Warm browsers', value=current_settings.get("DRIVER_POOL_SIZE", DEFAULT_POOL_SIZE),
+                              min=1, precision=0).props('outlined')
+        max_pages = ui.number('Pages per browser before recycle',
+                              value=current_settings.get("DRIVER_MAX_PAGES", DEFAULT_MAX_PAGES_PER_DRIVER),
+                              min=1, precision=0).props('outlined')
+        pool_stats = {} if workers_stats_note(current_settings) else get_driver_pool_stats()
+        if pool_stats:
+            ui.label(
+                f"Live: {pool_stats['live']} | Idle: {pool_stats['idle']} | Hits: {pool_stats['hits']} | "
+                f"Misses: {pool_stats['misses']} | Recycled: {pool_stats['recycled']} | Crashed: {pool_stats['crashed']}"
+            ).classes('text-sm text-gray-500 mb-4')
+
+        ready_timeout = ui.number('Page ready timeout (seconds)',
+                                  value=current_settings.get("PAGE_READY_TIMEOUT", DEFAULT_READY_TIMEOUT),
+                                  min=1).props('outlined')
+        if not workers_stats_note(current_settings):
+            for host, host_stats in get_readiness_stats().items():
+                ui.label(
+                    f"{host}: ready p50 {host_stats['p50']}s | p95 {host_stats['p95']}s | "
+                    f"max {host_stats['max']}s | timeouts {host_stats['timeouts']}"
+                ).classes('text-sm text-gray-500')
+
+        html_parser = ui.select(
+            [PARSER_AUTO] + available_parsers(),
+            value=current_settings.get("HTML_PARSER", PARSER_AUTO),
+            label='HTML parser ("auto" uses lxml when installed)'
+        ).props('outlined')
+        clean_processes = ui.number('Cleaning processes (0 = clean in a thread, applies after restart)',
+                                    value=current_settings.get("CLEAN_PROCESSES", DEFAULT_CLEAN_PROCESSES),
+                                    min=0, precision=0).props('outlined')
+        bulk_concurrency = ui.number('Articles synced at once in bulk and scheduled syncs',
+                                     value=current_settings.get("BULK_CONCURRENCY", DEFAULT_BULK_CONCURRENCY),
+                                     min=1, precision=0).props('outlined')
+        separate_workers = ui.switch('Run syncs in separate "syncapp worker" processes (applies after restart)',
+                                     value=bool(current_settings.get("SEPARATE_WORKERS", False)))
+        spread_minutes = ui.number('Spread scheduled runs over (minutes, 0 = run at the scheduled time)',
+                                   value=current_settings.get("SCHEDULE_SPREAD_MINUTES", DEFAULT_SPREAD_MINUTES),
+                                   min=0, precision=0).props('outlined')
+        dispatch_cap = ui.number('Scheduled syncs queued per minute at most',
+                                 value=current_settings.get("SCHEDULE_DISPATCH_CAP", DEFAULT_DISPATCH_CAP),
+                                 min=1, precision=0).props('outlined')
+        leader = get_scheduler_leader()
+        ui.label(
+            f"Active scheduler: {leader['owner']} since {leader['acquired_at']} (lease expires in {leader['expires_in']}s)"
+            if leader else "Active scheduler: none"
+        ).classes('text-sm text-gray-500 mb-4')
+        js_only_hosts = ui.input(
+            'JS-only hosts (comma separated, always rendered in Chrome)',
+            value=', '.join(current_settings.get("JS_ONLY_HOSTS", []))
+        ).props('outlined')
+        if not workers_stats_note(current_settings):
+            path_stats = get_fetch_path_stats()
+            ui.label(
+                f"Static fetches: {path_stats['static']['count']} (avg {path_stats['static']['avg_seconds']}s) | "
+                f"Browser fetches: {path_stats['browser']['count']} (avg {path_stats['browser']['avg_seconds']}s) | "
+                f"Static fallbacks: {path_stats['static_fallbacks']}"
+            ).classes('text-sm text-gray-500 mb-4')
 
+        mermaid_format = ui.select(
+            [FORMAT_SVG, FORMAT_PNG],
+            value=current_settings.get("MERMAID_FORMAT", DEFAULT_FORMAT),
+            label='Mermaid diagram format'
+        ).props('outlined')
+        if not workers_stats_note(current_settings):
+            mermaid_stats = get_mermaid_stats()
+            ui.label(
+                f"Diagrams rendered: {mermaid_stats['rendered']} | From cache: {mermaid_stats['cache_hits']} | "
+                f"Failed: {mermaid_stats['failed']}"
+            ).classes('text-sm text-gray-500 mb-4')
 
         async def save_settings():
             if not all([zendesk_domain.value, email.value, api_token.value, locale.value]):
                 ui.notify('All fields are required!', type='negative')
                 return
             
-            settings.update({
+            # The loaded settings are read-only; keep unknown keys and overwrite the edited ones
+            new_settings = dict(load_settings())
+            old_spread = new_settings.get("SCHEDULE_SPREAD_MINUTES", DEFAULT_SPREAD_MINUTES)
+            new_settings.update({
                 "ZENDESK_DOMAIN": zendesk_domain.value,
                 "EMAIL": email.value,
                 "API_TOKEN": api_token.value,
                 "LOCAL": locale.value,
+                "DRIVER_POOL_SIZE": int(pool_size.value or DEFAULT_POOL_SIZE),
+                "DRIVER_MAX_PAGES": int(max_pages.value or DEFAULT_MAX_PAGES_PER_DRIVER),
+                "PAGE_READY_TIMEOUT": float(ready_timeout.value or DEFAULT_READY_TIMEOUT),
+                "HTML_PARSER": html_parser.value,
+                "CLEAN_PROCESSES": int(clean_processes.value if clean_processes.value is not None else DEFAULT_CLEAN_PROCESSES),
+                "BULK_CONCURRENCY": int(bulk_concurrency.value or DEFAULT_BULK_CONCURRENCY),
+                "SEPARATE_WORKERS": bool(separate_workers.value),
+                "SCHEDULE_SPREAD_MINUTES": int(spread_minutes.value or 0),
+                "SCHEDULE_DISPATCH_CAP": int(dispatch_cap.value or DEFAULT_DISPATCH_CAP),
+                "VERIFY_AUDIT_EVERY": int(verify_audit_every.value or 0),
+                "MERMAID_FORMAT": mermaid_format.value,
+                "JS_ONLY_HOSTS": [host.strip() for host in js_only_hosts.value.split(',') if host.strip()],
             })
-            save_settings_to_file(settings)
+            save_settings_to_file(new_settings)
+            if new_settings["SCHEDULE_SPREAD_MINUTES"] != old_spread:
+                # Move upcoming runs into their slots of the new window
+                respread_schedules()
             ui.notify(f"Settings saved successfully!", type='positive')
             
             # Clear inputs
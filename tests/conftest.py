@@ -0,0 +1,28 @@
+import os
+import tempfile
+import pytest
+
+# syncapp creates and reads its config directory at import time; keep the tests away from the real one
+os.environ["SYNCAPP_CONFIG_DIR"] = tempfile.mkdtemp(prefix="syncapp-tests-")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh articles.db for one test; returns a function that inserts an article and returns its id."""
+    import syncapp.config.database as db
+    monkeypatch.setattr(db, "DB_FILE", tmp_path / "articles.db")
+    db.init_db()
+
+    def add_article(title="Article", cron_schedule=None, next_run_at=None):
+        conn = db.get_db_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO articles (title, source_url, article_id, cron_schedule, next_run_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (title, f"https://docs.example.com/{title}", "1", cron_schedule, next_run_at)
+                )
+            return cursor.lastrowid
+        finally:
+            conn.close()
+    return add_article
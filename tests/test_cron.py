@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+import pytest
+from syncapp.utils.cron import CronError, CronSchedule, next_run_after, validate_cron
+
+# A Monday
+START = datetime(2025, 3, 10, 8, 30, 15)
+
+
+def _fire_times(expression, after=START, count=5):
+    schedule, times = CronSchedule(expression), []
+    for _ in range(count):
+        after = schedule.next_after(after)
+        times.append(after)
+    return times
+
+
+def test_steps():
+    assert _fire_times("0 */15 * * * *", count=3) == [
+        datetime(2025, 3, 10, 8, 45), datetime(2025, 3, 10, 9, 0), datetime(2025, 3, 10, 9, 15)
+    ]
+    # "5/20" runs from 5 to the end of the range
+    assert _fire_times("0 5/20 * * * *", count=3) == [
+        datetime(2025, 3, 10, 8, 45), datetime(2025, 3, 10, 9, 5), datetime(2025, 3, 10, 9, 25)
+    ]
+
+
+def test_ranges_and_lists():
+    assert _fire_times("0 0 9-10,17 * * *", count=4) == [
+        datetime(2025, 3, 10, 9), datetime(2025, 3, 10, 10), datetime(2025, 3, 10, 17), datetime(2025, 3, 11, 9)
+    ]
+    assert _fire_times("0 0 0-12/6 * * *", count=3) == [
+        datetime(2025, 3, 10, 12), datetime(2025, 3, 11, 0), datetime(2025, 3, 11, 6)
+    ]
+
+
+def test_month_and_weekday_names():
+    assert _fire_times("0 0 12 * jun-aug sat", count=2) == [datetime(2025, 6, 7, 12), datetime(2025, 6, 14, 12)]
+    assert CronSchedule("0 0 12 * JUN-AUG SAT").next_after(START) == datetime(2025, 6, 7, 12)
+
+
+def test_weekday_zero_and_seven_are_sunday():
+    sunday = datetime(2025, 3, 16, 6)
+    assert CronSchedule("0 0 6 * * 0").next_after(START) == sunday
+    assert CronSchedule("0 0 6 * * 7").next_after(START) == sunday
+    assert CronSchedule("0 0 6 * * sun").next_after(START) == sunday
+    # Friday through Sunday
+    assert _fire_times("0 0 6 * * 5-7", count=3) == [
+        datetime(2025, 3, 14, 6), datetime(2025, 3, 15, 6), sunday
+    ]
+
+
+def test_day_or_weekday_when_both_are_restricted():
+    # The 13th, or any Friday
+    assert _fire_times("0 0 0 13 * fri", count=4) == [
+        datetime(2025, 3, 13), datetime(2025, 3, 14), datetime(2025, 3, 21), datetime(2025, 3, 28)
+    ]
+    # With the weekday unrestricted only the day counts
+    assert _fire_times("0 0 0 13 * *", count=2) == [datetime(2025, 3, 13), datetime(2025, 4, 13)]
+    # "*/1" still counts as unrestricted
+    assert _fire_times("0 0 0 13 * */1", count=2) == [datetime(2025, 3, 13), datetime(2025, 4, 13)]
+
+
+def test_seconds_field():
+    assert _fire_times("*/20 * * * * *", count=3) == [
+        datetime(2025, 3, 10, 8, 30, 20), datetime(2025, 3, 10, 8, 30, 40), datetime(2025, 3, 10, 8, 31)
+    ]
+    # Five fields fire at second 0
+    assert CronSchedule("30 8 * * *").expression == "0 30 8 * * *"
+    assert CronSchedule("30 8 * * *").next_after(START) == datetime(2025, 3, 11, 8, 30)
+
+
+def test_next_after_is_strictly_after():
+    fire = datetime(2025, 3, 10, 9)
+    assert CronSchedule("0 0 9 * * *").next_after(fire) == datetime(2025, 3, 11, 9)
+    assert CronSchedule("0 0 9 * * *").next_after(fire - timedelta(microseconds=1)) == fire
+
+
+def test_february_29():
+    assert _fire_times("0 0 0 29 2 *", count=3) == [datetime(2028, 2, 29), datetime(2032, 2, 29), datetime(2036, 2, 29)]
+    # 2100 is not a leap year
+    assert CronSchedule("0 0 0 29 2 *").next_after(datetime(2096, 3, 1)) == datetime(2104, 2, 29)
+
+
+def test_schedule_that_never_fires():
+    assert CronSchedule("0 0 0 31 2 *").next_after(START) is None
+    assert next_run_after("0 0 0 31 2 *", START) is None
+    with pytest.raises(CronError):
+        validate_cron("0 0 0 31 2 *")
+
+
+@pytest.mark.parametrize("expression", ["", "* * *", "0 60 * * * *", "0 0 0 * 13 *", "0 0 0 * * 8",
+                                        "0 */0 * * * *", "0 0 5-1 * * *", "0 0 0 * foo *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(CronError):
+        validate_cron(expression)
+    assert next_run_after(expression, START) is None
+
+
+@pytest.mark.parametrize("expression", ["0 */7 */5 * * *", "0 10 4 1-7 * mon", "0 0 12 */10 mar,apr *",
+                                        "0 45 23 10-12 * *", "0 59 23 * * sat,sun", "0 0 */6 29-31 * *"])
+def test_matches_a_scan_over_every_minute(expression):
+    schedule, moment = CronSchedule(expression), START
+    for _ in range(3):
+        expected = moment.replace(second=0) + timedelta(minutes=1)
+        while not schedule.matches(expected):
+            expected += timedelta(minutes=1)
+        assert schedule.next_after(moment) == expected
+        moment = expected
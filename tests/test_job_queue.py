@@ -0,0 +1,91 @@
+import syncapp.config.database as db
+from syncapp.backend import job_queue
+from syncapp.backend.job_queue import (
+    JOB_FAILED, JOB_RUNNING, TRIGGER_BULK, TRIGGER_MANUAL, claim_job, enqueue_jobs, get_jobs,
+    renew_lease
+)
+
+
+def _article_status(article_row_id):
+    conn = db.get_db_connection()
+    try:
+        return conn.execute("SELECT status FROM articles WHERE id = ?", (article_row_id,)).fetchone()['status']
+    finally:
+        conn.close()
+
+
+def test_active_article_keeps_its_job(database):
+    article = database()
+    first = enqueue_jobs([article], TRIGGER_MANUAL)
+    second = enqueue_jobs([article, article], TRIGGER_BULK)
+
+    assert first == second
+    assert get_jobs(list(first.values()))[first[article]]['trigger'] == TRIGGER_MANUAL
+    assert _article_status(article) == 'Queued'
+
+    # Once the job is running the article still has it
+    claim_job("worker-a")
+    assert enqueue_jobs([article], TRIGGER_BULK) == first
+
+
+def test_claim_takes_the_oldest_job_and_counts_attempts(database):
+    articles = [database(f"a{number}") for number in range(3)]
+    jobs = enqueue_jobs(articles, TRIGGER_BULK)
+
+    claimed = [claim_job("worker-a")['id'] for _ in articles]
+    assert claimed == [jobs[article] for article in articles]
+    assert claim_job("worker-a") is None
+
+    rows = get_jobs(claimed)
+    assert all(row['state'] == JOB_RUNNING and row['attempts'] == 1 for row in rows.values())
+    assert all(_article_status(article) == 'Syncing' for article in articles)
+
+
+def test_expired_job_is_requeued_then_failed(database, monkeypatch):
+    monkeypatch.setattr(job_queue, "MAX_ATTEMPTS", 2)
+    article = database()
+    job_id = enqueue_jobs([article], TRIGGER_MANUAL)[article]
+
+    # A negative lease has already expired, as if the worker died right after claiming
+    assert claim_job("worker-a", lease_seconds=-1)['id'] == job_id
+    assert claim_job("worker-b", lease_seconds=-1)['id'] == job_id
+    job = get_jobs([job_id])[job_id]
+    assert (job['attempts'], job['lease_owner']) == (2, "worker-b")
+
+    assert claim_job("worker-c") is None
+    job = get_jobs([job_id])[job_id]
+    assert job['state'] == JOB_FAILED
+    assert job['lease_owner'] is None
+    assert _article_status(article) == 'Failed'
+
+
+def test_expired_job_below_max_attempts_is_queued_again(database):
+    first, second = database("first"), database("second")
+    jobs = enqueue_jobs([first], TRIGGER_MANUAL)
+    claim_job("worker-a", lease_seconds=-1)
+    enqueue_jobs([second], TRIGGER_MANUAL)
+
+    # The recovered job is older, so it is claimed again before the new one
+    assert claim_job("worker-b")['id'] == jobs[first]
+    assert get_jobs([jobs[first]])[jobs[first]]['attempts'] == 2
+
+
+def test_renew_lease_fails_once_the_lease_is_lost(database):
+    article = database()
+    job_id = enqueue_jobs([article], TRIGGER_MANUAL)[article]
+    claim_job("worker-a", lease_seconds=-1)
+
+    # worker-a stalled past its lease and worker-b took the job over
+    assert claim_job("worker-b")['id'] == job_id
+    assert not renew_lease(job_id, "worker-a")
+    assert renew_lease(job_id, "worker-b")
+
+
+def test_renew_lease_keeps_a_job_from_being_taken_over(database):
+    article = database()
+    job_id = enqueue_jobs([article], TRIGGER_MANUAL)[article]
+    claim_job("worker-a", lease_seconds=-1)
+
+    assert renew_lease(job_id, "worker-a")
+    assert claim_job("worker-b") is None
+    assert get_jobs([job_id])[job_id]['lease_owner'] == "worker-a"
@@ -0,0 +1,24 @@
+from syncapp.core.mermaid import diagram_source
+from syncapp.core.parsers import parse_html
+
+
+def test_diagram_source_keeps_docusaurus_token_lines_apart():
+    block = parse_html(
+        '<div class="language-mermaid"><pre><code>'
+        '<span class="token-line"><span class="token plain">graph TD</span><br></span>'
+        '<span class="token-line"><span class="token plain">  A[Client] --&gt; B[Router]</span><br></span>'
+        '<span class="token-line"><span class="token plain">  B --&gt; C</span><br></span>'
+        '</code></pre></div>', "html.parser"
+    ).div
+    assert diagram_source(block) == "graph TD\n  A[Client] --> B[Router]\n  B --> C"
+
+
+def test_diagram_source_turns_br_into_line_breaks():
+    block = parse_html('<pre class="mermaid">sequenceDiagram<br>  A-&gt;&gt;B: hi<br/>  B--&gt;&gt;A: ok</pre>',
+                       "html.parser").pre
+    assert diagram_source(block) == "sequenceDiagram\n  A->>B: hi\n  B-->>A: ok"
+
+
+def test_diagram_source_keeps_plain_newlines():
+    block = parse_html('<pre class="mermaid">\ngraph LR\n  A --> B\n</pre>', "html.parser").pre
+    assert diagram_source(block) == "graph LR\n  A --> B"
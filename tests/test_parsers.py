@@ -0,0 +1,50 @@
+"""
+Equivalence of the HTML parser backends on the fixture pages.
+
+Every installed backend must clean a page to the same HTML as the reference
+html.parser, once these known differences are normalized:
+
+- html5lib inserts the <tbody> a <table> implies; lxml and html.parser do not.
+- html.parser and lxml lowercase SVG tag and attribute names
+  (viewBox -> viewbox); html5lib keeps their case. Browsers treat both the same.
+
+html.parser also does not imply optional end tags (an unclosed <li> nests
+the next one), so the fixtures, like Docusaurus output, close every tag.
+"""
+from pathlib import Path
+import pytest
+from bs4 import BeautifulSoup
+from syncapp.core.fetcher import clean_page
+from syncapp.core.parsers import PARSER_BACKENDS, available_parsers
+from syncapp.utils.hashing import canonicalize_html
+
+REFERENCE_PARSER = "html.parser"
+PAGES = sorted((Path(__file__).parent / "fixtures" / "pages").glob("*.html"))
+
+
+def normalize(html):
+    """Removes the known backend differences; canonicalize_html lowercases names and sorts attributes."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tbody in soup.find_all("tbody"):
+        tbody.unwrap()
+    return canonicalize_html(str(soup))
+
+
+@pytest.mark.parametrize("backend", PARSER_BACKENDS)
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_backends_clean_to_equivalent_output(page, backend):
+    if backend not in available_parsers():
+        pytest.skip(f"{backend} is not installed")
+    source = page.read_text(encoding="utf-8")
+    assert normalize(clean_page(source, backend)) == normalize(clean_page(source, REFERENCE_PARSER))
+
+
+def test_known_differences_are_normalized():
+    if "html5lib" not in available_parsers():
+        pytest.skip("html5lib is not installed")
+    source = (Path(__file__).parent / "fixtures" / "pages" / "parser_quirks.html").read_text(encoding="utf-8")
+    html5lib_output = clean_page(source, "html5lib")
+    reference_output = clean_page(source, REFERENCE_PARSER)
+    # Without normalizing, the outputs do differ; the fixture keeps exercising both quirks
+    assert "<tbody>" in html5lib_output and "<tbody>" not in reference_output
+    assert "viewBox" in html5lib_output and "viewbox" in reference_output
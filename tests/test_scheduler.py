@@ -0,0 +1,193 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+import syncapp.config.database as db
+from syncapp.backend import sync_auto_run
+from syncapp.backend.job_queue import TRIGGER_SCHEDULE
+from syncapp.backend.sync_auto_run import (
+    Scheduler, _claim_due, acquire_leadership, get_scheduler_leader, release_leadership, respread_schedules,
+    spread_offset
+)
+
+HOURLY = "0 0 * * * *"
+NOW = datetime(2025, 3, 10, 8, 30)
+
+
+class FakeClock:
+    """Stands in for both datetime.now() and the time module of sync_auto_run."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def advance(self, **delta):
+        self.now += timedelta(**delta)
+
+    def time(self):
+        return self.now.timestamp()
+
+    def monotonic(self):
+        return self.now.timestamp()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock(NOW)
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now
+
+    monkeypatch.setattr(sync_auto_run, "datetime", FakeDatetime)
+    monkeypatch.setattr(sync_auto_run, "time", clock)
+    monkeypatch.setattr(sync_auto_run, "get_spread_seconds", lambda: 0)
+    return clock
+
+
+def _next_run_at(article_id):
+    conn = db.get_db_connection()
+    try:
+        return conn.execute("SELECT next_run_at FROM articles WHERE id = ?", (article_id,)).fetchone()['next_run_at']
+    finally:
+        conn.close()
+
+
+def _queued_articles():
+    conn = db.get_db_connection()
+    try:
+        return {row['article_row_id'] for row in conn.execute(
+            "SELECT article_row_id FROM sync_jobs WHERE trigger = ?", (TRIGGER_SCHEDULE,)
+        )}
+    finally:
+        conn.close()
+
+
+def test_racing_claims_advance_the_run_once(database, clock, monkeypatch):
+    article = database(cron_schedule=HOURLY, next_run_at="2025-03-10 08:00:00")
+    next_spread_run = sync_auto_run.next_spread_run
+    rival = {}
+
+    def claim_in_between(*args):
+        # The other scheduler claims after this one read the row but before it updates it
+        if "claimed" not in rival:
+            # Set first so the rival's own call goes straight through
+            rival["claimed"] = []
+            rival["claimed"] = _claim_due([article], clock.now)
+        return next_spread_run(*args)
+
+    monkeypatch.setattr(sync_auto_run, "next_spread_run", claim_in_between)
+    claimed = _claim_due([article], clock.now)
+
+    assert [row['id'] for row in rival["claimed"]] == [article]
+    assert claimed == []
+    assert _next_run_at(article) == "2025-03-10 09:00:00"
+
+
+def test_missed_runs_are_caught_up_once(database, clock):
+    # Five hourly runs were missed while the app was stopped
+    article = database(cron_schedule=HOURLY, next_run_at="2025-03-10 03:00:00")
+
+    assert [row['id'] for row in _claim_due([article], clock.now)] == [article]
+    assert _next_run_at(article) == "2025-03-10 09:00:00"
+    assert _claim_due([article], clock.now) == []
+
+
+def test_scheduler_queues_a_missed_run_once(database, clock, monkeypatch):
+    article = database(cron_schedule=HOURLY, next_run_at="2025-03-10 03:00:00")
+    queued = []
+
+    async def no_refresh(articles):
+        pass
+
+    def enqueue(article_ids, trigger, dispatched_by=None):
+        # The real queue would hand back the job still queued from the first run
+        queued.append((list(article_ids), trigger))
+        return dict.fromkeys(article_ids, len(queued))
+
+    monkeypatch.setattr(sync_auto_run, "refresh_indexes", no_refresh)
+    monkeypatch.setattr(sync_auto_run, "enqueue_jobs", enqueue)
+
+    async def run():
+        scheduler = Scheduler(instance_id="scheduler-a")
+        await scheduler._reload()
+        await scheduler._dispatch(clock.now)
+        await scheduler._dispatch(clock.now)
+        clock.advance(minutes=30)
+        await scheduler._dispatch(clock.now)
+
+    asyncio.run(run())
+    assert queued == [([article], TRIGGER_SCHEDULE), ([article], TRIGGER_SCHEDULE)]
+    assert _next_run_at(article) == "2025-03-10 10:00:00"
+
+
+def test_dispatch_cap_holds_the_rest_until_the_next_tick(database, clock, monkeypatch):
+    articles = [database(f"a{number}", cron_schedule=HOURLY, next_run_at="2025-03-10 08:00:00") for number in range(3)]
+    queued = []
+
+    async def no_refresh(articles):
+        pass
+
+    monkeypatch.setattr(sync_auto_run, "refresh_indexes", no_refresh)
+    monkeypatch.setattr(sync_auto_run, "get_dispatch_cap", lambda: 2)
+
+    async def run():
+        scheduler = Scheduler(instance_id="scheduler-a")
+        await scheduler._reload()
+        await scheduler._dispatch(clock.now)
+        queued.append(_queued_articles())
+        clock.advance(seconds=30)
+        await scheduler._dispatch(clock.now)
+        queued.append(_queued_articles())
+        clock.advance(seconds=sync_auto_run.DISPATCH_TICK_SECONDS)
+        await scheduler._dispatch(clock.now)
+        queued.append(_queued_articles())
+
+    asyncio.run(run())
+    assert [len(articles_queued) for articles_queued in queued] == [2, 2, 3]
+    assert queued[-1] == set(articles)
+
+
+def test_respread_gives_each_schedule_a_fixed_offset(database, clock, monkeypatch):
+    monkeypatch.setattr(sync_auto_run, "get_spread_seconds", lambda: 1800)
+    articles = [database(f"a{number}", cron_schedule=HOURLY, next_run_at="2025-03-10 09:00:00")
+                for number in range(5)]
+
+    respread_schedules()
+    first = {article: _next_run_at(article) for article in articles}
+    for article in articles:
+        offset = spread_offset(article, 1800)
+        expected = datetime(2025, 3, 10, 9) + timedelta(seconds=offset)
+        assert first[article] == expected.strftime(sync_auto_run.TIMESTAMP_FORMAT)
+    assert len(set(first.values())) > 1
+
+    # Recomputing later, e.g. in another process, keeps every article in its slot
+    clock.advance(minutes=5)
+    respread_schedules()
+    assert {article: _next_run_at(article) for article in articles} == first
+
+
+def test_respread_keeps_due_runs(database, clock, monkeypatch):
+    monkeypatch.setattr(sync_auto_run, "get_spread_seconds", lambda: 1800)
+    article = database(cron_schedule=HOURLY, next_run_at="2025-03-10 08:00:00")
+
+    respread_schedules()
+    assert _next_run_at(article) == "2025-03-10 08:00:00"
+
+
+def test_leader_lease_is_taken_over_only_after_it_expires(database, clock):
+    assert acquire_leadership("scheduler-a")
+    assert not acquire_leadership("scheduler-b")
+    assert get_scheduler_leader()['owner'] == "scheduler-a"
+
+    clock.advance(seconds=sync_auto_run.LEADER_LEASE_SECONDS - 1)
+    assert acquire_leadership("scheduler-a")
+    clock.advance(seconds=sync_auto_run.LEADER_LEASE_SECONDS - 1)
+    assert not acquire_leadership("scheduler-b")
+
+    clock.advance(seconds=2)
+    assert acquire_leadership("scheduler-b")
+    assert not acquire_leadership("scheduler-a")
+
+    release_leadership("scheduler-b")
+    assert get_scheduler_leader() is None
+    assert acquire_leadership("scheduler-a")
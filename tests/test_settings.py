@@ -0,0 +1,40 @@
+import json
+import pytest
+import syncapp.config.settings as settings
+
+SAVED = {
+    "ZENDESK_DOMAIN": "example.zendesk.com",
+    "LOCAL": "en-us",
+    "JS_ONLY_HOSTS": ["docs.example.com"],
+    "PAGE_READY_TIMEOUTS": {"docs.example.com": 30, "slow.example.com": {"ready": 60, "hosts": ["a", "b"]}},
+}
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps(SAVED), encoding="utf-8")
+    monkeypatch.setattr(settings, "SETTINGS_FILE", path)
+    settings.invalidate_settings_cache()
+    yield path
+    settings.invalidate_settings_cache()
+
+
+def test_nested_settings_round_trip(settings_file):
+    loaded = settings.load_settings()
+    edited = dict(loaded)
+    edited["LOCAL"] = "de"
+    settings.save_settings_to_file(edited)
+
+    assert json.loads(settings_file.read_text(encoding="utf-8")) == dict(SAVED, LOCAL="de")
+    reloaded = settings.load_settings()
+    assert reloaded["PAGE_READY_TIMEOUTS"]["slow.example.com"]["hosts"] == ("a", "b")
+    assert reloaded["LOCAL"] == "de"
+
+
+def test_failed_save_keeps_the_old_file(settings_file):
+    with pytest.raises(TypeError):
+        settings.save_settings_to_file({"LOCAL": "de", "BROKEN": object()})
+
+    assert json.loads(settings_file.read_text(encoding="utf-8")) == SAVED
+    assert [path.name for path in settings_file.parent.iterdir()] == ["settings.json"]
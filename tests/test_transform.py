@@ -0,0 +1,26 @@
+"""
+Golden tests for the clean-up rules.
+
+tests/fixtures/cleaned holds the output of the original pipeline, which ran
+each rule as its own pass over the page, for every page in
+tests/fixtures/pages. The single-pass TransformEngine must reproduce it
+byte for byte. When a rule is changed on purpose, update the expected page
+by hand and review the diff.
+"""
+from pathlib import Path
+import pytest
+from syncapp.core.fetcher import ContentNotFoundError, clean_page
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PAGES = sorted((FIXTURES / "pages").glob("*.html"))
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+def test_clean_page_matches_seven_pass_output(page):
+    expected = (FIXTURES / "cleaned" / page.name).read_text(encoding="utf-8")
+    assert clean_page(page.read_text(encoding="utf-8"), "html.parser") == expected
+
+
+def test_clean_page_requires_the_markdown_block():
+    with pytest.raises(ContentNotFoundError):
+        clean_page("<html><body><main><p>Loading…</p></main></body></html>", "html.parser")
@@ -0,0 +1,47 @@
+import re
+from pathlib import Path
+from syncapp.core.zendesk import verify_translation
+
+CLEANED = Path(__file__).parent / "fixtures" / "cleaned"
+
+SENT = (
+    '<p>Run <strong>ziti-edge-tunnel</strong> as <a href="/docs/daemon" class="link" data-x="1">a daemon</a>'
+    ' &amp; check it\'s up.</p>\n'
+    '<div class="theme-admonition alert" style="color:red" tabindex="0"><h2>NOTE</h2>'
+    '<p>Needs <span class="token plain">systemd</span>.<br/>Then reboot.</p></div>'
+    '<pre><code><span class="token-line">a = 1<br/></span></code></pre>'
+    '<p><img alt="overview" src="/img/overview.png"/> Overview</p>'
+)
+# What Zendesk hands back for SENT: attributes dropped and reordered, entities rewritten,
+# <span> unwrapped, void tags and whitespace reformatted
+STORED = (
+    '<p>Run <strong>ziti-edge-tunnel</strong> as <a class="link" href="/docs/daemon">a daemon</a>'
+    ' &amp; check it&#39;s up.</p>\n\n'
+    '<div class="theme-admonition alert">\n<h2>NOTE</h2>\n'
+    '<p>Needs systemd.<br>Then reboot.</p>\n</div>\n'
+    '<pre><code>a = 1<br></code></pre>\n'
+    '<p><img src="/img/overview.png" alt="overview"> Overview</p>'
+)
+
+
+def test_sanitized_round_trip_verifies():
+    assert verify_translation(SENT, {"body": STORED})
+
+
+def test_fixture_pages_verify_after_attribute_stripping():
+    for page in CLEANED.glob("*.html"):
+        sent = page.read_text(encoding="utf-8")
+        stored = re.sub(r' (class|style)="[^"]*"', "", sent).replace("<br/>", "<br>")
+        assert verify_translation(sent, {"body": stored}), page.name
+
+
+def test_changed_text_fails_verification():
+    assert not verify_translation(SENT, {"body": STORED.replace("reboot", "restart")})
+
+
+def test_changed_link_fails_verification():
+    assert not verify_translation(SENT, {"body": STORED.replace("/docs/daemon", "/docs/other")})
+
+
+def test_missing_body_fails_verification():
+    assert not verify_translation(SENT, {})